@@ -1,29 +1,56 @@
+import asyncio
 import json
 import logging
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
 from django.utils import timezone
-from .models import ChatRoom, Message
+from .events import room_group_name
+from .membership import room_memberships
+from .models import Message
+from .write_behind import message_writer
 
 # 로그 설정 (콘솔에 출력)
 logger = logging.getLogger(__name__)
 
+# "seen" 프레임을 모아서 한 번에 반영하는 디바운스 간격(초)
+READ_RECEIPT_DEBOUNCE = 0.5
+
 
 class ChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.room_id = self.scope['url_route']['kwargs']['room_id']
-        self.group_name = f'chat_{self.room_id}'
-        self.room = await self.get_room(self.room_id)
-
+        self.group_name = room_group_name(self.room_id)
+        self.read_watermark = 0      # DB에 반영된 읽음 위치
+        self.pending_read = 0        # 아직 반영 전인 읽음 위치
+        self.read_flush_task = None
         user = self.scope['user']
-        if not user.is_authenticated or not self.room or not await self.user_in_room(user):
+        if not user.is_authenticated:
+            await self.close()
+            return
+
+        # 캐시에 있으면 스레드 전환 없이 바로 판정, 없을 때만 DB 조회
+        membership = room_memberships.peek(self.room_id)
+        if membership is None:
+            membership = await database_sync_to_async(room_memberships.get)(self.room_id)
+        if membership is None or not membership.allows(user):
             await self.close()
             return
+        self.room = membership.as_room()
 
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
 
     async def disconnect(self, close_code):
+        # 디바운스 대기 중인 읽음 처리는 연결 종료 전에 즉시 반영
+        if self.read_flush_task is not None:
+            self.read_flush_task.cancel()
+            self.read_flush_task = None
+        if self.pending_read > self.read_watermark:
+            await self.commit_read_receipt()
+        if settings.CHAT_WRITE_BEHIND:
+            # 이 연결이 보낸 메시지가 버퍼에 남은 채로 끝나지 않도록
+            await message_writer.flush()
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
     async def receive(self, text_data=None, bytes_data=None):
@@ -57,13 +84,30 @@ class ChatConsumer(AsyncWebsocketConsumer):
             logger.warning(f"[ChatConsumer] JSON decode 실패: {e}")
             return
 
+        if not isinstance(payload, dict):
+            return
+
+        # "seen up to id X" 프레임 → 디바운스 후 한 번에 읽음 처리
+        if payload.get('type') == 'seen':
+            try:
+                up_to = int(payload.get('up_to'))
+            except (TypeError, ValueError):
+                return
+            self.queue_read_receipt(up_to)
+            return
+
         message = (payload.get('message') or '').strip()
         if not message:
             return
 
         # ✅ 4. DB 저장 및 브로드캐스트
         user = self.scope['user']
-        message_payload = await self.create_message(user, message)
+        if settings.CHAT_WRITE_BEHIND:
+            # DB 저장을 기다리지 않고 서버가 발급한 key로 바로 브로드캐스트.
+            # 저장되면 MessageWriter가 chat.saved(key → id), 최종 실패 시 chat.failed를 방 그룹으로 보냄
+            message_payload = message_writer.submit(self.room, user, message).payload
+        else:
+            message_payload = await self.create_message(user, message)
         await self.channel_layer.group_send(
             self.group_name,
             {'type': 'chat.message', **message_payload},
@@ -79,18 +123,79 @@ class ChatConsumer(AsyncWebsocketConsumer):
             'sender': event['sender'],
             'sender_id': event['sender_id'],
             'timestamp': event['timestamp'],
+            'id': event.get('id'),
+            'key': event.get('key'),
         }))
 
-    @database_sync_to_async
-    def get_room(self, room_id):
+    async def chat_saved(self, event):
+        """
+        write-behind 메시지 저장 완료 (key → DB id)
+        """
+        await self.send(text_data=json.dumps({
+            'type': 'chat.saved',
+            'messages': event['messages'],
+        }))
+
+    async def chat_failed(self, event):
+        """
+        write-behind 메시지 최종 저장 실패 (이미 표시된 메시지를 실패로 표시)
+        """
+        await self.send(text_data=json.dumps({
+            'type': 'chat.failed',
+            'keys': event['keys'],
+        }))
+
+    async def chat_read(self, event):
+        """
+        읽음 위치 이벤트 전달 (메시지별이 아닌 "up_to" 하나)
+        """
+        await self.send(text_data=json.dumps({
+            'type': 'chat.read',
+            'reader_id': event['reader_id'],
+            'up_to': event['up_to'],
+        }))
+
+    async def order_state(self, event):
+        """
+        주문 생성/구매확정 시 상태 전달 (orders.events.publish_order_state)
+        """
+        await self.send(text_data=json.dumps({
+            'type': 'order.state',
+            'order': event['order'],
+        }))
+
+    def queue_read_receipt(self, up_to):
+        if up_to <= max(self.read_watermark, self.pending_read):
+            return
+        self.pending_read = up_to
+        if self.read_flush_task is None:
+            self.read_flush_task = asyncio.create_task(self.flush_read_receipt())
+
+    async def flush_read_receipt(self):
         try:
-            return ChatRoom.objects.select_related('buyer', 'seller').get(id=room_id)
-        except ChatRoom.DoesNotExist:
-            return None
+            await asyncio.sleep(READ_RECEIPT_DEBOUNCE)
+            self.read_flush_task = None
+            await self.commit_read_receipt()
+        except asyncio.CancelledError:
+            pass
+
+    async def commit_read_receipt(self):
+        up_to = self.pending_read
+        user = self.scope['user']
+        if settings.CHAT_WRITE_BEHIND:
+            # 읽음 처리 대상 메시지가 아직 버퍼에 있을 수 있으므로 먼저 저장
+            await message_writer.flush()
+        updated = await self.mark_read(user, up_to)
+        self.read_watermark = max(self.read_watermark, up_to)
+        if updated:
+            await self.channel_layer.group_send(
+                self.group_name,
+                {'type': 'chat.read', 'reader_id': user.id, 'up_to': up_to},
+            )
 
     @database_sync_to_async
-    def user_in_room(self, user):
-        return user == self.room.buyer or user == self.room.seller
+    def mark_read(self, user, up_to):
+        return self.room.mark_read_up_to(user, up_to)
 
     @database_sync_to_async
     def create_message(self, user, content):
@@ -99,8 +204,10 @@ class ChatConsumer(AsyncWebsocketConsumer):
             sender=user,
             content=content,
         )
+        self.room.record_message(message)
         timestamp = timezone.localtime(message.timestamp).strftime('%Y-%m-%d %H:%M')
         return {
+            'id': message.id,
             'content': message.content,
             'sender': user.username,
             'sender_id': user.id,
@@ -0,0 +1,15 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+
+def room_group_name(room_id):
+    """채팅방 WebSocket 그룹 이름"""
+    return f"chat_{room_id}"
+
+
+def broadcast_to_room(room_id, event):
+    """동기 코드(HTTP 뷰 등)에서 채팅방 그룹으로 이벤트 전송"""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    async_to_sync(channel_layer.group_send)(room_group_name(room_id), event)
@@ -0,0 +1,135 @@
+import asyncio
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from channels.layers import InMemoryChannelLayer
+from django.core.management.base import BaseCommand
+
+from core.channel_layers import SQLiteChannelLayer
+
+
+def _percentiles(samples):
+    if not samples:
+        return '-'
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f'p50={statistics.median(ordered) * 1000:.1f}ms p99={p99 * 1000:.1f}ms'
+
+
+async def _join(layer, rooms, members):
+    channels = []
+    for room in range(rooms):
+        for _ in range(members):
+            channel = await layer.new_channel()
+            await layer.group_add(f'bench_{room}', channel)
+            channels.append(channel)
+    return channels
+
+
+async def _consume(layer, channels, messages, latencies, timeout):
+    async def one(channel):
+        for _ in range(messages):
+            event = await layer.receive(channel)
+            latencies.append(time.time() - event['t'])
+
+    await asyncio.wait_for(asyncio.gather(*(one(c) for c in channels)), timeout)
+
+
+async def _send(layer, rooms, messages):
+    for i in range(messages):
+        for room in range(rooms):
+            await layer.group_send(f'bench_{room}', {'type': 'chat.message', 't': time.time(), 'i': i})
+
+
+async def _fanout(layer, rooms, members, messages, timeout):
+    """같은 프로세스 안에서 group_send → 모든 멤버 receive"""
+    channels = await _join(layer, rooms, members)
+    latencies = []
+    consumer = asyncio.create_task(_consume(layer, channels, messages, latencies, timeout))
+    start = time.perf_counter()
+    await _send(layer, rooms, messages)
+    await consumer
+    return len(latencies), time.perf_counter() - start, latencies
+
+
+def _worker(path, rooms, members, messages, timeout, ready, results):
+    """다른 워커 프로세스 역할: 방마다 members개 연결을 열고 메시지를 받음"""
+    async def run():
+        layer = SQLiteChannelLayer(path=path, capacity=messages + 10)
+        channels = await _join(layer, rooms, members)
+        ready.release()
+        latencies = []
+        try:
+            await _consume(layer, channels, messages, latencies, timeout)
+        except asyncio.TimeoutError:
+            pass
+        await layer.close()
+        return latencies
+
+    results.put(asyncio.run(run()))
+
+
+class Command(BaseCommand):
+    help = '채널 레이어 group_send 팬아웃 처리량 비교 (InMemory vs SQLite, --workers로 멀티 프로세스)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, default=50)
+        parser.add_argument('--members', type=int, default=2, help='방마다 연결 수 (구매자/판매자)')
+        parser.add_argument('--messages', type=int, default=50, help='방마다 보낼 메시지 수')
+        parser.add_argument('--workers', type=int, default=2, help='SQLite 멀티 프로세스 측정 시 수신 프로세스 수')
+        parser.add_argument('--timeout', type=float, default=120.0)
+
+    def handle(self, *args, **opts):
+        rooms, members, messages = opts['rooms'], opts['members'], opts['messages']
+        timeout = opts['timeout']
+        expected = rooms * members * messages
+        self.stdout.write(f'rooms={rooms} members={members} messages/room={messages} → 전달 {expected}건')
+        self.stdout.write(f"{'layer':<22}{'delivered':>10}{'secs':>8}{'msgs/s':>10}  latency")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            layers = {
+                'inmemory': InMemoryChannelLayer(capacity=messages + 10),
+                'sqlite': SQLiteChannelLayer(path=os.path.join(tmp, 'single.sqlite3'), capacity=messages + 10),
+            }
+            for name, layer in layers.items():
+                delivered, elapsed, latencies = asyncio.run(_fanout(layer, rooms, members, messages, timeout))
+                self._row(name, delivered, elapsed, latencies)
+
+            if opts['workers']:
+                self._multiprocess(os.path.join(tmp, 'multi.sqlite3'), opts['workers'], rooms, messages, timeout)
+
+    def _multiprocess(self, path, workers, rooms, messages, timeout):
+        """방마다 워커 수만큼 연결 (워커 하나가 연결 하나씩) — 여러 Daphne/Uvicorn 워커 배포와 같은 구조"""
+        ctx = multiprocessing.get_context('spawn')
+        ready = ctx.Semaphore(0)
+        results = ctx.Queue()
+        procs = [
+            ctx.Process(target=_worker, args=(path, rooms, 1, messages, timeout, ready, results))
+            for _ in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+        for _ in procs:
+            ready.acquire()
+
+        async def send():
+            layer = SQLiteChannelLayer(path=path, capacity=messages + 10)
+            await _send(layer, rooms, messages)
+
+        start = time.perf_counter()
+        asyncio.run(send())
+        latencies = []
+        for _ in procs:
+            latencies.extend(results.get())
+        elapsed = time.perf_counter() - start
+        for proc in procs:
+            proc.join()
+        self._row(f'sqlite x{workers} procs', len(latencies), elapsed, latencies)
+
+    def _row(self, name, delivered, elapsed, latencies):
+        self.stdout.write(
+            f'{name:<22}{delivered:>10}{elapsed:>8.2f}{delivered / elapsed:>10,.0f}  {_percentiles(latencies)}'
+        )
@@ -0,0 +1,89 @@
+import asyncio
+import statistics
+import time
+
+from channels.db import database_sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from chat.models import ChatRoom, Message
+from chat.write_behind import MessageWriter
+from listings.models import Listing
+
+
+def _create_message(room, user, content):
+    """ChatConsumer.create_message와 같은 경로 (메시지마다 INSERT + ChatRoom UPDATE)"""
+    message = Message.objects.create(room=room, sender=user, content=content)
+    room.record_message(message)
+    return message.id
+
+
+class Command(BaseCommand):
+    help = (
+        '채팅 메시지 저장 처리량 비교 (메시지별 create vs write-behind). '
+        'ack = 브로드캐스트할 수 있게 된 시점, durable = 모두 커밋된 시점. 생성한 데이터는 끝나면 삭제됨'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, default=1000)
+        parser.add_argument('--messages', type=int, default=5, help='방마다 보낼 메시지 수')
+
+    def handle(self, *args, **opts):
+        users, listings, rooms = self._seed(opts['rooms'])
+        try:
+            self.stdout.write(f"rooms={opts['rooms']} messages/room={opts['messages']} (모든 방 동시 전송)")
+            self.stdout.write(f"{'mode':<14}{'msgs':>8}{'ack msgs/s':>12}{'ack p50':>10}{'ack p99':>10}{'durable msgs/s':>16}")
+            for mode in ('direct', 'write-behind'):
+                self._report(mode, *asyncio.run(self._run(mode, rooms, users, opts['messages'])))
+        finally:
+            Message.objects.filter(room__in=rooms).delete()
+            ChatRoom.objects.filter(pk__in=[r.pk for r in rooms]).delete()
+            Listing.objects.filter(pk__in=[l.pk for l in listings]).delete()
+            get_user_model().objects.filter(pk__in=[u.pk for u in users]).delete()
+
+    def _seed(self, count):
+        User = get_user_model()
+        seller, _ = User.objects.get_or_create(username='__bench_seller__')
+        buyer, _ = User.objects.get_or_create(username='__bench_buyer__')
+        listings = Listing.objects.bulk_create([
+            Listing(seller=seller, title=f'bench {i}', description='bench', price=1000, image='listing/bench.jpg')
+            for i in range(count)
+        ])
+        rooms = ChatRoom.objects.bulk_create([
+            ChatRoom(listing=listing, buyer=buyer, seller=seller) for listing in listings
+        ])
+        return (buyer, seller), listings, rooms
+
+    async def _run(self, mode, rooms, users, messages):
+        writer = MessageWriter(notify=False)
+        create = database_sync_to_async(_create_message)
+        latencies = []
+        entries = []
+
+        async def room_traffic(room):
+            for i in range(messages):
+                user = users[i % 2]
+                start = time.perf_counter()
+                if mode == 'direct':
+                    await create(room, user, f'bench {i}')
+                else:
+                    # 브로드캐스트 시점 = 버퍼에 넣은 직후 (저장은 flush에서)
+                    entries.append(writer.submit(room, user, f'bench {i}'))
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0)   # 실제 consumer의 group_send처럼 다른 방/flush에 양보
+
+        start = time.perf_counter()
+        await asyncio.gather(*(room_traffic(room) for room in rooms))
+        acked = time.perf_counter() - start
+        await writer.flush()
+        await asyncio.gather(*(entry.future for entry in entries))
+        durable = time.perf_counter() - start
+        return len(latencies), acked, durable, latencies
+
+    def _report(self, mode, count, acked, durable, latencies):
+        ordered = sorted(latencies)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        self.stdout.write(
+            f'{mode:<14}{count:>8}{count / acked:>12,.0f}{statistics.median(ordered) * 1000:>8.1f}ms'
+            f'{p99 * 1000:>8.1f}ms{count / durable:>16,.0f}'
+        )
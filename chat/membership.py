@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from .models import ChatRoom
+
+# 캐시 유지 시간(초)과 최대 방 수. 방 변경/삭제 시 시그널(chat.signals)은 같은 프로세스의 캐시만
+# 무효화하므로, 다른 ASGI 워커에서는 최대 MEMBERSHIP_TTL초 동안 예전 멤버십으로 connect를 판정할 수 있다.
+# 방의 buyer/seller는 생성 후 바뀌지 않으므로 실제로 늦게 반영되는 것은 방 삭제뿐이고,
+# 그 동안 삭제된 방에 접속해도 메시지 저장은 FK 오류로 실패한다 (write_behind는 MAX_ATTEMPTS 후 버림).
+MEMBERSHIP_TTL = 60
+MAX_ROOMS = 10000
+
+
+class RoomMembership(namedtuple('RoomMembership', 'room_id listing_id buyer_id seller_id')):
+    __slots__ = ()
+
+    def allows(self, user):
+        return user.is_authenticated and user.id in (self.buyer_id, self.seller_id)
+
+    def as_room(self):
+        """DB 조회 없이 id만 채운 ChatRoom (record_message/mark_read_up_to 등 id 기반 메서드용)"""
+        room = ChatRoom(
+            id=self.room_id, listing_id=self.listing_id, buyer_id=self.buyer_id, seller_id=self.seller_id
+        )
+        room._state.adding = False
+        return room
+
+
+class MembershipCache:
+    """
+    room_id → (buyer_id, seller_id) 프로세스별 TTL 캐시. ChatConsumer.connect 전용.
+    배포 직후 WebSocket 재접속이 몰려도 워커마다 방별 DB 조회는 한 번이다.
+    HTTP 뷰(chat_view/chat_history)는 어차피 방을 조회하므로 캐시를 쓰지 않고 DB 기준으로 판정한다.
+    """
+
+    def __init__(self, ttl=MEMBERSHIP_TTL, max_rooms=MAX_ROOMS):
+        self.ttl = ttl
+        self.max_rooms = max_rooms
+        self._entries = OrderedDict()   # room_id → (expires, RoomMembership)
+        self._lock = threading.Lock()
+
+    def peek(self, room_id):
+        """캐시에 있을 때만 반환 (DB 조회 없음 → 이벤트 루프에서 바로 호출 가능)"""
+        room_id = int(room_id)
+        with self._lock:
+            entry = self._entries.get(room_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[room_id]
+                return None
+            self._entries.move_to_end(room_id)
+            return entry[1]
+
+    def get(self, room_id):
+        """캐시 미스 시 DB에서 id 3개만 조회. 방이 없으면 None (캐시하지 않음)"""
+        membership = self.peek(room_id)
+        if membership is not None:
+            return membership
+        row = (
+            ChatRoom.objects
+            .filter(pk=room_id)
+            .values_list('id', 'listing_id', 'buyer_id', 'seller_id')
+            .first()
+        )
+        if row is None:
+            return None
+        membership = RoomMembership(*row)
+        self.put(membership)
+        return membership
+
+    def put(self, membership):
+        with self._lock:
+            self._entries[membership.room_id] = (time.monotonic() + self.ttl, membership)
+            self._entries.move_to_end(membership.room_id)
+            while len(self._entries) > self.max_rooms:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, room_id):
+        with self._lock:
+            self._entries.pop(int(room_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+room_memberships = MembershipCache()
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_last_message(apps, schema_editor):
+    ChatRoom = apps.get_model('chat', 'ChatRoom')
+    Message = apps.get_model('chat', 'Message')
+    for room in ChatRoom.objects.all().iterator():
+        last = Message.objects.filter(room=room).order_by('-timestamp', '-id').first()
+        if last is not None:
+            ChatRoom.objects.filter(pk=room.pk).update(last_message=last)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatroom',
+            name='buyer_unread_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='chatroom',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.message'),
+        ),
+        migrations.AddField(
+            model_name='chatroom',
+            name='seller_unread_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_last_message, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_chatroom_last_message_unread_counts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['room', 'timestamp'], name='chat_msg_room_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def backfill_unread_counts(apps, schema_editor):
+    """0002 이전에 저장된 메시지는 안읽음 카운터에 반영되지 않았으므로 실제 is_read 기준으로 다시 계산"""
+    ChatRoom = apps.get_model('chat', 'ChatRoom')
+    Message = apps.get_model('chat', 'Message')
+    for room in ChatRoom.objects.all().iterator():
+        unread = Message.objects.filter(room_id=room.pk, is_read=False)
+        # record_message와 같은 기준: 구매자가 보낸 메시지는 판매자의 안읽음
+        ChatRoom.objects.filter(pk=room.pk).update(
+            seller_unread_count=unread.filter(sender_id=room.buyer_id).count(),
+            buyer_unread_count=unread.exclude(sender_id=room.buyer_id).count(),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_message_room_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_unread_counts, migrations.RunPython.noop),
+    ]
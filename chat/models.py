@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.auth.models import User
 from listings.models import Listing
 
@@ -11,6 +12,13 @@ class ChatRoom(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # 프로필 채팅 목록용 비정규화 필드 (메시지 전체를 불러오지 않기 위함)
+    last_message = models.ForeignKey(
+        "Message", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    buyer_unread_count = models.PositiveIntegerField(default=0)
+    seller_unread_count = models.PositiveIntegerField(default=0)
+
     class Meta:
         unique_together = ("listing", "buyer", "seller")
 
@@ -18,6 +26,48 @@ class ChatRoom(models.Model):
         """현재 로그인한 사용자를 기준으로 상대방 반환"""
         return self.seller if self.buyer == current_user else self.buyer
 
+    def unread_count_for(self, user):
+        """해당 사용자가 읽지 않은 메시지 수"""
+        if user.id == self.buyer_id:
+            return self.buyer_unread_count
+        if user.id == self.seller_id:
+            return self.seller_unread_count
+        return 0
+
+    def record_message(self, message):
+        """새 메시지 저장 후 마지막 메시지/상대방 안읽음 카운터를 한 번의 UPDATE로 갱신"""
+        counter = "seller_unread_count" if message.sender_id == self.buyer_id else "buyer_unread_count"
+        ChatRoom.objects.filter(pk=self.pk).update(
+            last_message=message,
+            updated_at=message.timestamp,
+            **{counter: F(counter) + 1},
+        )
+        self.last_message = message
+        self.updated_at = message.timestamp
+
+    def mark_read_up_to(self, user, up_to_id):
+        """상대방이 보낸 up_to_id 이하 메시지를 한 번의 bulk UPDATE로 읽음 처리. 갱신된 행 수 반환"""
+        if user.id == self.buyer_id:
+            counter = "buyer_unread_count"
+        elif user.id == self.seller_id:
+            counter = "seller_unread_count"
+        else:
+            return 0
+        updated = (
+            Message.objects
+            .filter(room_id=self.pk, id__lte=up_to_id, is_read=False)
+            .exclude(sender_id=user.id)
+            .update(is_read=True)
+        )
+        if not updated:
+            # 새로 읽은 메시지가 없으면 카운터도 그대로 (중복 "seen" 등은 UPDATE 한 번으로 끝)
+            return 0
+        # 마지막 메시지까지 읽었을 때만 안읽음 카운터 초기화 (조건부 UPDATE 한 번)
+        ChatRoom.objects.filter(pk=self.pk, last_message_id__lte=up_to_id).update(**{counter: 0})
+        if self.last_message_id is not None and self.last_message_id <= up_to_id:
+            setattr(self, counter, 0)
+        return updated
+
     def __str__(self):
         return f"{self.listing.title} ({self.buyer.username} ↔ {self.seller.username})"
 
@@ -30,5 +80,10 @@ class Message(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["room", "timestamp"], name="chat_msg_room_ts_idx"),
+        ]
+
     def __str__(self):
         return f"[{self.sender.username}] {self.content[:25]}"
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .membership import room_memberships
+from .models import ChatRoom
+
+
+@receiver(post_save, sender=ChatRoom)
+@receiver(post_delete, sender=ChatRoom)
+def invalidate_room_membership(sender, instance, **kwargs):
+    """방이 바뀌거나 삭제되면 이 프로세스의 멤버십 캐시에서 즉시 제거"""
+    room_memberships.invalidate(instance.pk)
@@ -0,0 +1,293 @@
+import asyncio
+from datetime import timedelta
+from importlib import import_module
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.pagination import encode_cursor
+from listings.models import Listing
+
+from .events import room_group_name
+from .membership import RoomMembership, room_memberships
+from .models import ChatRoom, Message
+from .views import MESSAGE_PAGE_SIZE
+from .write_behind import MessageWriter
+
+
+# TransactionTestCase는 on_commit이 실제로 실행되므로 없는 테스트 이미지의 썸네일 생성을 끔
+@override_settings(THUMBNAILS_IN_PROCESS=False)
+class MessageWriterTests(TransactionTestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.seller = User.objects.create(username='seller')
+        self.buyer = User.objects.create(username='buyer')
+        listing = Listing.objects.create(
+            seller=self.seller, title='테스트 상품', description='-', price=1000, image='listing/test.jpg'
+        )
+        self.room = ChatRoom.objects.create(listing=listing, buyer=self.buyer, seller=self.seller)
+
+    def test_ids_follow_time_order_when_mixed_with_direct_saves(self):
+        writer = MessageWriter()
+
+        async def traffic():
+            sent = []
+            for i in range(3):
+                sent.append(await writer.submit(self.room, self.buyer, f'wb {i}').future)
+            return sent
+
+        first = async_to_sync(traffic)()
+        direct = Message.objects.create(room=self.room, sender=self.seller, content='direct')
+        self.room.record_message(direct)
+        last = async_to_sync(traffic)()
+
+        ids = [payload['id'] for payload in first] + [direct.id] + [payload['id'] for payload in last]
+        self.assertEqual(ids, sorted(ids))
+        stored = list(Message.objects.filter(room=self.room).order_by('timestamp', 'id').values_list('id', flat=True))
+        self.assertEqual(stored, ids)
+
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.last_message_id, ids[-1])
+        self.assertEqual(self.room.seller_unread_count, 6)
+        self.assertEqual(self.room.buyer_unread_count, 1)
+
+        # 가장 최근 메시지까지 읽으면 모두 읽음 처리
+        self.room.mark_read_up_to(self.seller, ids[-1])
+        self.assertFalse(Message.objects.filter(room=self.room, sender=self.buyer, is_read=False).exists())
+
+    def test_poison_message_is_dropped_without_blocking_others(self):
+        writer = MessageWriter()
+        gone = ChatRoom.objects.create(listing=self.room.listing, buyer=self.seller, seller=self.buyer)
+        ChatRoom.objects.filter(pk=gone.pk).delete()
+
+        async def traffic():
+            results = await asyncio.gather(
+                writer.submit(self.room, self.buyer, 'ok 1').future,
+                writer.submit(gone, self.buyer, 'poison').future,
+                writer.submit(self.room, self.buyer, 'ok 2').future,
+                return_exceptions=True,
+            )
+            after = await writer.submit(self.room, self.buyer, 'ok 3').future
+            return results, after
+
+        results, after = async_to_sync(traffic)()
+        self.assertIsInstance(results[1], IntegrityError)
+        self.assertEqual(writer.dropped, 1)
+        self.assertEqual(
+            list(Message.objects.filter(room=self.room).order_by('id').values_list('content', flat=True)),
+            ['ok 1', 'ok 2', 'ok 3'],
+        )
+        self.assertEqual(after['content'], 'ok 3')
+
+    def test_broadcast_does_not_wait_for_flush(self):
+        writer = MessageWriter(interval=60)
+        layer = get_channel_layer()
+
+        async def traffic():
+            channel = await layer.new_channel()
+            await layer.group_add(room_group_name(self.room.pk), channel)
+            entry = writer.submit(self.room, self.buyer, 'fast')
+            # 저장 전: key만 있고 id는 없음, DB에도 아직 없음
+            before = (entry.payload['id'], entry.payload['key'], entry.future.done())
+            await writer.flush()
+            saved = await layer.receive(channel)
+            return before, entry, saved
+
+        (before_id, key, done), entry, saved = async_to_sync(traffic)()
+        self.assertIsNone(before_id)
+        self.assertFalse(done)
+        self.assertEqual(saved['type'], 'chat.saved')
+        self.assertEqual(saved['messages'], [{'key': key, 'id': entry.message.id}])
+        self.assertTrue(Message.objects.filter(pk=entry.message.id, content='fast').exists())
+
+    def test_dropped_message_is_reported_as_failed(self):
+        writer = MessageWriter(max_attempts=1)
+        gone = ChatRoom.objects.create(listing=self.room.listing, buyer=self.seller, seller=self.buyer)
+        ChatRoom.objects.filter(pk=gone.pk).delete()
+        layer = get_channel_layer()
+
+        async def traffic():
+            channel = await layer.new_channel()
+            await layer.group_add(room_group_name(gone.pk), channel)
+            entry = writer.submit(gone, self.buyer, 'poison')
+            await writer.flush()
+            return entry, await layer.receive(channel)
+
+        entry, failed = async_to_sync(traffic)()
+        self.assertEqual(failed, {'type': 'chat.failed', 'keys': [entry.key]})
+
+    def test_flush_sync_settles_pending_futures(self):
+        writer = MessageWriter(interval=60)
+
+        async def traffic():
+            entry = writer.submit(self.room, self.buyer, 'at exit')
+            # atexit 경로: 이벤트 루프 밖(다른 스레드)에서 저장
+            await asyncio.to_thread(writer.flush_sync)
+            return await asyncio.wait_for(entry.future, 5)
+
+        payload = async_to_sync(traffic)()
+        self.assertIsNotNone(payload['id'])
+        self.assertEqual(writer.pending, [])
+
+
+class ChatReadTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.seller = User.objects.create(username='seller')
+        self.buyer = User.objects.create(username='buyer')
+        listing = Listing.objects.create(
+            seller=self.seller, title='테스트 상품', description='-', price=1000, image='listing/test.jpg'
+        )
+        self.room = ChatRoom.objects.create(listing=listing, buyer=self.buyer, seller=self.seller)
+
+    def send(self, sender, content, record=True):
+        message = Message.objects.create(room=self.room, sender=sender, content=content)
+        if record:
+            self.room.record_message(message)
+        return message
+
+    def test_unread_count_follows_sender(self):
+        self.send(self.buyer, '안녕하세요')
+        self.send(self.buyer, '구매 가능할까요?')
+        self.send(self.seller, '네')
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.unread_count_for(self.seller), 2)
+        self.assertEqual(self.room.unread_count_for(self.buyer), 1)
+
+    def test_opening_room_marks_messages_read(self):
+        self.send(self.buyer, '안녕하세요')
+        last = self.send(self.buyer, '구매 가능할까요?')
+        self.client.force_login(self.seller)
+        self.client.get(reverse('chat:chat_room', args=[self.room.pk]))
+
+        self.assertFalse(Message.objects.filter(room=self.room, is_read=False).exists())
+        self.room.refresh_from_db()
+        self.assertEqual((self.room.seller_unread_count, self.room.last_message_id), (0, last.id))
+
+    def test_messages_before_counters_are_marked_read(self):
+        # 카운터 도입(0002) 전에 저장되어 카운터가 0인 메시지
+        self.send(self.buyer, '예전 메시지', record=False)
+        self.client.force_login(self.seller)
+        self.client.get(reverse('chat:chat_room', args=[self.room.pk]))
+        self.assertFalse(Message.objects.filter(room=self.room, is_read=False).exists())
+
+    def test_own_messages_stay_unread(self):
+        self.send(self.seller, '판매자 메시지')
+        self.client.force_login(self.seller)
+        self.client.get(reverse('chat:chat_room', args=[self.room.pk]))
+        self.assertTrue(Message.objects.filter(room=self.room, is_read=False).exists())
+
+    def test_nothing_unread_skips_counter_update(self):
+        message = self.send(self.buyer, '안녕하세요')
+        self.assertEqual(self.room.mark_read_up_to(self.seller, message.id), 1)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.room.mark_read_up_to(self.seller, message.id), 0)
+
+    def test_backfill_counts_unread_messages(self):
+        backfill = import_module('chat.migrations.0004_backfill_unread_counts').backfill_unread_counts
+        self.send(self.buyer, '1', record=False)
+        self.send(self.buyer, '2', record=False)
+        self.send(self.seller, '3', record=False)
+        backfill(apps, None)
+        self.room.refresh_from_db()
+        self.assertEqual((self.room.seller_unread_count, self.room.buyer_unread_count), (2, 1))
+
+
+class ChatHistoryTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.seller = User.objects.create(username='seller')
+        self.buyer = User.objects.create(username='buyer')
+        listing = Listing.objects.create(
+            seller=self.seller, title='테스트 상품', description='-', price=1000, image='listing/test.jpg'
+        )
+        self.room = ChatRoom.objects.create(listing=listing, buyer=self.buyer, seller=self.seller)
+        count = MESSAGE_PAGE_SIZE + 10
+        Message.objects.bulk_create([
+            Message(room=self.room, sender=self.buyer, content=f'msg {i}') for i in range(count)
+        ])
+        self.ids = list(Message.objects.filter(room=self.room).order_by('id').values_list('id', flat=True))
+        base = timezone.now() - timedelta(hours=1)
+        for offset, pk in enumerate(self.ids):
+            Message.objects.filter(pk=pk).update(timestamp=base + timedelta(seconds=offset))
+        self.url = reverse('chat:chat_history', args=[self.room.pk])
+        self.client.force_login(self.seller)
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        return [m['id'] for m in body['messages']], body['next_cursor']
+
+    def cursor_of(self, pk):
+        message = Message.objects.get(pk=pk)
+        return encode_cursor(message.timestamp, message.pk)
+
+    def test_before_pages_back_to_the_first_message(self):
+        latest, cursor = self.get()
+        self.assertEqual(latest, self.ids[-MESSAGE_PAGE_SIZE:])
+        older, cursor = self.get(before=cursor)
+        self.assertEqual(older, self.ids[:-MESSAGE_PAGE_SIZE])
+        self.assertEqual(cursor, '')
+
+    def test_ties_on_timestamp_are_split_by_id(self):
+        Message.objects.filter(room=self.room).update(timestamp=timezone.now())
+        latest, cursor = self.get()
+        older, cursor = self.get(before=cursor)
+        self.assertEqual(older + latest, self.ids)
+        self.assertEqual(cursor, '')
+
+    def test_after_returns_newer_messages_in_pages(self):
+        newer, cursor = self.get(after=self.cursor_of(self.ids[-3]))
+        self.assertEqual((newer, cursor), (self.ids[-2:], ''))
+
+        first, cursor = self.get(after=self.cursor_of(self.ids[0]))
+        self.assertEqual(first, self.ids[1:MESSAGE_PAGE_SIZE + 1])
+        rest, cursor = self.get(after=cursor)
+        self.assertEqual((rest, cursor), (self.ids[MESSAGE_PAGE_SIZE + 1:], ''))
+
+    def test_invalid_cursor_is_rejected(self):
+        cursor = self.cursor_of(self.ids[0])
+        for params in ({'before': 'garbage'}, {'after': 'garbage'}, {'before': cursor, 'after': cursor}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+
+class ChatViewMembershipTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.seller = User.objects.create(username='seller')
+        self.buyer = User.objects.create(username='buyer')
+        self.other = User.objects.create(username='other')
+        listing = Listing.objects.create(
+            seller=self.seller, title='테스트 상품', description='-', price=1000, image='listing/test.jpg'
+        )
+        self.room = ChatRoom.objects.create(listing=listing, buyer=self.buyer, seller=self.seller)
+        self.addCleanup(room_memberships.clear)
+
+    def test_http_views_ignore_stale_membership_cache(self):
+        # 다른 워커가 남긴 것처럼 잘못된 캐시 항목을 넣어도 HTTP 뷰는 DB 기준으로 판정
+        room_memberships.put(RoomMembership(self.room.pk, self.room.listing_id, self.other.id, self.seller.id))
+        self.client.force_login(self.other)
+        response = self.client.get(reverse('chat:chat_room', args=[self.room.pk]))
+        self.assertRedirects(response, '/', fetch_redirect_response=False)
+        response = self.client.get(reverse('chat:chat_history', args=[self.room.pk]))
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(self.buyer)
+        response = self.client.get(reverse('chat:chat_history', args=[self.room.pk]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_deleted_room_is_not_found(self):
+        room_id = self.room.pk
+        self.room.delete()
+        # 다른 워커에서 지워져 이 프로세스 캐시에는 아직 남아 있는 경우
+        room_memberships.put(RoomMembership(room_id, self.room.listing_id, self.buyer.id, self.seller.id))
+        self.client.force_login(self.buyer)
+        response = self.client.get(reverse('chat:chat_history', args=[room_id]))
+        self.assertEqual(response.status_code, 404)
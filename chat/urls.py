@@ -7,4 +7,5 @@ urlpatterns = [
     #path("", views.chat_list_view, name="chat_list"),
     path("create/<int:listing_id>/", views.chat_room_create, name="chat_room_create"),  # ✅
     path("<int:room_id>/", views.chat_view, name="chat_room"),  # ✅
+    path("<int:room_id>/messages/", views.chat_history, name="chat_history"),
 ]
@@ -1,25 +1,56 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
+from django.db.models import Q
 from django.utils import timezone
-import secrets
 
+from .events import broadcast_to_room
 from .models import ChatRoom, Message
+from core.pagination import encode_cursor, decode_cursor
 from listings.models import Listing
 from orders.models import Order
 
+# 채팅방 진입 시/스크롤 시 한 번에 불러오는 메시지 수
+MESSAGE_PAGE_SIZE = 50
+
+
+def fetch_message_page(room, before=None, limit=MESSAGE_PAGE_SIZE):
+    """(timestamp, id) 키셋 기준으로 before 이전 메시지 limit개를 오래된 순으로 반환 (room: ChatRoom 또는 id)"""
+    qs = Message.objects.filter(room=room).select_related("sender")
+    if before is not None:
+        ts, pk = before
+        qs = qs.filter(Q(timestamp__lt=ts) | Q(timestamp=ts, id__lt=pk))
+    page = list(qs.order_by("-timestamp", "-id")[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+    page.reverse()
+    next_cursor = encode_cursor(page[0].timestamp, page[0].id) if has_more else ""
+    return page, next_cursor
+
+
+def fetch_messages_after(room, after, limit=MESSAGE_PAGE_SIZE):
+    """after 이후 메시지 limit개를 오래된 순으로 반환 (재접속 시 놓친 메시지 보충). 더 있으면 다음 after 커서"""
+    ts, pk = after
+    qs = (
+        Message.objects.filter(room=room).select_related("sender")
+        .filter(Q(timestamp__gt=ts) | Q(timestamp=ts, id__gt=pk))
+    )
+    page = list(qs.order_by("timestamp", "id")[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+    next_cursor = encode_cursor(page[-1].timestamp, page[-1].id) if has_more else ""
+    return page, next_cursor
+
+
 @login_required
 def chat_view(request, room_id):
     """특정 채팅방의 메시지 불러오기 + 전송 처리"""
-    room = get_object_or_404(ChatRoom, id=room_id)
-
-    # 권한 확인 (판매자/구매자만 접근 가능)
-    if request.user not in [room.buyer, room.seller]:
+    # 화면에 상품/상대방 정보가 필요하므로 한 번에 조회하고, 권한(판매자/구매자만)은 그 결과로 확인.
+    # 멤버십 캐시(chat.membership)는 쓰지 않음 — 캐시가 맞아도 이 조회는 필요하고, 다른 워커의 캐시는 늦게 갱신됨
+    room = get_object_or_404(ChatRoom.objects.select_related('listing', 'buyer', 'seller'), id=room_id)
+    if request.user.id not in (room.buyer_id, room.seller_id):
         return redirect('/')
 
-    # 메시지 목록 불러오기
-    messages = Message.objects.filter(room=room).order_by("timestamp")
-
     # 메시지 전송
     if request.method == "POST":
         content = request.POST.get("content")
@@ -30,8 +61,7 @@ def chat_view(request, room_id):
                 content=content,
                 timestamp=timezone.now()
             )
-            room.updated_at = timezone.now()
-            room.save()
+            room.record_message(msg)
             # If request is AJAX, return JSON to allow client to append message without full reload
             if request.headers.get('x-requested-with') == 'XMLHttpRequest':
                 return JsonResponse({
@@ -42,23 +72,72 @@ def chat_view(request, room_id):
                 }, status=201)
             return redirect('chat:chat_room', room_id=room_id)
 
+    # 최신 메시지 MESSAGE_PAGE_SIZE개만 렌더링 (이전 메시지는 chat_history로 로드)
+    messages, next_cursor = fetch_message_page(room)
+
+    # 방을 열면 화면에 보이는 마지막 메시지까지 한 번에 읽음 처리 후 상대방에게 알림.
+    # 카운터만 보지 않고 불러온 메시지의 is_read로도 판단 (카운터 도입 전 메시지 포함).
+    # 둘 다 없으면 UPDATE 없음
+    unread_on_page = any(not m.is_read and m.sender_id != request.user.id for m in messages)
+    if messages and (unread_on_page or room.unread_count_for(request.user)):
+        up_to = messages[-1].id
+        if room.mark_read_up_to(request.user, up_to):
+            broadcast_to_room(room.id, {
+                'type': 'chat.read',
+                'reader_id': request.user.id,
+                'up_to': up_to,
+            })
+
     current_order = Order.objects.filter(
         listing=room.listing,
         buyer=room.buyer
     ).order_by("-created_at").first()
 
-    if current_order and current_order.escrow_state == Order.EscrowState.RELEASED and not current_order.confirmation_code:
-        current_order.confirmation_code = f"{secrets.randbelow(10000):04d}"
-        current_order.save(update_fields=["confirmation_code"])
-
     return render(request, "chat/chat_room.html", {
         "room": room,
         "messages": messages,
+        "next_cursor": next_cursor,
         "listing": room.listing,
         "other_user": room.other_user(request.user),
         "order": current_order,
     })
 
+@login_required
+def chat_history(request, room_id):
+    """
+    메시지 페이지를 JSON으로 반환.
+    ?before=<cursor>: 스크롤 시 이전 페이지, ?after=<cursor>: 그 이후 메시지 (둘 중 하나만)
+    """
+    room = get_object_or_404(ChatRoom.objects.only('id', 'buyer_id', 'seller_id'), id=room_id)
+    if request.user.id not in (room.buyer_id, room.seller_id):
+        return JsonResponse({"detail": "권한이 없습니다."}, status=403)
+
+    raw_before, raw_after = request.GET.get("before"), request.GET.get("after")
+    if raw_before and raw_after:
+        return JsonResponse({"detail": "before와 after는 함께 쓸 수 없습니다."}, status=400)
+    before, after = decode_cursor(raw_before), decode_cursor(raw_after)
+    if (raw_before and before is None) or (raw_after and after is None):
+        return JsonResponse({"detail": "잘못된 커서입니다."}, status=400)
+
+    if after is not None:
+        messages, next_cursor = fetch_messages_after(room, after)
+    else:
+        messages, next_cursor = fetch_message_page(room, before=before)
+    return JsonResponse({
+        "messages": [
+            {
+                "id": msg.id,
+                "message": msg.content,
+                "sender": msg.sender.username,
+                "sender_id": msg.sender_id,
+                "is_read": msg.is_read,
+                "timestamp": timezone.localtime(msg.timestamp).strftime('%Y-%m-%d %H:%M'),
+            }
+            for msg in messages
+        ],
+        "next_cursor": next_cursor,
+    })
+
 @login_required
 def chat_room_create(request, listing_id):
     """상품 상세 페이지 → 대화 시작 버튼 클릭 시 채팅방 생성/이동"""
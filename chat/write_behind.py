@@ -0,0 +1,271 @@
+"""
+채팅 메시지 write-behind 저장 (settings.CHAT_WRITE_BEHIND).
+
+ChatConsumer는 submit()이 돌려준 payload를 DB를 기다리지 않고 바로 브로드캐스트한다.
+이때 메시지는 서버가 발급한 key(uuid)로 식별되고 id는 아직 없다. 저장은 프로세스당 하나의
+MessageWriter가 FLUSH_INTERVAL초 또는 BATCH_SIZE개마다 bulk INSERT 한 번 + 방별 ChatRoom UPDATE
+한 번으로 모아서 처리하고, 커밋되면 방 그룹으로 chat.saved(key → DB id)를 보낸다.
+클라이언트는 이 id로 읽음 처리("seen")를 한다.
+
+- id는 INSERT 시 DB가 발급한다 (RETURNING). 읽음 처리(mark_read_up_to)와 last_message가
+  "id 순서 = 시간 순서"를 전제로 하므로, 여러 워커 프로세스나 HTTP 경로의
+  Message.objects.create와 섞여도 id와 timestamp가 같은 순서가 되도록 timestamp도
+  저장 트랜잭션 안에서 다시 붙인다.
+- 배치 저장이 실패하면 메시지별로 나눠 다시 저장해 문제 있는 메시지(삭제된 방/사용자의 FK 오류 등)만
+  골라내고, 일시적 실패는 RETRY_DELAY 후 재시도한다. 같은 메시지가 MAX_ATTEMPTS번 실패하면
+  로그를 남기고 버린 뒤 chat.failed(key)로 알린다 (이미 화면에 표시된 메시지를 실패로 표시).
+- 프로세스 종료 시에는 atexit에서 남은 메시지를 동기로 저장한다 (저장하지 못한 메시지는 로그에 남김).
+"""
+import asyncio
+import atexit
+import logging
+import threading
+import uuid
+from collections import defaultdict
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .events import room_group_name
+from .models import ChatRoom, Message
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 0.005   # 초
+BATCH_SIZE = 200
+MAX_ATTEMPTS = 3         # 메시지 하나가 이만큼 저장에 실패하면 버림
+RETRY_DELAY = 0.5        # 초
+
+
+ROOM_UPDATE_SQL = """
+UPDATE {room} SET
+    seller_unread_count = seller_unread_count + %s,
+    buyer_unread_count = buyer_unread_count + %s,
+    updated_at = CASE WHEN last_message_id IS NULL OR last_message_id < %s THEN %s ELSE updated_at END,
+    last_message_id = CASE WHEN last_message_id IS NULL OR last_message_id < %s THEN %s ELSE last_message_id END
+WHERE id = %s
+"""
+
+
+def save_messages(entries):
+    """
+    (room, message) 목록을 한 트랜잭션에 저장하고 message.id/timestamp를 채움.
+    bulk INSERT가 id를 돌려주지 못하는 DB에서는 메시지별 INSERT (일반 경로와 같음)
+    """
+    with transaction.atomic():
+        # 쓰기 잠금을 잡은 뒤(IMMEDIATE) 시각을 붙여야 다른 프로세스의 저장과 id/시간 순서가 어긋나지 않음
+        now = timezone.now()
+        messages = [message for _, message in entries]
+        for message in messages:
+            message.timestamp = now
+        if connection.features.can_return_rows_from_bulk_insert:
+            Message.objects.bulk_create(messages)
+        else:
+            for message in messages:
+                message.save(force_insert=True)
+
+        per_room = defaultdict(list)
+        for room, message in entries:
+            per_room[room.pk].append((room, message))
+        params = []
+        for room_id, items in per_room.items():
+            room = items[0][0]
+            last = max((message for _, message in items), key=lambda m: m.id)
+            from_buyer = sum(1 for _, message in items if message.sender_id == room.buyer_id)
+            timestamp = connection.ops.adapt_datetimefield_value(last.timestamp)
+            params.append((from_buyer, len(items) - from_buyer, last.id, timestamp, last.id, last.id, room_id))
+        with connection.cursor() as cursor:
+            cursor.executemany(ROOM_UPDATE_SQL.format(room=ChatRoom._meta.db_table), params)
+
+
+def message_payload(message, user, key=None):
+    """브로드캐스트용 payload (ChatConsumer.create_message와 같은 형식 + write-behind key)"""
+    return {
+        'id': message.id,
+        'key': key,
+        'content': message.content,
+        'sender': user.username,
+        'sender_id': user.id,
+        'timestamp': timezone.localtime(message.timestamp).strftime('%Y-%m-%d %H:%M'),
+    }
+
+
+class _Pending:
+    __slots__ = ('room', 'message', 'user', 'key', 'future', 'attempts')
+
+    def __init__(self, room, message, user, future):
+        self.room = room
+        self.message = message
+        self.user = user
+        self.key = uuid.uuid4().hex
+        self.future = future
+        self.attempts = 0
+
+    @property
+    def payload(self):
+        return message_payload(self.message, self.user, self.key)
+
+
+def _settle(entry, result=None, exc=None):
+    """entry.future 완료 (이벤트 루프 밖의 스레드에서 불러도 됨)"""
+    future = entry.future
+    if future.done():
+        return
+    loop = future.get_loop()
+    if loop.is_closed():
+        return
+
+    def apply():
+        if future.done():
+            return
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        apply()
+    else:
+        loop.call_soon_threadsafe(apply)
+
+
+class MessageWriter:
+    def __init__(self, interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS, notify=True):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.notify = notify          # 저장/실패 결과를 방 그룹으로 전송 (chat.saved / chat.failed)
+        self.pending = []
+        self.written = 0
+        self.dropped = 0
+        self._flush_lock = None
+        self._timer = None
+        self._guard = threading.Lock()   # pending은 atexit 스레드에서도 접근
+
+    def submit(self, room, user, content):
+        """
+        메시지를 버퍼에 넣고 바로 반환 (이벤트 루프 스레드에서 호출, DB를 기다리지 않음).
+        반환한 항목의 payload(key 포함, id 없음)를 바로 브로드캐스트하면 되고,
+        future는 저장이 끝나면 id가 붙은 payload로, 최종 실패하면 예외로 끝난다.
+        """
+        loop = asyncio.get_running_loop()
+        # 표시용 시각 — 저장 트랜잭션에서 다시 붙임 (save_messages)
+        message = Message(room_id=room.pk, sender_id=user.id, content=content, timestamp=timezone.now())
+        entry = _Pending(room, message, user, loop.create_future())
+        with self._guard:
+            self.pending.append(entry)
+            size = len(self.pending)
+        if size >= self.batch_size:
+            asyncio.create_task(self.flush())
+        elif self._timer is None:
+            self._timer = loop.call_later(self.interval, lambda: asyncio.create_task(self.flush()))
+        return entry
+
+    async def flush(self):
+        """버퍼의 메시지를 모두 저장 (동시에 하나의 flush만 실행되어 저장 순서 유지)"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            with self._guard:
+                batch, self.pending = self.pending, []
+            if not batch:
+                return
+            saved, retry, failed = await database_sync_to_async(self._save)(batch)
+            for entry in saved:
+                _settle(entry, entry.payload)
+            for entry, exc in failed:
+                _settle(entry, exc=exc)
+            if self.notify:
+                await self._publish(saved, failed)
+            if retry:
+                # 일시적 실패(잠금 등)로 남은 메시지는 버퍼 앞에 되돌리고 잠시 후 재시도
+                with self._guard:
+                    self.pending[:0] = retry
+                self._timer = asyncio.get_running_loop().call_later(
+                    max(self.interval, RETRY_DELAY), lambda: asyncio.create_task(self.flush())
+                )
+
+    async def _publish(self, saved, failed):
+        """방별로 저장된 메시지의 key → id, 버린 메시지의 key를 전송"""
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        per_room = defaultdict(lambda: ([], []))
+        for entry in saved:
+            per_room[entry.room.pk][0].append({'key': entry.key, 'id': entry.message.id})
+        for entry, _ in failed:
+            per_room[entry.room.pk][1].append(entry.key)
+        for room_id, (messages, keys) in per_room.items():
+            try:
+                if messages:
+                    await channel_layer.group_send(room_group_name(room_id), {'type': 'chat.saved', 'messages': messages})
+                if keys:
+                    await channel_layer.group_send(room_group_name(room_id), {'type': 'chat.failed', 'keys': keys})
+            except Exception:
+                logger.warning('[MessageWriter] Room(%s) 저장 결과 전송 실패', room_id, exc_info=True)
+
+    def _save(self, batch):
+        """
+        (저장된 항목, 재시도할 항목, [(버린 항목, 예외)]) 반환.
+        배치가 실패하면 메시지별로 나눠 저장해 실패한 것만 골라냄
+        """
+        try:
+            save_messages([(entry.room, entry.message) for entry in batch])
+            self.written += len(batch)
+            return batch, [], []
+        except Exception:
+            logger.warning('[MessageWriter] %d건 배치 저장 실패, 메시지별로 재시도', len(batch), exc_info=True)
+
+        saved, retry, failed = [], [], []
+        for entry in batch:
+            entry.message.id = None
+            try:
+                save_messages([(entry.room, entry.message)])
+                self.written += 1
+                saved.append(entry)
+            except Exception as exc:
+                entry.message.id = None
+                entry.attempts += 1
+                if entry.attempts < self.max_attempts:
+                    retry.append(entry)
+                    continue
+                logger.exception(
+                    '[MessageWriter] Room(%s) 메시지 %d회 저장 실패로 버림', entry.room.pk, entry.attempts
+                )
+                self.dropped += 1
+                failed.append((entry, exc))
+        return saved, retry, failed
+
+    def flush_sync(self):
+        """프로세스 종료 시 (이벤트 루프 밖) 남은 메시지 저장. 저장 결과로 future도 모두 끝냄"""
+        with self._guard:
+            batch, self.pending = self.pending, []
+        if not batch:
+            return
+        try:
+            close_old_connections()
+            save_messages([(entry.room, entry.message) for entry in batch])
+        except Exception as exc:
+            logger.exception(
+                '[MessageWriter] 종료 시 %d건 저장 실패 (key: %s)', len(batch), ', '.join(e.key for e in batch)
+            )
+            self.dropped += len(batch)
+            for entry in batch:
+                _settle(entry, exc=exc)
+            return
+        self.written += len(batch)
+        for entry in batch:
+            _settle(entry, entry.payload)
+
+
+message_writer = MessageWriter()
+atexit.register(message_writer.flush_sync)
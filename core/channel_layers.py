@@ -0,0 +1,311 @@
+"""
+Redis 없이 같은 호스트의 여러 ASGI 워커가 공유하는 SQLite 채널 레이어.
+
+메시지는 별도 SQLite 파일(WAL)에 쌓이고, 각 워커 프로세스는 폴러 하나가
+자기 프로세스 채널("specific.<client>!<id>")로 온 메시지를 한 번의 쿼리로 모두 가져가
+연결별 inbox로 나눠 준다. 연결 수가 늘어도 DB 조회는 프로세스당 하나다.
+
+- group_send는 그룹 멤버 수만큼의 INSERT를 한 트랜잭션으로 처리 (fan-out)
+- expiry초가 지난 메시지/그룹 멤버십은 버려지고 주기적으로 삭제됨
+- 채널별 capacity를 넘으면 send는 ChannelFull, group_send는 해당 채널만 건너뜀
+- 메시지는 JSON으로 저장하므로 JSON으로 직렬화 가능한 dict만 보낼 수 있음
+
+settings.py:
+    CHANNEL_LAYER=sqlite (환경변수), 파일 경로는 CHANNEL_LAYER_DB
+"""
+import asyncio
+import json
+import sqlite3
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channel_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    client TEXT NOT NULL,
+    expires REAL NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS channel_messages_client_idx ON channel_messages (client, id);
+CREATE INDEX IF NOT EXISTS channel_messages_channel_idx ON channel_messages (channel, id);
+CREATE TABLE IF NOT EXISTS channel_groups (
+    grp TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (grp, channel)
+) WITHOUT ROWID;
+"""
+
+# 폴러가 한 번에 가져오는 최대 메시지 수
+FETCH_BATCH = 500
+# 만료 메시지/그룹 정리 주기(초)
+CLEANUP_INTERVAL = 10.0
+
+
+class _Inbox:
+    """프로세스 로컬 채널 하나의 수신 대기열"""
+    __slots__ = ('messages', 'event', 'receivers')
+
+    def __init__(self):
+        self.messages = deque()   # (expires, message)
+        self.event = asyncio.Event()
+        self.receivers = 0
+
+
+def _client_of(channel):
+    """"specific.<client>!<id>" → <client>. 프로세스 채널이 아니면 ''"""
+    if '!' not in channel:
+        return ''
+    return channel.split('!', 1)[0].rsplit('.', 1)[-1]
+
+
+class SQLiteChannelLayer(BaseChannelLayer):
+    extensions = ['groups', 'flush']
+
+    def __init__(self, path='channels.sqlite3', expiry=60, group_expiry=86400, capacity=100,
+                 channel_capacity=None, poll_interval=0.005, max_poll_interval=0.05, **kwargs):
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity, **kwargs)
+        self.path = str(path)
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.client = uuid.uuid4().hex
+        self._inboxes = {}
+        self._poller = None
+        self._db = None
+        # sqlite3 호출은 모두 이 스레드 하나에서 (연결 1개 재사용, 이벤트 루프는 블로킹되지 않음)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='channel-layer')
+
+    # ------------------------------------------------------
+    # DB (executor 스레드에서만 호출)
+    # ------------------------------------------------------
+    def _conn(self):
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.executescript(SCHEMA)
+            self._db = db
+        return self._db
+
+    async def _call(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _send_sync(self, channel, body, now):
+        db = self._conn()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            (queued,) = db.execute(
+                'SELECT COUNT(*) FROM channel_messages WHERE channel = ? AND expires > ?', (channel, now)
+            ).fetchone()
+            if queued >= self.get_capacity(channel):
+                raise ChannelFull(channel)
+            db.execute(
+                'INSERT INTO channel_messages (channel, client, expires, body) VALUES (?, ?, ?, ?)',
+                (channel, _client_of(channel), now + self.expiry, body),
+            )
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+
+    def _group_send_sync(self, group, body, now):
+        db = self._conn()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            channels = [row[0] for row in db.execute(
+                'SELECT channel FROM channel_groups WHERE grp = ? AND expires > ?', (group, now)
+            )]
+            if not channels:
+                db.execute('COMMIT')
+                return 0
+            marks = ','.join('?' * len(channels))
+            queued = dict(db.execute(
+                f'SELECT channel, COUNT(*) FROM channel_messages '
+                f'WHERE channel IN ({marks}) AND expires > ? GROUP BY channel',
+                (*channels, now),
+            ).fetchall())
+            rows = [
+                (channel, _client_of(channel), now + self.expiry, body)
+                for channel in channels
+                if queued.get(channel, 0) < self.get_capacity(channel)
+            ]
+            db.executemany(
+                'INSERT INTO channel_messages (channel, client, expires, body) VALUES (?, ?, ?, ?)', rows
+            )
+            db.execute('COMMIT')
+            return len(rows)
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+
+    def _take_client_sync(self, now):
+        """이 프로세스 채널로 온 메시지를 꺼내고 삭제"""
+        db = self._conn()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            rows = db.execute(
+                'SELECT id, channel, expires, body FROM channel_messages WHERE client = ? ORDER BY id LIMIT ?',
+                (self.client, FETCH_BATCH),
+            ).fetchall()
+            if rows:
+                db.execute('DELETE FROM channel_messages WHERE client = ? AND id <= ?', (self.client, rows[-1][0]))
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        return [(channel, expires, body) for _, channel, expires, body in rows if expires > now]
+
+    def _take_channel_sync(self, channel, now):
+        """일반(프로세스 비전용) 채널에서 가장 오래된 유효 메시지 하나"""
+        db = self._conn()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            row = db.execute(
+                'SELECT id, body FROM channel_messages WHERE channel = ? AND expires > ? ORDER BY id LIMIT 1',
+                (channel, now),
+            ).fetchone()
+            if row:
+                db.execute('DELETE FROM channel_messages WHERE id = ?', (row[0],))
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        return row[1] if row else None
+
+    def _cleanup_sync(self, now):
+        db = self._conn()
+        db.execute('DELETE FROM channel_messages WHERE expires <= ?', (now,))
+        db.execute('DELETE FROM channel_groups WHERE expires <= ?', (now,))
+
+    # ------------------------------------------------------
+    # 채널 레이어 API
+    # ------------------------------------------------------
+    async def send(self, channel, message):
+        assert isinstance(message, dict), 'message is not a dict'
+        assert self.valid_channel_name(channel), 'Channel name not valid'
+        assert '__asgi_channel__' not in message
+        await self._call(self._send_sync, channel, json.dumps(message), time.time())
+
+    async def receive(self, channel):
+        assert self.valid_channel_name(channel)
+        if '!' not in channel:
+            return await self._receive_polling(channel)
+
+        inbox = self._inboxes.get(channel)
+        if inbox is None:
+            inbox = self._inboxes[channel] = _Inbox()
+        inbox.receivers += 1
+        self._ensure_poller()
+        try:
+            while True:
+                now = time.time()
+                while inbox.messages and inbox.messages[0][0] <= now:
+                    inbox.messages.popleft()
+                if inbox.messages:
+                    return inbox.messages.popleft()[1]
+                inbox.event.clear()
+                await inbox.event.wait()
+        finally:
+            inbox.receivers -= 1
+            if not inbox.receivers and not inbox.messages:
+                self._inboxes.pop(channel, None)
+
+    async def _receive_polling(self, channel):
+        delay = self.poll_interval
+        while True:
+            body = await self._call(self._take_channel_sync, channel, time.time())
+            if body is not None:
+                return json.loads(body)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_poll_interval)
+
+    async def new_channel(self, prefix='specific'):
+        return f'{prefix}.{self.client}!{uuid.uuid4().hex}'
+
+    def _ensure_poller(self):
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+
+    async def _poll(self):
+        """로컬 inbox가 남아 있는 동안 이 프로세스 메시지를 가져와 분배 (유휴 시 간격을 점점 늘림)"""
+        delay = self.poll_interval
+        next_cleanup = time.monotonic() + CLEANUP_INTERVAL
+        while self._inboxes:
+            now = time.time()
+            rows = await self._call(self._take_client_sync, now)
+            for channel, expires, body in rows:
+                inbox = self._inboxes.get(channel)
+                if inbox is None:
+                    # 아직 receive()를 호출하지 않은 연결 → 나중에 받도록 보관
+                    inbox = self._inboxes[channel] = _Inbox()
+                inbox.messages.append((expires, json.loads(body)))
+                inbox.event.set()
+
+            if time.monotonic() >= next_cleanup:
+                next_cleanup = time.monotonic() + CLEANUP_INTERVAL
+                self._drop_orphans(now)
+                await self._call(self._cleanup_sync, now)
+
+            if len(rows) == FETCH_BATCH:
+                continue
+            delay = self.poll_interval if rows else min(delay * 2, self.max_poll_interval)
+            await asyncio.sleep(delay)
+
+    def _drop_orphans(self, now):
+        """받는 쪽이 없는 inbox의 만료 메시지 정리 (끊긴 연결 앞으로 늦게 온 메시지)"""
+        for channel, inbox in list(self._inboxes.items()):
+            if inbox.receivers:
+                continue
+            while inbox.messages and inbox.messages[0][0] <= now:
+                inbox.messages.popleft()
+            if not inbox.messages:
+                del self._inboxes[channel]
+
+    # ------------------------------------------------------
+    # groups / flush
+    # ------------------------------------------------------
+    def _group_add_sync(self, group, channel, expires):
+        self._conn().execute(
+            'INSERT OR REPLACE INTO channel_groups (grp, channel, expires) VALUES (?, ?, ?)',
+            (group, channel, expires),
+        )
+
+    def _group_discard_sync(self, group, channel):
+        self._conn().execute('DELETE FROM channel_groups WHERE grp = ? AND channel = ?', (group, channel))
+
+    async def group_add(self, group, channel):
+        assert self.valid_group_name(group), 'Group name not valid'
+        assert self.valid_channel_name(channel), 'Channel name not valid'
+        await self._call(self._group_add_sync, group, channel, time.time() + self.group_expiry)
+
+    async def group_discard(self, group, channel):
+        assert self.valid_group_name(group), 'Group name not valid'
+        assert self.valid_channel_name(channel), 'Channel name not valid'
+        await self._call(self._group_discard_sync, group, channel)
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), 'Message is not a dict'
+        assert self.valid_group_name(group), 'Group name not valid'
+        await self._call(self._group_send_sync, group, json.dumps(message), time.time())
+
+    def _flush_sync(self):
+        db = self._conn()
+        db.execute('DELETE FROM channel_messages')
+        db.execute('DELETE FROM channel_groups')
+
+    async def flush(self):
+        self._inboxes.clear()
+        await self._call(self._flush_sync)
+
+    async def close(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
@@ -0,0 +1,21 @@
+import base64
+from datetime import datetime
+
+
+def encode_cursor(timestamp, pk):
+    """(timestamp, id) 키셋 위치를 URL에 안전한 불투명 문자열로 인코딩"""
+    raw = f"{timestamp.isoformat()}|{pk}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """encode_cursor의 역변환. 잘못된 값이면 None 반환"""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        ts, pk = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(pk)
+    except (ValueError, UnicodeError):
+        return None
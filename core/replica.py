@@ -0,0 +1,77 @@
+"""
+읽기 전용 복제본(DATABASES['replica']) 라우팅.
+
+모든 조회를 복제본으로 보내면 방금 쓴 데이터가 복제 지연 때문에 안 보일 수 있으므로,
+지연이 허용되는 화면(상품 목록/피드 API)만 read_replica() 안에서 실행해
+(프로필처럼 자기가 방금 쓴 내용을 보는 화면은 default)
+그 동안의 조회를 복제본으로 보낸다. 쓰기와 마이그레이션은 항상 default.
+복제본이 설정되지 않았으면(SQLite, 단일 PostgreSQL) 아무것도 바꾸지 않는다.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+REPLICA = 'replica'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+@contextmanager
+def read_replica():
+    """이 블록 안의 ORM 조회를 복제본으로 보냄"""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def _render_on_replica(handler, request, *args, **kwargs):
+    if request.method not in SAFE_METHODS:
+        return handler(request, *args, **kwargs)
+    # 세션/로그인 사용자는 로그인 직후에도 보여야 하므로 복제본에 들어가기 전에 default에서 로드
+    user = getattr(request, 'user', None)
+    if user is not None:
+        user.is_authenticated
+    with read_replica():
+        response = handler(request, *args, **kwargs)
+        # TemplateResponse는 뷰가 끝난 뒤 렌더링되므로, 템플릿 안의 지연 조회도 복제본에서 끝나도록 여기서 렌더링
+        if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+            response.render()
+    return response
+
+
+def replica_reads(view_func):
+    """함수 뷰용: GET/HEAD 요청의 조회를 복제본으로"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        return _render_on_replica(view_func, request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """클래스 뷰/DRF ViewSet용: GET/HEAD 요청의 조회를 복제본으로"""
+
+    def dispatch(self, request, *args, **kwargs):
+        return _render_on_replica(super().dispatch, request, *args, **kwargs)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and REPLICA in settings.DATABASES:
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 default와 같은 데이터이므로 어느 쪽에서 읽은 객체끼리도 관계 허용
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
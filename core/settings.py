@@ -56,6 +56,64 @@ ASGI_APPLICATION = 'core.asgi.application'
 
 DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'db.sqlite3'}}
 
+# SQLite 운영 프로필: 웹 워커들과 라즈베리파이 프로세스(embedded/raspberry_pi.py)가 같은 db.sqlite3에 쓴다.
+# - WAL: 쓰는 동안에도 읽기가 막히지 않음 / synchronous=NORMAL: WAL에서는 커밋마다 fsync하지 않아도 안전
+# - busy_timeout: 잠금을 바로 "database is locked"로 실패시키지 않고 기다림
+# - IMMEDIATE: atomic 블록이 시작할 때 쓰기 잠금을 잡아, 읽다가 쓰기로 올릴 때 busy_timeout 없이
+#   바로 실패하는 경우를 없앰
+# - CONN_MAX_AGE: 기본 0 (요청마다 새 연결 + PRAGMA 실행).
+#   운영 서버인 Daphne(ASGI)은 동기 뷰를 매번 새 스레드에서 실행하고 Django 연결은 스레드별이라,
+#   값을 올려도 재사용되지 않고 GC될 때까지 유휴 연결만 남는다 (Django ticket #33497).
+#   gunicorn 등 WSGI 워커로 띄울 때만 DB_CONN_MAX_AGE로 올려서 사용
+# - CONN_HEALTH_CHECKS: 재사용하는 연결에만 의미가 있으므로 DB_CONN_MAX_AGE > 0일 때만 켬
+# SQLITE_PROFILE=default 이면 Django 기본값 그대로 (비교 측정용, bench_db_concurrency 참고)
+_SQLITE_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 0))
+SQLITE_PRODUCTION = {
+    'OPTIONS': {
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': ';'.join([
+            'PRAGMA journal_mode=WAL',
+            'PRAGMA synchronous=NORMAL',
+            f"PRAGMA busy_timeout={int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+            'PRAGMA mmap_size=134217728',   # 128MB
+            'PRAGMA cache_size=-16000',     # 16MB (음수는 KiB 단위)
+        ]),
+    },
+    'CONN_MAX_AGE': _SQLITE_CONN_MAX_AGE,
+    'CONN_HEALTH_CHECKS': _SQLITE_CONN_MAX_AGE > 0,
+}
+
+if os.environ.get('DB_ENGINE') == 'postgres':
+    # PostgreSQL (선택): psycopg[binary,pool] 필요. 연결은 psycopg 풀에서 재사용 (풀 사용 시 CONN_MAX_AGE는 0)
+    _postgres = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('POSTGRES_DB', 'jungo'),
+        'USER': os.environ.get('POSTGRES_USER', 'jungo'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.environ.get('POSTGRES_POOL_MIN', 2)),
+                'max_size': int(os.environ.get('POSTGRES_POOL_MAX', 10)),
+                'timeout': 10,
+            },
+        },
+    }
+    DATABASES = {'default': _postgres}
+    if os.environ.get('POSTGRES_REPLICA_HOST'):
+        # 읽기 전용 복제본 — 목록/피드 조회만 보냄 (core.replica 참고)
+        DATABASES['replica'] = {
+            **_postgres,
+            'HOST': os.environ['POSTGRES_REPLICA_HOST'],
+            'PORT': os.environ.get('POSTGRES_REPLICA_PORT', _postgres['PORT']),
+            'TEST': {'MIRROR': 'default'},
+        }
+elif os.environ.get('SQLITE_PROFILE', 'production') == 'production':
+    DATABASES['default'].update(SQLITE_PRODUCTION)
+
+DATABASE_ROUTERS = ['core.replica.ReadReplicaRouter']
+
 _redis_url = os.environ.get('REDIS_URL')
 if _redis_url:
     CHANNEL_LAYERS = {
@@ -64,6 +122,18 @@ if _redis_url:
             'CONFIG': {'hosts': [_redis_url]},
         },
     }
+elif os.environ.get('CHANNEL_LAYER') == 'sqlite':
+    # Redis 없이 같은 호스트의 여러 ASGI 워커가 채팅 그룹을 공유 (core.channel_layers 참고)
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'core.channel_layers.SQLiteChannelLayer',
+            'CONFIG': {
+                'path': os.environ.get('CHANNEL_LAYER_DB', str(BASE_DIR / 'channels.sqlite3')),
+                'expiry': 60,
+                'capacity': 100,
+            },
+        },
+    }
 else:
     CHANNEL_LAYERS = {
         'default': {
@@ -71,6 +141,9 @@ else:
         },
     }
 
+# 채팅 메시지를 DB 저장 전에 바로 브로드캐스트하고 저장은 모아서 처리 (저장 후 chat.saved로 id 전달, chat.write_behind 참고)
+CHAT_WRITE_BEHIND = os.environ.get('CHAT_WRITE_BEHIND') == '1'
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = 'ko-kr'
@@ -84,12 +157,18 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# 이미지 업로드/변경 시 이 프로세스에서 썸네일을 백그라운드로 생성 (listings.thumbnails).
+# 보관함(Pi) 프로세스는 0 — 그쪽에서 바뀐 이미지는 웹의 상세 화면 또는 manage.py build_thumbnails가 생성
+THUMBNAILS_IN_PROCESS = os.environ.get('THUMBNAILS_IN_PROCESS', '1') == '1'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': ['rest_framework.authentication.SessionAuthentication'],
     'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticatedOrReadOnly'],
 }
 
+# 이 서버에 연결된 보관함 ID (라즈베리파이 프로세스도 같은 값으로 촬영 세션을 조회)
+LOCKER_ID = os.getenv('LOCKER_ID', 'locker-1')
+
 LOGIN_URL = '/accounts/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import tempfile
+
+from channels.exceptions import ChannelFull
+from django.test import SimpleTestCase
+
+from .channel_layers import SQLiteChannelLayer
+
+
+class SQLiteChannelLayerTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'channels.sqlite3')
+
+    def make_layer(self, **config):
+        layer = SQLiteChannelLayer(path=self.path, **config)
+        self.addCleanup(layer._executor.shutdown)
+        return layer
+
+    def run_async(self, coro):
+        return asyncio.run(asyncio.wait_for(coro, 5))
+
+    def test_send_receive_round_trip(self):
+        layer = self.make_layer()
+
+        async def scenario():
+            channel = await layer.new_channel()
+            await layer.send(channel, {'type': 'chat.message', 'content': '안녕하세요'})
+            await layer.send('plain', {'type': 'ping', 'n': 1})
+            try:
+                return await layer.receive(channel), await layer.receive('plain')
+            finally:
+                await layer.close()
+
+        specific, plain = self.run_async(scenario())
+        self.assertEqual(specific, {'type': 'chat.message', 'content': '안녕하세요'})
+        self.assertEqual(plain, {'type': 'ping', 'n': 1})
+
+    def test_group_send_fans_out_across_workers(self):
+        # 같은 파일을 쓰는 두 레이어 = 두 워커 프로세스
+        first, second = self.make_layer(), self.make_layer()
+
+        async def scenario():
+            a = await first.new_channel()
+            b = await second.new_channel()
+            left = await second.new_channel()
+            for channel, layer in ((a, first), (b, second), (left, second)):
+                await layer.group_add('chat_1', channel)
+            await second.group_discard('chat_1', left)
+            await first.group_send('chat_1', {'type': 'chat.message', 'content': 'hi'})
+            try:
+                received = [await first.receive(a), await second.receive(b)]
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(second.receive(left), 0.2)
+                return received
+            finally:
+                await first.close()
+                await second.close()
+
+        received = self.run_async(scenario())
+        self.assertEqual(received, [{'type': 'chat.message', 'content': 'hi'}] * 2)
+
+    def test_expired_messages_and_groups_are_dropped(self):
+        layer = self.make_layer(expiry=0.05, group_expiry=0.05)
+
+        async def scenario():
+            await layer.send('plain', {'type': 'old'})
+            channel = await layer.new_channel()
+            await layer.group_add('chat_1', channel)
+            await asyncio.sleep(0.1)
+            # 만료된 그룹 멤버에게는 보내지 않고, 만료된 메시지는 받지 않음
+            await layer.group_send('chat_1', {'type': 'late'})
+            await layer.send('plain', {'type': 'new'})
+            try:
+                message = await layer.receive('plain')
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(layer.receive(channel), 0.2)
+                return message
+            finally:
+                await layer.close()
+
+        self.assertEqual(self.run_async(scenario()), {'type': 'new'})
+
+    def test_send_over_capacity_raises_channel_full(self):
+        layer = self.make_layer(capacity=2)
+
+        async def scenario():
+            await layer.send('plain', {'n': 1})
+            await layer.send('plain', {'n': 2})
+            with self.assertRaises(ChannelFull):
+                await layer.send('plain', {'n': 3})
+            # group_send는 가득 찬 채널만 건너뜀
+            await layer.group_add('chat_1', 'plain')
+            await layer.group_send('chat_1', {'n': 4})
+            return [await layer.receive('plain') for _ in range(2)]
+
+        self.assertEqual(self.run_async(scenario()), [{'n': 1}, {'n': 2}])
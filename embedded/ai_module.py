@@ -1,92 +1,47 @@
-import base64
-import json
-from openai import OpenAI
-from config_loader import config
+import asyncio
 from logger import write_log   # pi.log 기록
-from listings.models import Listing
-from django.core.files import File
-import os
-
-# API KEY
-openai_key = config.get("openai", {}).get("api_key")
-client = OpenAI(api_key=openai_key)
-
-
-def analyze_image(image_path: str):
-    # 이미지 Base64 변환
-    with open(image_path, "rb") as f:
-        image_base64 = base64.b64encode(f.read()).decode("utf-8")
-
-    # ----- 1) OpenAI Vision 요청 -----
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "너는 제품 브랜드·모델·중고 시세를 분석하는 전문가이다. "
-                    "중고가는 반드시 '당근마켓 기준 중고 거래가'로 판단한다. "
-                    "중고가는 문자열이 아니라 정수 배열 형태로 출력해야 한다."
-                ),
-            },
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": (
-                            "이 사진 속 제품의 브랜드, 모델명, confidence(0~100)를 판별하고 "
-                            "당근마켓 기준 중고가를 배열 형태로 제공해줘.\n"
-                            "예: {'brand':'Samsung','product':'Galaxy S21','confidence':90,'used_price':[15,18]}\n"
-                            "반드시 JSON 딕셔너리 형식만 출력해."
-                        ),
-                    },
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/jpeg;base64,{image_base64}"
-                        },
-                    },
-                ],
-            },
-        ],
-    )
+from result_cache import dhash, get_cache
+from preprocess import encode_for_vision
+import vision_client
+
+
+async def request_analysis(image):
+    """
+    OpenAI Vision 호출 → 결과 dict.
+    image: 파일 경로 / 카메라 프레임(ndarray) / 이미 인코딩된 JPEG bytes
+    """
+    # 축소 + JPEG 재인코딩은 CPU 작업이므로 스레드에서, API 호출은 비동기 클라이언트로
+    jpeg_bytes = image if isinstance(image, bytes) else await asyncio.to_thread(encode_for_vision, image)
+    result_dict = await vision_client.analyze(jpeg_bytes)
+    print("🧠 AI 분석 결과:", result_dict)
+    return result_dict
 
-    result_text = response.choices[0].message.content
-    print("🧠 AI 분석 원문:", result_text)
 
-    # ----- 2) JSON 파싱 -----
+def lookup_cache(source):
+    """(해시, 캐시된 결과 또는 None). 같은 물건 재감지 시 API 호출을 건너뛰기 위한 지각 해시 캐시"""
+    analysis_cache = get_cache()
+    if analysis_cache is None:
+        return None, None
     try:
-        clean_text = result_text.replace("'", '"')
-        result_dict = json.loads(clean_text)
-    except:
-        result_dict = {"raw": result_text}
+        image_hash = dhash(source)
+    except Exception as e:
+        write_log(f"[WARN] 이미지 해시 계산 실패: {e}")
+        return None, None
+    return image_hash, analysis_cache.get(image_hash)
 
-    write_log(f"[AI] 분석 결과: {result_dict}")
 
-    # ----- 3) Listing DB 저장 -----
-    try:
-        last_listing = Listing.objects.last()
-        if last_listing:
-            # 3-1. 촬영 이미지 저장
-            file_name = os.path.basename(image_path)
-            with open(image_path, "rb") as f:
-                last_listing.capture_image.save(file_name, File(f), save=False)
+async def analyze_image(image_path: str, frame=None):
+    # frame(촬영 직후 메모리의 프레임)이 있으면 저장된 파일을 다시 읽지 않음
+    source = frame if frame is not None else image_path
 
-            # 3-2. used_price 배열 → 최저가 저장
-            if "used_price" in result_dict and isinstance(result_dict["used_price"], list):
-                used_low = min(result_dict["used_price"])
-                last_listing.used_low_price = used_low
+    # ----- 1) 캐시 조회 → 없으면 OpenAI Vision 요청 -----
+    image_hash, result_dict = await asyncio.to_thread(lookup_cache, source)
 
-            last_listing.save()
-            print(f"📌 Listing({last_listing.id})에 이미지 + 최저가 저장 완료")
-            write_log(f"[DB] Listing({last_listing.id}) 저장 완료")
-        else:
-            print("❌ 저장할 Listing(상품)이 없음")
-            write_log("[ERROR] 저장할 Listing이 없음")
-    except Exception as e:
-        print(f"⚠️ Listing 저장 오류: {e}")
-        write_log(f"[ERROR] Listing 저장 오류: {e}")
+    if result_dict is None:
+        result_dict = await request_analysis(source)
+        # 파싱 실패(raw) 결과는 캐시하지 않음
+        if image_hash is not None and "raw" not in result_dict:
+            await asyncio.to_thread(get_cache().put, image_hash, result_dict)
 
-    # 결과 반환
+    write_log(f"[AI] 분석 결과: {result_dict}")
     return result_dict
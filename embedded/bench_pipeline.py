@@ -0,0 +1,159 @@
+"""
+보관함 파이프라인 부하 벤치마크 (하드웨어 없이).
+
+    python embedded/bench_pipeline.py [--bursts 5 --burst-size 4 --spacing 0.1 --gap 3]
+                                      [--script traffic.txt] [--frames 이미지폴더]
+                                      [--latency 0.8 --jitter 0.2 --fail-rate 0.05] [--binary]
+                                      [--debounce 0]
+
+임시 폴더에 DB/미디어를 만들고 raspberry_pi.start_runtime()을 그대로 실행한 뒤,
+가상 Uno(pty)로 버스트성 ULTRA/CHECK 트래픽을 재생한다
+(ULTRA마다 앞에 판매자 입고 코드 DEPOSIT을 넣음). 카메라는 SimulatedCamera,
+Vision은 로컬 스텁 서버를 쓴다. 끝나면 감지(가상 Uno 송신)→DB 반영 지연 백분위와
+유실/중복 감지(직전 작업에 합침)/실패 건수를 출력한다. 중복 감지 창(--debounce)은 기본으로 운영 설정과 같은 값을 쓰며,
+결과에 사용한 값과 운영 값을 함께 출력한다.
+"""
+import argparse
+import asyncio
+import bisect
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sim import environment  # noqa: E402
+from sim.virtual_serial import VirtualUno, bursty_script, load_script, with_deposits  # noqa: E402
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def latency_summary(samples):
+    if not samples:
+        return "-"
+    ordered = sorted(samples)
+    return " ".join(
+        f"{name}={percentile(ordered, q) * 1000:.0f}ms" for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+    ) + f" max={ordered[-1] * 1000:.0f}ms"
+
+
+async def drain(pipeline, timeout):
+    """파이프라인 큐가 모두 비고 진행 중 작업이 끝날 때까지 대기"""
+    async def _join():
+        for q in (pipeline.ingress, pipeline.upload_queue, pipeline.analyze_queue):
+            await q.join()
+    try:
+        await asyncio.wait_for(_join(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+async def run(args, uno, events):
+    import raspberry_pi
+    from pipeline import capture_pipeline
+
+    if args.debounce is not None:
+        capture_pipeline.debounce = args.debounce
+    detections = []        # (감지→DB 지연, ok)
+    ultra_sent = []        # 가상 Uno가 ULTRA를 보낸 시각 (monotonic, 정렬됨)
+
+    def on_finish(job, ok, total):
+        # 수신 시각 직전에 보낸 ULTRA가 이 작업의 감지 시점
+        index = bisect.bisect_right(ultra_sent, job.triggered_at) - 1
+        started = ultra_sent[index] if index >= 0 else job.triggered_at
+        detections.append((time.monotonic() - started, ok))
+
+    capture_pipeline.listeners.append(on_finish)
+
+    await raspberry_pi.start_runtime()
+    await asyncio.sleep(args.warmup)
+
+    started = time.monotonic()
+    await asyncio.to_thread(uno.play, events)
+    ultra_sent.extend(t for t, message in uno.sent_at if message.startswith("ULTRA:"))
+    drained = await drain(capture_pipeline, args.drain_timeout)
+    await asyncio.sleep(0.5)   # 마지막 CHECK 응답 수신 대기
+    return detections, time.monotonic() - started, drained
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--script", help="재생할 스크립트 파일 (없으면 버스트 시나리오 생성)")
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--burst-size", type=int, default=4)
+    parser.add_argument("--spacing", type=float, default=0.1, help="버스트 내 메시지 간격(초)")
+    parser.add_argument("--gap", type=float, default=3.0, help="버스트 사이 간격(초)")
+    parser.add_argument("--checks", type=int, default=2, help="버스트마다 보낼 CHECK 수")
+    parser.add_argument("--binary", action="store_true", help="바이너리 프레임으로 전송")
+    parser.add_argument("--frames", help="SimulatedCamera가 순환할 이미지 폴더")
+    parser.add_argument("--latency", type=float, default=0.8, help="Vision 스텁 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--stub-port", type=int, default=8765)
+    parser.add_argument(
+        "--debounce", type=float, default=None,
+        help="파이프라인 중복 감지 창(초). 기본: 운영 설정(pipeline.debounce_seconds)",
+    )
+    parser.add_argument("--cache", action="store_true", help="AI 결과 캐시 사용 (기본: 끔)")
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--drain-timeout", type=float, default=120.0)
+    parser.add_argument("--workdir", help="DB/미디어 폴더 (기본: 임시 폴더)")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="locker-sim-")
+
+    # vision_client가 import되기 전에 스텁 주소를 환경변수로 지정
+    environment.start_vision_stub(args.stub_port, args.latency, args.jitter, args.fail_rate)
+    environment.setup_django(workdir)
+
+    if args.script:
+        events = load_script(args.script)
+        checks = []
+    else:
+        checks, _ = environment.seed(0, orders=args.checks)
+        events = bursty_script(args.bursts, args.burst_size, args.spacing, args.gap, checks)
+    ultra_count = sum(1 for e in events if e.message == "ULTRA:1")
+    _, deposits = environment.seed(ultra_count)
+    # 실제 보관함처럼 감지마다 판매자 입고 코드를 먼저 입력
+    events = with_deposits(events, deposits)
+
+    environment.use_simulated_camera(workdir, args.frames)
+    if not args.cache:
+        import result_cache
+        result_cache.set_cache(None)
+
+    uno = VirtualUno(binary=args.binary)
+    os.environ["UNO_PORT"] = uno.start()
+
+    try:
+        detections, elapsed, drained = asyncio.run(run(args, uno, events))
+    finally:
+        uno.close()
+
+    from pipeline import DEBOUNCE_SECONDS, capture_pipeline as p
+
+    ok = [d for d, success in detections if success]
+    print(f"\n== 시뮬레이션 결과 ({workdir})")
+    print(
+        f"설정     debounce={p.debounce:g}s (운영 {DEBOUNCE_SECONDS:g}s) spacing={args.spacing:g}s gap={args.gap:g}s "
+        f"burst={args.burst_size}x{args.bursts} {'binary' if args.binary else 'text'}"
+    )
+    print(f"전송     ULTRA={uno.sent['ULTRA']} DEPOSIT={uno.sent['DEPOSIT']} CHECK={uno.sent['CHECK']} ({elapsed:.1f}s)")
+    print(f"수신     received={p.received} (시리얼 유실 {uno.sent['ULTRA'] - p.received})")
+    print(f"처리     submitted={p.submitted} completed={p.completed} failed={p.failed}")
+    print(
+        f"버림     dropped={p.dropped} debounced={p.debounced} unbound={p.unbound}"
+        + ("" if drained else " (drain 시간 초과)")
+    )
+    print(f"응답     {dict(uno.responses)} ack={uno.acks}")
+    print(f"감지→DB  n={len(ok)} {latency_summary(ok)}")
+    for stage, metric in p.metrics.items():
+        print(f"  {stage:<8} n={metric.count} {metric.summary()}")
+
+
+if __name__ == "__main__":
+    main()
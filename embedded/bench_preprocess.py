@@ -0,0 +1,90 @@
+"""
+Vision 전송 전처리 벤치마크.
+
+    python embedded/bench_preprocess.py [이미지 경로 ...] [--live]
+
+설정 조합(max_edge × quality)별로 base64 페이로드 크기와 인코딩 시간을 출력한다.
+--live를 주면 Vision 호출까지 포함한 end-to-end 지연시간도 측정한다
+(OPENAI_BASE_URL로 vision_stub.py를 지정하면 오프라인 측정 가능).
+이미지를 주지 않으면 1920x1080 합성 프레임을 사용한다.
+"""
+import argparse
+import asyncio
+import base64
+import os
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from preprocess import encode_for_vision, load_frame  # noqa: E402
+
+SETTINGS = [
+    (0, 95),      # 원본 해상도 (현재 경로와 유사)
+    (1280, 85),
+    (1024, 80),
+    (768, 80),
+    (768, 60),
+    (512, 70),
+]
+
+
+def synthetic_frame():
+    frame = np.full((1080, 1920, 3), 180, np.uint8)
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        center = tuple(int(c) for c in rng.integers(0, [1920, 1080]))
+        cv2.circle(frame, center, int(rng.integers(20, 200)), color, -1)
+    noise = rng.integers(-12, 12, frame.shape)
+    return np.clip(frame.astype(int) + noise, 0, 255).astype(np.uint8)
+
+
+def time_call(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("images", nargs="*")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--live", action="store_true", help="실제 Vision API 호출 포함")
+    args = parser.parse_args()
+
+    frames = [(path, load_frame(path)) for path in args.images] or [("synthetic", synthetic_frame())]
+
+    request_analysis = None
+    if args.live:
+        # ai_module은 Django 모델을 import하므로 필요할 때만 초기화
+        import django
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+        django.setup()
+        from ai_module import request_analysis
+
+    for name, frame in frames:
+        print(f"\n== {name} ({frame.shape[1]}x{frame.shape[0]})")
+        print(f"{'max_edge':>9}{'quality':>9}{'payload':>12}{'encode p50':>12}" + ("{:>12}".format("e2e") if args.live else ""))
+        for max_edge, quality in SETTINGS:
+            data, encode_ms = time_call(
+                lambda: encode_for_vision(frame, max_edge=max_edge, quality=quality, crop=1.0), args.repeat
+            )
+            payload = len(base64.b64encode(data))
+            line = f"{max_edge or 'orig':>9}{quality:>9}{payload / 1024:>10.1f}KB{encode_ms:>10.1f}ms"
+            if request_analysis is not None:
+                _, e2e_ms = time_call(lambda: asyncio.run(request_analysis(data)), 1)
+                line += f"{e2e_ms:>10.0f}ms"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+시리얼 수신 파서 벤치마크 (리플레이).
+
+    python embedded/bench_serial.py [--messages 200000] [--chunk 1-64]
+
+실제 Uno 트래픽과 같은 메시지(ULTRA / CHECK / 초음파 디버그 줄)를 만들어
+시리얼 read()처럼 임의 크기 조각으로 잘라 넣고, 다음 세 경우의 처리량을 비교한다.
+
+  legacy   기존 str 누적 + split("\\n", 1) 루프
+  text     FrameParser — 텍스트 fallback 경로
+  binary   FrameParser — 바이너리 프레임
+
+조각 단위 재생과 한 번에 몰아서 들어오는 버스트(백로그) 두 경우를 측정한다.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from framing import FrameParser, encode_frame, MSG_CHECK, MSG_ULTRA  # noqa: E402
+
+
+def build_messages(count, seed=0):
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.2:
+            messages.append(("ULTRA", b"\x01"))
+        elif roll < 0.6:
+            body = f"{rng.randint(1, 9999)}:{rng.randint(0, 999999):06d}".encode()
+            messages.append(("CHECK", body))
+        else:
+            messages.append(("DEBUG", f"{rng.uniform(2, 200):.2f} cm".encode()))
+    return messages
+
+
+def text_stream(messages):
+    out = bytearray()
+    for kind, body in messages:
+        if kind == "ULTRA":
+            out += b"ULTRA:1\n"
+        elif kind == "CHECK":
+            out += b"CHECK:" + body + b"\n"
+        else:
+            out += body + b"\n"
+    return bytes(out)
+
+
+def binary_stream(messages):
+    out = bytearray()
+    seq = 0
+    for kind, body in messages:
+        seq = (seq + 1) & 0xFF
+        if kind == "ULTRA":
+            out += encode_frame(MSG_ULTRA, body, seq)
+        elif kind == "CHECK":
+            out += encode_frame(MSG_CHECK, body, seq)
+        else:
+            out += body + b"\n"   # 디버그 출력은 바이너리 모드에서도 텍스트 그대로
+    return bytes(out)
+
+
+def chunked(data, low, high, seed=1):
+    rng = random.Random(seed)
+    chunks = []
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(low, high)
+        chunks.append(data[pos:pos + size])
+        pos += size
+    return chunks
+
+
+def run_legacy(chunks):
+    """serial_handler의 기존 수신 루프"""
+    buffer = ""
+    count = 0
+    for data in chunks:
+        buffer += data.decode(errors="ignore")
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            if line.strip():
+                count += 1
+    return count
+
+
+def run_parser(chunks):
+    parser = FrameParser()
+    count = 0
+    for data in chunks:
+        count += len(parser.feed(data))
+    return count
+
+
+def measure(fn, chunks, nbytes, repeat):
+    best = None
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = fn(chunks)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count, count / best, nbytes / best / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--chunk", default="1-64", help="조각 크기 범위 (예: 1-64)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    low, high = (int(v) for v in args.chunk.split("-"))
+    messages = build_messages(args.messages)
+    streams = {"text": text_stream(messages), "binary": binary_stream(messages)}
+
+    cases = [
+        ("legacy", run_legacy, "text"),
+        ("text", run_parser, "text"),
+        ("binary", run_parser, "binary"),
+    ]
+
+    for mode, label in (("chunk", f"{low}-{high}B 조각"), ("burst", "단일 버스트")):
+        print(f"\n== {label} ({args.messages}건)")
+        print(f"{'parser':>8}{'bytes':>12}{'msgs':>10}{'msgs/s':>14}{'MB/s':>10}")
+        for name, fn, stream in cases:
+            data = streams[stream]
+            if mode == "chunk":
+                chunks = chunked(data, low, high)
+            else:
+                chunks = [data]
+                if name == "legacy" and args.messages > 20000:
+                    # split("\n", 1) 루프는 버스트 크기에 대해 O(n²) — 일부만 측정
+                    chunks = [data[:len(data) * 20000 // args.messages]]
+            nbytes = sum(len(c) for c in chunks)
+            count, rate, mbps = measure(fn, chunks, nbytes, args.repeat)
+            print(f"{name:>8}{nbytes:>12}{count:>10}{rate:>14,.0f}{mbps:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,181 @@
+"""
+보관함 카메라.
+
+stream 모드(기본)에서는 저해상도 연속 캡처 스레드가 최근 프레임을 FrameRing에 계속 채우고,
+capture_image()는 새 still을 기다리지 않고 최근 pick_last장 중 가장 선명한 프레임을 골라 저장한다.
+stream: false면 기존처럼 요청 시 1920x1080 still을 한 장 찍는다.
+
+백엔드:
+    picamera2  Raspberry Pi 카메라 모듈
+    opencv     V4L2/USB 웹캠 (cv2.VideoCapture 핸들을 한 번 열어 계속 재사용)
+    auto       picamera2를 쓸 수 없으면 opencv
+    simulated  하드웨어 없이 합성 프레임(또는 sim_dir의 이미지)을 생성하는 SimulatedCamera
+
+config.yml:
+    camera:
+      backend: auto           # auto / picamera2 / opencv / simulated
+      device: 0               # opencv: 장치 번호 또는 /dev/videoN
+      stream: true
+      stream_size: [1280, 720]
+      fps: 15
+      ring_size: 8            # 링 버퍼 슬롯 수
+      pick_last: 5            # 선명도 비교 대상 (최근 N장)
+      max_age: 1.0            # 이보다 오래된 프레임은 후보 제외(초)
+      sim_dir: null           # simulated: 이 폴더의 이미지를 순환 (없으면 합성 프레임)
+"""
+import glob
 import os
+import threading
 import time
 import cv2
+import numpy as np
 from datetime import datetime
-from config_loader import PROJECT_ROOT
+from config_loader import PROJECT_ROOT, config
+from frame_buffer import FrameRing
 from logger import write_log
 
+_camera_cfg = (config or {}).get("camera", {}) or {}
+
+BACKEND = _camera_cfg.get("backend", "auto")
+DEVICE = _camera_cfg.get("device", 0)
+STREAM = bool(_camera_cfg.get("stream", True))
+STREAM_SIZE = tuple(_camera_cfg.get("stream_size", (1280, 720)))
+FPS = float(_camera_cfg.get("fps", 15))
+RING_SIZE = int(_camera_cfg.get("ring_size", 8))
+PICK_LAST = int(_camera_cfg.get("pick_last", 5))
+MAX_AGE = float(_camera_cfg.get("max_age", 1.0))
+SIM_DIR = _camera_cfg.get("sim_dir")
+CAPTURE_TIMEOUT = 5.0
+
 camera = None
-camera_busy = False
+stream = None
+_camera_lock = threading.Lock()     # 카메라 초기화/해제
+_capture_lock = threading.Lock()    # 촬영은 한 번에 하나씩
 
 
-def init_camera():
-    global camera
+class SimulatedCamera:
+    """
+    Picamera2 대용 (capture_array/stop만 흉내).
+    sim_dir이 있으면 그 폴더의 이미지를 size로 맞춰 순환하고, 없으면 도형 합성 프레임을 만든다.
+    프레임마다 흐림 정도를 바꿔 선명도 선택이 실제로 동작하는지 확인할 수 있다.
+    """
 
-    if camera is not None:
-        return camera
+    def __init__(self, size=STREAM_SIZE, fps=FPS, source_dir=SIM_DIR, seed=0):
+        self.size = tuple(size)
+        self.interval = 1.0 / fps if fps else 0.0
+        self.rng = np.random.default_rng(seed)
+        self.frames = self._load(source_dir) if source_dir else []
+        if not self.frames:
+            self.frames = [self._synthetic()]
+        self.index = 0
+        self._next_at = time.monotonic()
 
-    try:
-        from picamera2 import Picamera2, Preview
-        from libcamera import Transform
+    def _load(self, source_dir):
+        frames = []
+        for path in sorted(glob.glob(os.path.join(source_dir, "*"))):
+            frame = cv2.imread(path, cv2.IMREAD_COLOR)
+            if frame is not None:
+                frames.append(cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA))
+        return frames
+
+    def _synthetic(self):
+        w, h = self.size
+        frame = np.full((h, w, 3), 180, np.uint8)
+        for _ in range(30):
+            color = tuple(int(c) for c in self.rng.integers(0, 255, 3))
+            x, y = int(self.rng.integers(0, w)), int(self.rng.integers(0, h))
+            cv2.rectangle(frame, (x, y), (x + int(self.rng.integers(20, w // 4)), y + int(self.rng.integers(20, h // 4))), color, -1)
+        return frame
+
+    def capture_array(self, name="main"):
+        # 실제 카메라처럼 다음 프레임 시각까지 대기
+        now = time.monotonic()
+        if self._next_at > now:
+            time.sleep(self._next_at - now)
+        self._next_at = max(now, self._next_at) + self.interval
+
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        blur = int(self.rng.integers(0, 4)) * 2 + 1
+        return cv2.GaussianBlur(frame, (blur, blur), 0) if blur > 1 else frame.copy()
+
+    def stop(self):
+        pass
+
+
+class OpenCVCamera:
+    """
+    cv2.VideoCapture 래퍼 (capture_array/stop을 Picamera2와 같은 모양으로).
+    장치는 init 시 한 번만 열고, 촬영마다 열고 닫지 않는다.
+    """
+
+    def __init__(self, device=DEVICE, size=STREAM_SIZE, fps=FPS):
+        api = cv2.CAP_V4L2 if os.name == "posix" else cv2.CAP_ANY
+        self.cap = cv2.VideoCapture(device, api)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"카메라 장치를 열 수 없음: {device}")
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+        # 드라이버 내부 큐에 오래된 프레임이 쌓이지 않도록
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def capture_array(self, name="main"):
+        ok, frame = self.cap.read()
+        if not ok:
+            raise RuntimeError("프레임 읽기 실패")
+        return frame
+
+    def stop(self):
+        self.cap.release()
+
+
+class CameraStream:
+    """카메라에서 프레임을 계속 읽어 FrameRing에 넣는 백그라운드 스레드"""
+
+    def __init__(self, cam, ring):
+        self.cam = cam
+        self.ring = ring
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="camera-stream", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.ring.push(self.cam.capture_array())
+            except Exception as e:
+                self.errors += 1
+                if self.errors == 1 or self.errors % 100 == 0:
+                    write_log(f"[ERROR] 카메라 스트림 캡처 실패 ({self.errors}회): {e}")
+                time.sleep(0.1)
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
 
-        picam2 = Picamera2()
 
+def _open_picamera2():
+    from picamera2 import Picamera2, Preview
+    from libcamera import Transform
+
+    picam2 = Picamera2()
+
+    if STREAM:
+        # 연속 스트리밍: 저해상도 video 설정 (Vision 전송 시 어차피 max_edge로 축소됨)
+        config = picam2.create_video_configuration(
+            main={"size": STREAM_SIZE, "format": "XRGB8888"},
+            transform=Transform(rotation=180),
+            buffer_count=4,
+            controls={"FrameDurationLimits": (int(1e6 / FPS), int(1e6 / FPS))},
+        )
+    else:
         # ⭐ 안정적이면서 preview와 가장 동일하게 보이는 설정
         config = picam2.create_still_configuration(
             main={
@@ -31,45 +186,103 @@ def init_camera():
             buffer_count=4             # preview 안정성 증가
         )
 
-        picam2.configure(config)
+    picam2.configure(config)
 
-        # Preview 시작
-        # picam2.start_preview(Preview.QTGL)
-        picam2.start()
+    # Preview 시작
+    # picam2.start_preview(Preview.QTGL)
+    picam2.start()
 
-        # 자동 노출, 자동 화이트밸런스
-        picam2.set_controls({
-            "AeEnable": True,
-            "AwbEnable": True,
-            "Sharpness": 1.0,
-            "Contrast": 1.0,
-            "Saturation": 1.0,
-        })
+    # 자동 노출, 자동 화이트밸런스
+    picam2.set_controls({
+        "AeEnable": True,
+        "AwbEnable": True,
+        "Sharpness": 1.0,
+        "Contrast": 1.0,
+        "Saturation": 1.0,
+    })
+    return picam2
+
+
+def _open_auto():
+    try:
+        return _open_picamera2()
+    except ImportError:
+        return OpenCVCamera()
 
-        camera = picam2
-        print("📸 Camera initialized (safe preview-sync mode).")
-        write_log("[INFO] Camera initialized successfully (safe preview-sync mode).")
 
+BACKENDS = {
+    "picamera2": _open_picamera2,
+    "opencv": OpenCVCamera,
+    "v4l2": OpenCVCamera,
+    "auto": _open_auto,
+    "simulated": lambda: SimulatedCamera(STREAM_SIZE, FPS, SIM_DIR),
+}
+
+
+def _start_stream(cam):
+    global stream
+    # 첫 프레임으로 해상도/채널 수를 확인한 뒤 링 버퍼를 한 번만 할당
+    first = cam.capture_array()
+    ring = FrameRing(RING_SIZE, first.shape, first.dtype)
+    ring.push(first)
+    stream = CameraStream(cam, ring)
+    stream.start()
+    write_log(f"[INFO] Camera stream started ({first.shape[1]}x{first.shape[0]}, ring={RING_SIZE})")
+
+
+def init_camera():
+    global camera
+
+    if camera is not None:
         return camera
 
-    except Exception as e:
-        write_log(f"[ERROR] Picamera2 initialization failed: {e}")
-        print(f"❌ Picamera2 초기화 실패: {e}")
-        camera = None
-        return None
+    with _camera_lock:
+        if camera is not None:
+            return camera
+        try:
+            cam = BACKENDS[BACKEND]()
+            if STREAM:
+                _start_stream(cam)
+
+            camera = cam
+            mode = "stream" if STREAM else "still"
+            print(f"📸 Camera initialized ({BACKEND}, {mode} mode).")
+            write_log(f"[INFO] Camera initialized successfully ({BACKEND}, {mode} mode).")
+
+            return camera
+
+        except Exception as e:
+            write_log(f"[ERROR] Camera initialization failed ({BACKEND}): {e}")
+            print(f"❌ 카메라 초기화 실패: {e}")
+            camera = None
+            return None
 
 
+def _grab_frame():
+    """stream 모드면 링 버퍼에서 가장 선명한 최근 프레임, 아니면 새 still"""
+    if stream is None:
+        return camera.capture_array()
 
-def capture_image(filename=None):
-    global camera, camera_busy
+    frame, score = stream.ring.sharpest(PICK_LAST, MAX_AGE)
+    if frame is None:
+        # 스트림이 잠시 멈췄던 경우 새 프레임 한 장을 기다림
+        stream.ring.wait_for(stream.ring.pushed, timeout=1.0)
+        frame, score = stream.ring.sharpest(1)
+    if frame is None:
+        raise RuntimeError("스트림 프레임 없음")
+    print(f"🔎 선명도 {score:.0f} 프레임 선택")
+    return frame
 
-    if camera_busy:
-        return None
-    camera_busy = True
+
+def capture_image(filename=None, return_frame=False):
+    """사진을 media/에 저장하고 경로 반환. return_frame=True면 (경로, 프레임) 반환"""
+    if not _capture_lock.acquire(timeout=CAPTURE_TIMEOUT):
+        write_log("[ERROR] Image capture skipped: camera busy")
+        return (None, None) if return_frame else None
 
     try:
-        if camera is None:
-            camera = init_camera()
+        if camera is None and init_camera() is None:
+            raise RuntimeError("카메라 초기화 안 됨")
 
         # 저장 경로
         media_dir = os.path.join(PROJECT_ROOT, "media")
@@ -81,30 +294,32 @@ def capture_image(filename=None):
 
         output_path = os.path.join(media_dir, filename)
 
-        # ⭐ preview와 완전 동일한 pipeline에서 캡처함
-        frame = camera.capture_array()
+        frame = _grab_frame()
 
         cv2.imwrite(output_path, frame)
         print(f"📁 사진 저장됨: {output_path}")
 
-        return output_path
+        return (output_path, frame) if return_frame else output_path
 
     except Exception as e:
         write_log(f"[ERROR] Image capture failed: {e}")
         print(f"⚠️ 촬영 실패: {e}")
-        return None
+        return (None, None) if return_frame else None
 
     finally:
-        camera_busy = False
-
+        _capture_lock.release()
 
 
 def release_camera():
-    global camera
-    try:
-        if camera:
-            camera.stop()
-            camera = None
-            print("📷 Camera released.")
-    except:
-        pass
+    global camera, stream
+    with _camera_lock:
+        try:
+            if stream:
+                stream.stop()
+                stream = None
+            if camera:
+                camera.stop()
+                camera = None
+                print("📷 Camera released.")
+        except:
+            pass
@@ -0,0 +1,145 @@
+import hmac
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from config_loader import config
+from listings.models import CaptureSession, Listing
+from logger import write_log
+
+_session_cfg = (config or {}).get("capture_sessions", {}) or {}
+
+# 입고 코드 확인 후 감지(ULTRA)를 기다리는 시간(초). 지나면 연결 해제 → 코드를 다시 입력
+ARM_SECONDS = float(_session_cfg.get("arm_seconds", 300))
+
+
+class SessionStore:
+    """
+    이 보관함(LOCKER_ID)의 촬영 대기 세션.
+
+    시작 시 대기 세션을 한 번의 쿼리로 불러와 listing_id별로 캐시한다. 판매자가 키패드에
+    입력한 입고 코드(DEPOSIT:<listing_id>:<code>)가 맞으면 그 세션을 보관함에 연결(arm)하고,
+    다음 감지(ULTRA) 한 번이 연결된 세션을 가져간다. 어느 상품의 촬영인지 추측하지 않으며,
+    입고 코드 없이 들어온 감지는 어떤 세션에도 붙지 않는다.
+
+    웹에서 취소되었거나 이미 촬영된 세션이 캐시에 남아 있을 수 있으므로, 연결 직전과
+    완료(complete) 시에 DB의 상태가 PENDING인지 다시 확인한다.
+    ORM 호출은 모두 동기 함수이므로 호출 측에서 asyncio.to_thread로 감싼다.
+    """
+
+    def __init__(self, locker_id=None, arm_seconds=ARM_SECONDS):
+        self.locker_id = locker_id or settings.LOCKER_ID
+        self.arm_seconds = arm_seconds
+        self.pending = {}          # listing_id(str) → CaptureSession
+        self.armed = None
+        self.armed_at = None
+        self._lock = threading.Lock()
+
+    def _queryset(self):
+        return (
+            CaptureSession.objects
+            .filter(locker_id=self.locker_id, status=CaptureSession.Status.PENDING)
+            .order_by('created_at', 'id')
+        )
+
+    def load(self):
+        sessions = list(self._queryset())
+        with self._lock:
+            # 같은 상품의 대기 세션이 여러 개면 가장 최근 것
+            self.pending = {str(s.listing_id): s for s in sessions}
+        write_log(f"[SESSION] {self.locker_id} 대기 세션 {len(sessions)}건 로드")
+        return len(sessions)
+
+    def arm(self, listing_id, code):
+        """
+        입고 코드 확인 후 세션을 보관함에 연결.
+        "MATCH" / "NO_MATCH"(코드 불일치) / "NO_LISTING"(이 보관함의 대기 세션 없음) 반환
+        """
+        key = str(listing_id).strip()
+        if not key.isdigit():
+            return "NO_LISTING"
+        given = str(code).strip().encode()
+        with self._lock:
+            session = self.pending.get(key)
+        if session is None or not hmac.compare_digest(session.deposit_code.encode(), given):
+            # 캐시 미스/불일치 → 이 상품의 대기 세션을 DB에서 확인 (시작 후 웹에서 새로 등록된 상품 등)
+            candidates = list(self._queryset().filter(listing_id=key))
+            if not candidates:
+                return "NO_LISTING"
+            session = None
+            for candidate in candidates:
+                if hmac.compare_digest(candidate.deposit_code.encode(), given):
+                    session = candidate
+            if session is None:
+                return "NO_MATCH"
+        # 연결 직전 상태 재확인 (웹에서 취소/이미 촬영된 세션은 캐시에서도 제거)
+        elif not self._queryset().filter(pk=session.pk).exists():
+            with self._lock:
+                if self.pending.get(key) is session:
+                    del self.pending[key]
+            return "NO_LISTING"
+        with self._lock:
+            self.pending.pop(key, None)
+            if self.armed is not None and self.armed.pk != session.pk:
+                # 먼저 연결된 세션은 촬영 없이 대체됨 → 다시 대기 상태로
+                self.pending.setdefault(str(self.armed.listing_id), self.armed)
+            self.armed = session
+            self.armed_at = time.monotonic()
+        write_log(f"[SESSION] 세션 {session.pk} (Listing {session.listing_id}) 보관함 연결")
+        return "MATCH"
+
+    def take_armed(self):
+        """감지 시 연결된 세션을 꺼냄 (없거나 ARM_SECONDS가 지났으면 None)"""
+        with self._lock:
+            session, self.armed = self.armed, None
+            if session is None:
+                return None
+            if time.monotonic() - self.armed_at > self.arm_seconds:
+                self.pending.setdefault(str(session.listing_id), session)
+                write_log(f"[SESSION] 세션 {session.pk} 연결 시간 초과 → 입고 코드 재입력 필요")
+                return None
+        return session
+
+    def release(self, session):
+        """촬영 실패 등으로 처리하지 못한 세션을 대기 상태로 되돌림 (입고 코드를 다시 입력하면 재촬영)"""
+        with self._lock:
+            self.pending.setdefault(str(session.listing_id), session)
+
+    def store_capture(self, image_path):
+        """촬영 파일을 미디어 스토리지(captured/)에 올리고 저장 이름 반환"""
+        with open(image_path, 'rb') as f:
+            return default_storage.save(f"captured/{os.path.basename(image_path)}", File(f))
+
+    def complete(self, session, image_name, result_dict):
+        """
+        촬영 이미지 + 중고 최저가 + 세션 상태를 한 트랜잭션으로 반영.
+        그 사이 세션이 취소/촬영 완료되었으면 아무것도 바꾸지 않고 False
+        """
+        fields = {'capture_image': image_name}
+        used_price = result_dict.get('used_price') if isinstance(result_dict, dict) else None
+        if isinstance(used_price, list) and used_price:
+            try:
+                fields['used_low_price'] = min(int(p) for p in used_price)
+            except (TypeError, ValueError):
+                pass
+
+        with transaction.atomic():
+            updated = CaptureSession.objects.filter(
+                pk=session.pk, status=CaptureSession.Status.PENDING
+            ).update(status=CaptureSession.Status.CAPTURED, captured_at=timezone.now())
+            if not updated:
+                write_log(f"[WARN] 세션 {session.pk}이 더 이상 촬영 대기 상태가 아님 → 반영 안 함")
+                return False
+            # 썸네일은 이 프로세스에서 만들지 않음 — 웹에서 상세 화면을 열 때 또는 manage.py build_thumbnails
+            Listing.objects.filter(pk=session.listing_id).update(**fields)
+        write_log(f"[DB] Listing({session.listing_id}) 저장 완료 (세션 {session.pk})")
+        return True
+
+
+session_store = SessionStore()
@@ -0,0 +1,115 @@
+import asyncio
+import hmac
+import threading
+
+from django.db.models import Max
+
+from config_loader import config
+from logger import write_log
+from orders.models import Order
+
+_index_cfg = (config or {}).get("code_index", {}) or {}
+
+# 변경분(delta) 조회 주기(초)
+REFRESH_SECONDS = float(_index_cfg.get("refresh_seconds", 5))
+
+
+class ConfirmationCodeIndex:
+    """
+    listing_id → {order_id: 확인코드} (RELEASED 주문만) 메모리 인덱스.
+    시작 시 한 번 전체 로드(warm)하고, 이후에는 Order.updated_at 기준 변경분만 주기적으로 반영한다.
+    키패드 CHECK는 인덱스에서 일치하면 바로 응답하고, 인덱스에 없거나 일치하지 않으면
+    (아직 반영되지 않은 지급완료 등) 그 상품의 주문을 DB에서 다시 읽어 판정한다.
+    """
+
+    def __init__(self):
+        self.codes = {}
+        self.watermark = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(listing_id):
+        return str(listing_id).strip()
+
+    def _apply(self, rows):
+        """(id, listing_id, escrow_state, confirmation_code, updated_at) 행들을 인덱스에 반영"""
+        with self._lock:
+            for order_id, listing_id, state, code, updated_at in rows:
+                key = self._key(listing_id)
+                entry = self.codes.setdefault(key, {})
+                if state == Order.EscrowState.RELEASED and code:
+                    entry[order_id] = str(code).strip()
+                else:
+                    entry.pop(order_id, None)
+                if self.watermark is None or updated_at > self.watermark:
+                    self.watermark = updated_at
+
+    def _fetch(self, queryset):
+        return list(queryset.values_list("id", "listing_id", "escrow_state", "confirmation_code", "updated_at"))
+
+    def warm(self):
+        rows = self._fetch(Order.objects.filter(escrow_state=Order.EscrowState.RELEASED))
+        self._apply(rows)
+        if self.watermark is None:
+            self.watermark = Order.objects.aggregate(m=Max("updated_at"))["m"]
+        write_log(f"[CODES] 확인코드 인덱스 로드: 주문 {len(rows)}건")
+
+    def refresh(self):
+        """watermark 이후 바뀐 주문만 반영 (RELEASED 전환, 환불 등)"""
+        queryset = Order.objects.all()
+        if self.watermark is not None:
+            # 같은 시각에 저장된 행을 놓치지 않도록 경계 포함(>=) 조회 — 재반영은 멱등
+            queryset = queryset.filter(updated_at__gte=self.watermark)
+        rows = self._fetch(queryset.order_by("updated_at"))
+        self._apply(rows)
+        return len(rows)
+
+    def load_listing(self, listing_id):
+        """해당 상품의 주문을 DB에서 다시 읽어 인덱스 항목을 교체. 주문이 하나도 없으면 False"""
+        rows = self._fetch(Order.objects.filter(listing_id=listing_id))
+        entry = {
+            order_id: str(code).strip()
+            for order_id, _, state, code, _ in rows
+            if state == Order.EscrowState.RELEASED and code
+        }
+        # watermark는 건드리지 않음 — 한 상품의 최신 시각으로 올리면 refresh()가 다른 상품의 변경분을 놓침
+        with self._lock:
+            self.codes[self._key(listing_id)] = entry
+        return bool(rows)
+
+    def check(self, listing_id, code):
+        """
+        인덱스 미스/불일치 시 DB 기준 판정 (동기 — asyncio.to_thread로 호출).
+        "MATCH" / "NO_MATCH" / "NO_LISTING"(주문 없음) 반환
+        """
+        if not self.load_listing(listing_id):
+            return "NO_LISTING"
+        return "MATCH" if self.match(listing_id, code) else "NO_MATCH"
+
+    def match(self, listing_id, code):
+        """
+        인덱스 기준 판정. True: 일치, False: 불일치, None: 인덱스에 없음.
+        False/None은 인덱스가 늦었을 수 있으므로 check()로 DB를 확인한다.
+        타이밍으로 코드를 추측할 수 없도록 모든 후보를 상수 시간 비교로 끝까지 확인한다.
+        """
+        with self._lock:
+            entry = self.codes.get(self._key(listing_id))
+            candidates = list(entry.values()) if entry is not None else None
+        if candidates is None:
+            return None
+        given = str(code).strip().encode()
+        matched = False
+        for candidate in candidates:
+            matched |= hmac.compare_digest(candidate.encode(), given)
+        return matched
+
+    async def run_refresher(self, interval=REFRESH_SECONDS):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                write_log(f"[WARN] 확인코드 인덱스 갱신 실패: {e}")
+
+
+code_index = ConfirmationCodeIndex()
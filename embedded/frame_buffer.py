@@ -0,0 +1,88 @@
+"""
+카메라 스트리밍용 프레임 링 버퍼.
+
+슬롯은 시작할 때 한 번만 할당하고 (n, h, w, c) uint8 배열에 덮어쓰므로
+스트리밍 중에는 프레임마다 메모리 할당이 일어나지 않는다.
+push()는 캡처 스레드에서, sharpest()는 촬영 요청 스레드에서 호출하며 둘은 lock으로 보호한다.
+"""
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+def sharpness(frame, step=2):
+    """
+    라플라시안 분산 (값이 클수록 초점이 맞고 흔들림이 적음).
+    step 간격으로 솎아낸 그레이 이미지에서 계산해 선택 비용을 줄인다.
+    """
+    if frame.ndim == 3:
+        code = cv2.COLOR_BGR2GRAY if frame.shape[2] == 3 else cv2.COLOR_BGRA2GRAY
+        gray = cv2.cvtColor(frame[::step, ::step], code)
+    else:
+        gray = frame[::step, ::step]
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+class FrameRing:
+    """최근 capacity개 프레임을 미리 할당한 배열에 순환 저장"""
+
+    def __init__(self, capacity, shape, dtype=np.uint8):
+        self.capacity = capacity
+        self.shape = tuple(shape)
+        self.slots = np.zeros((capacity,) + self.shape, dtype=dtype)
+        self.stamps = np.zeros(capacity, dtype=np.float64)
+        self.head = 0          # 다음에 쓸 슬롯
+        self.count = 0
+        self.pushed = 0
+        self._lock = threading.Lock()
+        self._fresh = threading.Condition(self._lock)
+
+    def push(self, frame, stamp=None):
+        """프레임을 다음 슬롯에 복사. 해상도가 다르면 버림(False)"""
+        if frame.shape != self.shape:
+            return False
+        with self._lock:
+            np.copyto(self.slots[self.head], frame)
+            self.stamps[self.head] = time.monotonic() if stamp is None else stamp
+            self.head = (self.head + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+            self.pushed += 1
+            self._fresh.notify_all()
+        return True
+
+    def _recent(self, last):
+        """최근 last개 슬롯 인덱스 (최신순)"""
+        n = min(last or self.count, self.count)
+        return [(self.head - 1 - i) % self.capacity for i in range(n)]
+
+    def latest(self):
+        with self._lock:
+            if not self.count:
+                return None, None
+            index = (self.head - 1) % self.capacity
+            return self.slots[index].copy(), float(self.stamps[index])
+
+    def sharpest(self, last=None, max_age=None):
+        """
+        최근 last개 중 가장 선명한 프레임의 (복사본, 선명도) 반환.
+        max_age(초)보다 오래된 프레임은 후보에서 제외. 후보가 없으면 (None, 0.0)
+        """
+        now = time.monotonic()
+        with self._lock:
+            best, best_score = None, -1.0
+            for index in self._recent(last):
+                if max_age is not None and now - self.stamps[index] > max_age:
+                    break
+                score = sharpness(self.slots[index])
+                if score > best_score:
+                    best, best_score = index, score
+            if best is None:
+                return None, 0.0
+            return self.slots[best].copy(), best_score
+
+    def wait_for(self, pushed, timeout):
+        """push 횟수가 pushed를 넘을 때까지 대기 (스트림 시작 직후 첫 프레임 대기용)"""
+        with self._fresh:
+            return self._fresh.wait_for(lambda: self.pushed > pushed, timeout)
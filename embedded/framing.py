@@ -0,0 +1,161 @@
+"""
+Uno ↔ Pi 시리얼 프레이밍.
+
+바이너리 프레임 (v1):
+    SYNC(0xA5) | VER | TYPE | SEQ | LEN | PAYLOAD(LEN) | CRC16(BE)
+    CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) — VER~PAYLOAD 범위
+
+텍스트 프로토콜("ULTRA:1\\n", "CHECK:<id>:<code>\\n", "DEPOSIT:<id>:<code>\\n")은 fallback으로 그대로 지원한다.
+텍스트는 항상 ASCII이므로 0xA5로 시작하는 부분만 바이너리로 해석하면 두 방식이 한 스트림에서 공존할 수 있다.
+uno/main/frame_protocol.cpp와 형식이 같아야 한다.
+"""
+
+import binascii
+
+SYNC = 0xA5
+VERSION = 1
+HEADER_LEN = 5          # SYNC, VER, TYPE, SEQ, LEN
+CRC_LEN = 2
+_SYNC_BYTE = bytes((SYNC,))
+MAX_PAYLOAD = 32        # uno/main/frame_protocol.cpp FRAME_MAX_PAYLOAD와 같아야 함
+MAX_TEXT_LINE = 256     # 줄바꿈 없이 이보다 길면 버림 (쓰레기 데이터 방어)
+
+# Uno → Pi
+MSG_HELLO = 0x01
+MSG_ULTRA = 0x02
+MSG_CHECK = 0x03
+MSG_DEPOSIT = 0x04      # 판매자 입고 코드 (payload "<listing_id>:<code>")
+# Pi → Uno
+MSG_MATCH = 0x10
+MSG_NO_MATCH = 0x11
+MSG_NO_LISTING = 0x12
+MSG_ERROR = 0x13
+# 공통
+MSG_ACK = 0x7E
+MSG_NACK = 0x7F
+
+RESPONSE_TYPES = {
+    "MATCH": MSG_MATCH,
+    "NO_MATCH": MSG_NO_MATCH,
+    "NO_LISTING": MSG_NO_LISTING,
+    "ERROR": MSG_ERROR,
+}
+
+
+def crc16(data, crc=0xFFFF):
+    """CRC-16/CCITT-FALSE. binascii.crc_hqx가 같은 다항식(0x1021, 반사 없음)을 C로 계산한다."""
+    return binascii.crc_hqx(data, crc)
+
+
+def encode_frame(msg_type, payload=b"", seq=0):
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError("payload too large")
+    body = bytes((VERSION, msg_type, seq & 0xFF, len(payload))) + bytes(payload)
+    crc = crc16(body)
+    return bytes((SYNC,)) + body + bytes((crc >> 8, crc & 0xFF))
+
+
+class Frame:
+    __slots__ = ("type", "seq", "payload")
+
+    def __init__(self, msg_type, seq, payload):
+        self.type = msg_type
+        self.seq = seq
+        self.payload = payload
+
+    def to_text(self):
+        """기존 텍스트 메시지 형식으로 변환 (handle_data 분기 재사용)"""
+        if self.type == MSG_ULTRA:
+            return f"ULTRA:{self.payload[0] if self.payload else 1}"
+        if self.type == MSG_CHECK:
+            return "CHECK:" + self.payload.decode("ascii", errors="ignore")
+        if self.type == MSG_DEPOSIT:
+            return "DEPOSIT:" + self.payload.decode("ascii", errors="ignore")
+        if self.type == MSG_HELLO:
+            return "HELLO"
+        return None
+
+
+class FrameParser:
+    """
+    바이트 스트림 → (Frame | 텍스트 줄 str) 이벤트.
+    bytearray 하나에 누적하고 읽기 위치(offset)만 옮기며, 소비한 앞부분은
+    버퍼의 절반을 넘었을 때 한 번에 잘라내므로 긴 버스트에도 선형 시간에 처리된다.
+    CRC는 memoryview로 버퍼를 복사하지 않고 계산하고, 프레임 payload와 텍스트 줄만 복사해 돌려준다.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offset = 0
+        self.crc_errors = 0
+        self.dropped_bytes = 0
+
+    def feed(self, data):
+        self.buffer += data
+        events = []
+        buf = self.buffer
+        pos = self.offset
+        end = len(buf)
+        view = memoryview(buf)
+        try:
+            pos = self._scan(buf, view, pos, end, events)
+        finally:
+            # 버퍼 크기를 바꾸기 전에 memoryview를 해제해야 함 (BufferError)
+            view.release()
+
+        if pos >= end:
+            del buf[:]
+            pos = 0
+        elif pos > 4096 and pos > end // 2:
+            del buf[:pos]
+            pos = 0
+        self.offset = pos
+        return events
+
+    def _scan(self, buf, view, pos, end, events):
+        """buf[pos:end]에서 완성된 프레임/줄을 events에 추가하고 다음 읽기 위치 반환"""
+        while pos < end:
+            if buf[pos] == SYNC:
+                if end - pos < HEADER_LEN:
+                    break
+                length = buf[pos + 4]
+                if buf[pos + 1] != VERSION or length > MAX_PAYLOAD:
+                    # 헤더가 손상됨(LEN이 프로토콜 최대 초과 등) → 나머지를 기다리지 않고 바로 재동기화.
+                    # 기다리면 뒤따르는 정상 프레임/텍스트 줄까지 LEN 바이트가 찰 때까지 멈춘다
+                    self.crc_errors += 1
+                    self.dropped_bytes += 1
+                    pos += 1
+                    continue
+                total = HEADER_LEN + length + CRC_LEN
+                if end - pos < total:
+                    break
+                expected = (buf[pos + total - 2] << 8) | buf[pos + total - 1]
+                if crc16(view[pos + 1:pos + HEADER_LEN + length]) != expected:
+                    # 손상 프레임 → SYNC 1바이트만 건너뛰고 재동기화
+                    self.crc_errors += 1
+                    self.dropped_bytes += 1
+                    pos += 1
+                    continue
+                events.append(Frame(buf[pos + 2], buf[pos + 3], bytes(view[pos + HEADER_LEN:pos + HEADER_LEN + length])))
+                pos += total
+                continue
+
+            # 텍스트 구간: 다음 SYNC(없으면 끝)까지의 완성된 줄을 한 번에 분리
+            sync = buf.find(_SYNC_BYTE, pos)
+            stop = end if sync == -1 else sync
+            newline = buf.rfind(b"\n", pos, stop)
+            if newline != -1:
+                for raw in buf[pos:newline].split(b"\n"):
+                    line = raw.strip()
+                    if line:
+                        events.append(line.decode("utf-8", errors="ignore"))
+                pos = newline + 1
+            if sync == -1:
+                if end - pos > MAX_TEXT_LINE:
+                    self.dropped_bytes += end - pos
+                    pos = end
+                break
+            # 줄바꿈 없이 SYNC를 만난 조각은 버림
+            self.dropped_bytes += sync - pos
+            pos = sync
+        return pos
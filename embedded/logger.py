@@ -1,16 +1,215 @@
-import os
+"""
+임베디드 런타임 로거.
+
+write_log()는 레코드를 큐에 넣기만 하고 바로 반환한다 (이벤트 루프/시리얼 콜백에서 호출해도 블로킹 없음).
+백그라운드 writer 스레드가 batch_size개 또는 flush_interval초마다 모아서 한 번에 쓰므로
+SD 카드에 작은 쓰기가 반복되지 않는다.
+
+레코드는 JSON lines 형식:
+    {"ts": "2026-01-01T12:00:00.123", "level": "INFO", "msg": "...", ...추가 필드}
+
+레벨을 주지 않으면 기존 메시지의 "[ERROR]", "[WARN]" 같은 접두어에서 추론한다.
+파일은 max_bytes 초과 또는 날짜가 바뀌면 pi.jsonl → pi.jsonl.1 … 로 회전한다.
+(start.sh가 프로세스 stdout을 pi.log로 리다이렉트하므로 구조화 로그는 별도 파일에 쓴다.)
+
+config.yml:
+    logging:
+      dir: logs               # PROJECT_ROOT 기준
+      filename: pi.jsonl
+      level: INFO
+      batch_size: 64
+      flush_interval: 2.0
+      max_bytes: 5242880
+      backup_count: 5
+      rotate_daily: true
+      queue_size: 10000
+"""
+import atexit
 import datetime
-from config_loader import PROJECT_ROOT
+import json
+import os
+import queue
+import threading
+import time
+
+from config_loader import PROJECT_ROOT, config
+
+_cfg = (config or {}).get("logging", {}) or {}
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "ERROR": 40}
+_PREFIX_LEVELS = {
+    "[DEBUG]": "DEBUG",
+    "[WARN]": "WARN",
+    "[WARNING]": "WARN",
+    "[FAIL]": "WARN",
+    "[ERROR]": "ERROR",
+}
+
+
+def _infer_level(message):
+    if message.startswith("["):
+        return _PREFIX_LEVELS.get(message.split("]", 1)[0] + "]", "INFO")
+    return "INFO"
+
+
+class BufferedLogWriter:
+    """큐 + writer 스레드. 큐가 가득 차면 레코드를 버리고 개수만 센다 (호출자는 절대 대기하지 않음)."""
+
+    def __init__(self, path, level="INFO", batch_size=64, flush_interval=2.0,
+                 max_bytes=5 * 1024 * 1024, backup_count=5, rotate_daily=True, queue_size=10000):
+        self.path = path
+        self.min_level = LEVELS.get(str(level).upper(), 20)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.rotate_daily = rotate_daily
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._file = None
+        self._size = 0
+        self._day = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------
+    # 생산자 (아무 스레드에서나 호출)
+    # ------------------------------------------------------
+    def log(self, message, level=None, **fields):
+        message = str(message)
+        level = (level or _infer_level(message)).upper()
+        if LEVELS.get(level, 20) < self.min_level:
+            return
+        record = {
+            "ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "level": level,
+            "msg": message,
+        }
+        if fields:
+            record.update(fields)
+        self._ensure_started()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    # ------------------------------------------------------
+    # writer 스레드
+    # ------------------------------------------------------
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                batch.append(self.queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                continue
+            stop = batch[0] is None
+            deadline = time.monotonic() + self.flush_interval
+            while not stop and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                    break
+                batch.append(record)
+            records = [r for r in batch if r is not None]
+            if records:
+                self._write(records)
+            if stop:
+                return
+
+    def _write(self, records):
+        if self.dropped:
+            records.append({
+                "ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+                "level": "WARN",
+                "msg": f"[LOG] 큐 포화로 {self.dropped}건 유실",
+            })
+            self.dropped = 0
+        data = "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records)
+        try:
+            self._maybe_rotate(len(data.encode("utf-8")))
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data.encode("utf-8"))
+        except Exception as e:
+            print(f"[LOG ERROR] {e} → {self.path}")
+            self._close()
+
+    def _maybe_rotate(self, incoming):
+        today = datetime.date.today()
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._size = self._file.tell()
+            self._day = today
+        over_size = self.max_bytes and self._size and self._size + incoming > self.max_bytes
+        new_day = self.rotate_daily and self._day != today
+        if not (over_size or new_day):
+            return
+        self._close()
+        for index in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{index}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{index + 1}")
+        if self.backup_count > 0 and os.path.exists(self.path):
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = 0
+        self._day = today
+
+    def _close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            finally:
+                self._file = None
+
+    def close(self, timeout=5.0):
+        """남은 레코드를 모두 쓰고 스레드 종료 (프로세스 종료 시 atexit로 호출)"""
+        if self._thread is None:
+            return
+        self.queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+        self._close()
+
+
+def _default_path():
+    root = PROJECT_ROOT if PROJECT_ROOT and os.path.isdir(PROJECT_ROOT) else os.getcwd()
+    return os.path.join(root, _cfg.get("dir", "logs"), _cfg.get("filename", "pi.jsonl"))
+
+
+_writer = BufferedLogWriter(
+    _default_path(),
+    level=_cfg.get("level", "INFO"),
+    batch_size=int(_cfg.get("batch_size", 64)),
+    flush_interval=float(_cfg.get("flush_interval", 2.0)),
+    max_bytes=int(_cfg.get("max_bytes", 5 * 1024 * 1024)),
+    backup_count=int(_cfg.get("backup_count", 5)),
+    rotate_daily=bool(_cfg.get("rotate_daily", True)),
+    queue_size=int(_cfg.get("queue_size", 10000)),
+)
+atexit.register(_writer.close)
+
 
-def write_log(message):
-    now = datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
+def write_log(message, level=None, **fields):
+    """레코드를 큐에 넣고 바로 반환. level 생략 시 메시지 접두어에서 추론"""
+    _writer.log(message, level, **fields)
 
-    # PROJECT_ROOT가 None이거나 잘못되면 현재 경로로 대체
-    log_dir = PROJECT_ROOT if PROJECT_ROOT and os.path.isdir(PROJECT_ROOT) else os.getcwd()
-    log_path = os.path.join(log_dir, "pi.log")
 
-    try:
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(f"{now} {message}\n")
-    except Exception as e:
-        print(f"[LOG ERROR] {e} → {log_path}")
+def close_log():
+    _writer.close()
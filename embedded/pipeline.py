@@ -0,0 +1,275 @@
+import asyncio
+import itertools
+import statistics
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from config_loader import config
+from logger import write_log
+from embedded.camera_module import init_camera, capture_image
+from ai_module import analyze_image
+from capture_sessions import session_store
+
+_pipeline_cfg = (config or {}).get("pipeline", {}) or {}
+
+QUEUE_SIZE = int(_pipeline_cfg.get("queue_size", 8))
+ANALYZE_WORKERS = int(_pipeline_cfg.get("analyze_workers", 2))
+# 입구 큐가 가득 찼을 때: drop_oldest(가장 오래된 대기 작업 버림) / drop_newest(새 감지 버림)
+OVERFLOW = _pipeline_cfg.get("overflow", "drop_oldest")
+# 같은 물건이 연달아 감지되는 것을 직전 작업에 합치는 창(초). 처리 중 여부와는 무관하며,
+# 입고 코드로 세션이 연결된 감지는 새 물건이므로 합치지 않음
+DEBOUNCE_SECONDS = float(_pipeline_cfg.get("debounce_seconds", 3))
+METRICS_LOG_EVERY = int(_pipeline_cfg.get("metrics_log_every", 10))
+
+STAGES = ("wait", "capture", "upload", "analyze", "total")
+
+
+@dataclass
+class CaptureJob:
+    id: int
+    triggered_at: float
+    session: object = None
+    detections: int = 1        # 이 작업에 합쳐진 감지(ULTRA) 수
+    image_path: str = None
+    image_name: str = None
+    frame: object = None
+    marks: dict = field(default_factory=dict)
+
+
+class StageMetrics:
+    """단계별 지연시간 (최근 window개 기준 p50/p95/max)"""
+
+    def __init__(self, window=200):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def observe(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        if not self.samples:
+            return "-"
+        ordered = sorted(self.samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return f"p50={statistics.median(ordered) * 1000:.0f}ms p95={p95 * 1000:.0f}ms max={ordered[-1] * 1000:.0f}ms"
+
+
+class CapturePipeline:
+    """
+    ULTRA 감지 → 촬영 → 업로드(미디어 저장) → AI 분석/DB 반영 을 단계별 큐로 연결한 파이프라인.
+    카메라는 1개 워커가 순차로 쓰고, 분석은 여러 워커가 동시에 처리하므로
+    이전 물건을 분석하는 동안에도 다음 물건을 바로 촬영할 수 있다.
+    """
+
+    def __init__(self, queue_size=QUEUE_SIZE, analyze_workers=ANALYZE_WORKERS,
+                 overflow=OVERFLOW, debounce=DEBOUNCE_SECONDS):
+        self.queue_size = queue_size
+        self.analyze_workers = analyze_workers
+        self.overflow = overflow
+        self.debounce = debounce
+        self.ingress = None
+        self.upload_queue = None
+        self.analyze_queue = None
+        self.tasks = []
+        self.metrics = {stage: StageMetrics() for stage in STAGES}
+        self.received = 0
+        self.submitted = 0
+        self.dropped = 0
+        self.debounced = 0         # 직전 작업에 합쳐진 중복 감지
+        self.unbound = 0           # 입고 코드(DEPOSIT) 없이 들어온 감지
+        self.completed = 0
+        self.failed = 0
+        self.last_trigger = None
+        self.last_job = None
+        # 작업 종료 시 호출되는 콜백 (job, ok, total) — 시뮬레이터 벤치마크 등에서 사용
+        self.listeners = []
+        self._ids = itertools.count(1)
+
+    @property
+    def running(self):
+        return bool(self.tasks)
+
+    async def start(self):
+        if self.running:
+            return
+        self.ingress = asyncio.Queue(self.queue_size)
+        # 하위 단계 큐도 제한 → 분석이 밀리면 촬영이 자연스럽게 대기(backpressure)
+        self.upload_queue = asyncio.Queue(self.queue_size)
+        self.analyze_queue = asyncio.Queue(self.queue_size)
+        self.tasks = [
+            asyncio.create_task(self._capture_worker(), name="pipeline-capture"),
+            asyncio.create_task(self._upload_worker(), name="pipeline-upload"),
+        ] + [
+            asyncio.create_task(self._analyze_worker(), name=f"pipeline-analyze-{i}")
+            for i in range(self.analyze_workers)
+        ]
+        write_log(
+            f"[PIPE] 시작 (queue={self.queue_size}, analyze_workers={self.analyze_workers}, overflow={self.overflow})"
+        )
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def submit(self, session=None):
+        """
+        ULTRA:1 감지 등록 (이벤트 루프 스레드에서 호출). 큐에 들어가면 True.
+        session: 감지 시점에 보관함에 연결되어 있던 촬영 세션 (session_store.take_armed())
+        """
+        if not self.running:
+            write_log("[ERROR] 파이프라인이 시작되지 않아 감지를 처리할 수 없음")
+            if session is not None:
+                session_store.release(session)
+            return False
+        self.received += 1
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        recent = self.last_trigger is not None and now - self.last_trigger <= self.debounce
+        self.last_trigger = now
+        if recent and session is None and self.last_job is not None:
+            # 세션 없는 반복 감지 = 방금 감지한 물건 → 버리지 않고 직전 작업에 합쳐서 기록
+            self.last_job.detections += 1
+            self.debounced += 1
+            write_log(
+                f"[INFO] 중복 감지 → job#{self.last_job.id}에 합침 "
+                f"(감지 {self.last_job.detections}회, 누적 {self.debounced})"
+            )
+            return True
+
+        job = CaptureJob(id=next(self._ids), triggered_at=now, session=session)
+        self.last_job = job
+        if self.ingress.full():
+            self.dropped += 1
+            if self.overflow == "drop_newest":
+                write_log(f"[WARN] 작업 큐 가득 참 → 새 감지 job#{job.id} 버림 (누적 {self.dropped})")
+                self._release(job)
+                return False
+            old = self.ingress.get_nowait()
+            self.ingress.task_done()
+            self._release(old)
+            write_log(f"[WARN] 작업 큐 가득 참 → 오래된 job#{old.id} 버림 (누적 {self.dropped})")
+        self.ingress.put_nowait(job)
+        self.submitted += 1
+        write_log(f"[INFO] 물체 감지됨 → job#{job.id} 등록 (대기 {self.ingress.qsize()})")
+        return True
+
+    def _mark(self, job, stage, started):
+        loop = asyncio.get_running_loop()
+        elapsed = loop.time() - started
+        job.marks[stage] = elapsed
+        self.metrics[stage].observe(elapsed)
+
+    def _finish(self, job, ok):
+        loop = asyncio.get_running_loop()
+        total = loop.time() - job.triggered_at
+        self.metrics["total"].observe(total)
+        if ok:
+            self.completed += 1
+        else:
+            self.failed += 1
+        stages = " ".join(f"{k}={v * 1000:.0f}ms" for k, v in job.marks.items())
+        write_log(
+            f"[PIPE] job#{job.id} {'완료' if ok else '중단'} {stages} total={total * 1000:.0f}ms "
+            f"detections={job.detections}"
+        )
+        for listener in self.listeners:
+            listener(job, ok, total)
+        if (self.completed + self.failed) % METRICS_LOG_EVERY == 0:
+            self.log_metrics()
+
+    def _release(self, job):
+        """처리하지 못한 세션을 대기열 앞으로 되돌림 (다음 감지 때 다시 촬영)"""
+        if job.session is not None:
+            session_store.release(job.session)
+            job.session = None
+
+    def log_metrics(self):
+        write_log(
+            f"[PIPE] 누적 received={self.received} submitted={self.submitted} completed={self.completed} failed={self.failed} "
+            f"dropped={self.dropped} debounced={self.debounced} unbound={self.unbound}"
+        )
+        for stage, metric in self.metrics.items():
+            write_log(f"[PIPE]   {stage:<8} n={metric.count} {metric.summary()}")
+
+    async def _capture_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.ingress.get()
+            try:
+                started = loop.time()
+                self.metrics["wait"].observe(started - job.triggered_at)
+                job.marks["wait"] = started - job.triggered_at
+
+                # 입고 코드로 연결된 세션이 없으면 어느 상품의 사진인지 알 수 없으므로 촬영하지 않음
+                if job.session is None:
+                    self.unbound += 1
+                    write_log(f"[WARN] job#{job.id} 입고 코드 없이 감지됨 → 촬영/분석 스킵 (누적 {self.unbound})")
+                    self._finish(job, ok=False)
+                    continue
+
+                await asyncio.to_thread(init_camera)
+                # 파이프라인에서는 1초 안에 여러 장을 찍을 수 있으므로 job id를 파일명에 포함
+                filename = f"photo_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_{job.id}.jpg"
+                job.image_path, job.frame = await asyncio.to_thread(capture_image, filename, True)
+                self._mark(job, "capture", started)
+                if not job.image_path:
+                    write_log(f"[ERROR] job#{job.id} 촬영 실패(image_path 없음)")
+                    self._release(job)
+                    self._finish(job, ok=False)
+                    continue
+                await self.upload_queue.put(job)
+            except Exception as e:
+                write_log(f"[ERROR] job#{job.id} 촬영 단계 예외: {e}")
+                self._release(job)
+                self._finish(job, ok=False)
+            finally:
+                self.ingress.task_done()
+
+    async def _upload_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.upload_queue.get()
+            try:
+                started = loop.time()
+                job.image_name = await asyncio.to_thread(session_store.store_capture, job.image_path)
+                self._mark(job, "upload", started)
+                await self.analyze_queue.put(job)
+            except Exception as e:
+                write_log(f"[ERROR] job#{job.id} 업로드 단계 예외: {e}")
+                self._release(job)
+                self._finish(job, ok=False)
+            finally:
+                self.upload_queue.task_done()
+
+    async def _analyze_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.analyze_queue.get()
+            try:
+                started = loop.time()
+                try:
+                    result = await analyze_image(job.image_path, job.frame)
+                except Exception as e:
+                    # 분석이 실패해도 촬영 이미지는 세션 상품에 붙여 둠
+                    write_log(f"[ERROR] job#{job.id} 분석 실패 → 이미지만 저장: {e}")
+                    result = {}
+                job.frame = None   # 프레임 메모리 즉시 해제
+                # 이미지 + 최저가 + 세션 완료를 한 트랜잭션으로
+                # 그 사이 취소된 세션이면 반영하지 않음 (세션도 대기열로 되돌리지 않음)
+                saved = await asyncio.to_thread(session_store.complete, job.session, job.image_name, result)
+                self._mark(job, "analyze", started)
+                self._finish(job, ok=saved and bool(result))
+            except Exception as e:
+                write_log(f"[ERROR] job#{job.id} 분석 단계 예외: {e}")
+                # complete()가 실패하면 세션은 아직 PENDING이므로 다시 촬영 대상으로
+                self._release(job)
+                self._finish(job, ok=False)
+            finally:
+                self.analyze_queue.task_done()
+
+
+capture_pipeline = CapturePipeline()
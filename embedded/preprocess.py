@@ -0,0 +1,58 @@
+import cv2
+
+from config_loader import config
+
+_vision_cfg = (config or {}).get("vision", {}) or {}
+
+# 업로드 전 긴 변 최대 길이(px), JPEG 품질, 중앙 크롭 비율(1.0이면 크롭 안 함)
+MAX_EDGE = int(_vision_cfg.get("max_edge", 768))
+JPEG_QUALITY = int(_vision_cfg.get("jpeg_quality", 80))
+CENTER_CROP = float(_vision_cfg.get("center_crop", 1.0))
+
+
+def load_frame(image):
+    """파일 경로면 읽어서, ndarray면 그대로 반환 (BGR)"""
+    if isinstance(image, str):
+        frame = cv2.imread(image, cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError(f"이미지를 읽을 수 없음: {image}")
+        return frame
+    if image.ndim == 3 and image.shape[2] == 4:
+        # Picamera2 XRGB8888 프레임
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+    return image
+
+
+def center_crop(frame, ratio):
+    """물체가 놓이는 보관함 중앙 영역만 남김"""
+    if ratio >= 1.0:
+        return frame
+    h, w = frame.shape[:2]
+    ch, cw = max(1, int(h * ratio)), max(1, int(w * ratio))
+    top, left = (h - ch) // 2, (w - cw) // 2
+    return frame[top:top + ch, left:left + cw]
+
+
+def downscale(frame, max_edge):
+    h, w = frame.shape[:2]
+    longest = max(h, w)
+    if not max_edge or longest <= max_edge:
+        return frame
+    scale = max_edge / longest
+    return cv2.resize(frame, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+
+
+def encode_for_vision(image, max_edge=None, quality=None, crop=None):
+    """
+    Vision API 전송용 JPEG 바이트를 메모리에서 바로 생성 (디스크 왕복 없음).
+    image: 파일 경로 또는 카메라 프레임(ndarray)
+    """
+    max_edge = MAX_EDGE if max_edge is None else max_edge
+    quality = JPEG_QUALITY if quality is None else quality
+    crop = CENTER_CROP if crop is None else crop
+
+    frame = downscale(center_crop(load_frame(image), crop), max_edge)
+    ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEG 인코딩 실패")
+    return buffer.tobytes()
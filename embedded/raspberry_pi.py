@@ -10,15 +10,21 @@ if PROJECT_ROOT not in sys.path:
 
 # ===== Django 초기화 =====
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+# 썸네일 생성은 웹 프로세스에서 (카메라/분석과 CPU를 다투지 않도록)
+os.environ.setdefault("THUMBNAILS_IN_PROCESS", "0")
 django.setup()
 
 # ===== 내부 모듈 =====
 from embedded.camera_module import init_camera, release_camera
 from serial_handler import start_serial
+from pipeline import capture_pipeline
+from capture_sessions import session_store
+from code_index import code_index
 from logger import write_log
 
 
-async def main():
+async def start_runtime():
+    """카메라/세션/인덱스/파이프라인/시리얼을 순서대로 시작 (시뮬레이터 벤치마크도 이 경로를 그대로 사용)"""
     write_log("[INFO] === Raspberry Pi module started ===")
     print("🔍 Initializing camera...")
 
@@ -32,9 +38,23 @@ async def main():
         print("❌ Camera initialization failed.")
         write_log("[ERROR] Camera initialization failed.")
 
+    # ✅ 이 보관함의 촬영 대기 세션을 한 번에 불러와 메모리에 캐시
+    await asyncio.to_thread(session_store.load)
+
+    # ✅ 확인코드 인덱스 로드 + 주기적 변경분 반영
+    await asyncio.to_thread(code_index.warm)
+    asyncio.create_task(code_index.run_refresher())
+
+    # ✅ 촬영/분석 작업 큐 워커 시작
+    await capture_pipeline.start()
+
     # ✅ 시리얼 시작
     await start_serial()
 
+
+async def main():
+    await start_runtime()
+
     # 루프 유지
     while True:
         await asyncio.sleep(1)
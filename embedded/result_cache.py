@@ -0,0 +1,168 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+
+from config_loader import PROJECT_ROOT, config
+from logger import write_log
+
+
+def dhash(image, hash_size=8):
+    """
+    차이 해시(dHash). 같은 물건을 다시 찍은 사진은 조명/노이즈가 조금 달라도
+    해밍 거리가 작게 나온다. image는 파일 경로 또는 BGR/그레이 ndarray.
+    """
+    if isinstance(image, (str, os.PathLike)):
+        gray = cv2.imread(str(image), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            raise ValueError(f"이미지를 읽을 수 없음: {image}")
+    elif image.ndim == 3:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY if image.shape[2] == 3 else cv2.COLOR_BGRA2GRAY)
+    else:
+        gray = image
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int("".join("1" if b else "0" for b in bits), 2)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class AnalysisCache:
+    """
+    지각 해시 기반 AI 분석 결과 캐시.
+    - 해밍 거리 max_distance 이하면 같은 물건으로 보고 이전 결과 재사용
+    - ttl 초가 지난 항목은 무효, max_entries 초과 시 가장 오래 안 쓴 항목부터 제거(LRU)
+    - SQLite 파일에 저장해 재시작 후에도 유지
+    """
+
+    def __init__(self, path, max_distance=6, ttl=7 * 24 * 3600, max_entries=256):
+        self.path = path
+        self.max_distance = max_distance
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # hash → (result, created_at), 뒤쪽일수록 최근 사용
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS ai_cache ("
+            "hash TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.commit()
+        self._load()
+
+    def _load(self):
+        cutoff = time.time() - self.ttl
+        self._db.execute("DELETE FROM ai_cache WHERE created_at < ?", (cutoff,))
+        self._db.commit()
+        rows = self._db.execute(
+            "SELECT hash, result, created_at FROM ai_cache ORDER BY last_used ASC"
+        ).fetchall()
+        for key, result, created_at in rows:
+            self._entries[int(key, 16)] = (json.loads(result), created_at)
+        self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            key, _ = self._entries.popitem(last=False)
+            self._db.execute("DELETE FROM ai_cache WHERE hash = ?", (f"{key:016x}",))
+        self._db.commit()
+
+    def get(self, image_hash):
+        """가장 가까운 유효 항목의 결과 반환 (없으면 None)"""
+        now = time.time()
+        with self._lock:
+            best_key, best_dist = None, self.max_distance + 1
+            expired = []
+            for key, (_, created_at) in self._entries.items():
+                if now - created_at > self.ttl:
+                    expired.append(key)
+                    continue
+                dist = hamming(key, image_hash)
+                if dist < best_dist:
+                    best_key, best_dist = key, dist
+            for key in expired:
+                del self._entries[key]
+                self._db.execute("DELETE FROM ai_cache WHERE hash = ?", (f"{key:016x}",))
+
+            if best_key is None:
+                self.misses += 1
+                self._db.commit()
+                write_log(f"[CACHE] MISS hash={image_hash:016x} (hit={self.hits} miss={self.misses})")
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(best_key)
+            self._db.execute(
+                "UPDATE ai_cache SET last_used = ? WHERE hash = ?", (now, f"{best_key:016x}")
+            )
+            self._db.commit()
+            write_log(
+                f"[CACHE] HIT hash={image_hash:016x} dist={best_dist} (hit={self.hits} miss={self.misses})"
+            )
+            return self._entries[best_key][0]
+
+    def put(self, image_hash, result):
+        now = time.time()
+        with self._lock:
+            self._entries[image_hash] = (result, now)
+            self._entries.move_to_end(image_hash)
+            self._db.execute(
+                "INSERT OR REPLACE INTO ai_cache (hash, result, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (f"{image_hash:016x}", json.dumps(result, ensure_ascii=False), now, now),
+            )
+            self._evict()
+
+
+# 캐시 파일 기본 위치 (config.yml ai_cache.path로 변경 가능, .gitignore의 /data/)
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, "data", "ai_cache.sqlite3")
+
+_cache = None
+_cache_loaded = False
+_cache_lock = threading.Lock()
+
+
+def load_cache():
+    """config.yml의 ai_cache 설정으로 캐시 생성 (enabled: false면 None)"""
+    cfg = (config or {}).get("ai_cache", {}) or {}
+    if not cfg.get("enabled", True):
+        return None
+    path = cfg.get("path") or DEFAULT_CACHE_PATH
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return AnalysisCache(
+            path,
+            max_distance=int(cfg.get("max_distance", 6)),
+            ttl=float(cfg.get("ttl_seconds", 7 * 24 * 3600)),
+            max_entries=int(cfg.get("max_entries", 256)),
+        )
+    except Exception as e:
+        write_log(f"[ERROR] AI 캐시 초기화 실패: {e}")
+        return None
+
+
+def get_cache():
+    """처음 사용할 때 load_cache()로 한 번만 생성 (import만으로는 캐시 파일을 만들지 않음)"""
+    global _cache, _cache_loaded
+    if not _cache_loaded:
+        with _cache_lock:
+            if not _cache_loaded:
+                _cache = load_cache()
+                _cache_loaded = True
+    return _cache
+
+
+def set_cache(cache):
+    """사용할 캐시 지정 (None이면 캐시 사용 안 함 — 벤치마크/시뮬레이터용)"""
+    global _cache, _cache_loaded
+    with _cache_lock:
+        _cache = cache
+        _cache_loaded = True
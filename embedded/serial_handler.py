@@ -1,21 +1,32 @@
 import asyncio
 import serial_asyncio
-import time
 import os
-from orders.models import Order
-from embedded.camera_module import init_camera, capture_image
-from ai_module import analyze_image
+from embedded.camera_module import init_camera
+from config_loader import config
 from logger import write_log
-from listings.models import Listing
+from pipeline import capture_pipeline
+from code_index import code_index
+from capture_sessions import session_store
+from framing import (
+    Frame, FrameParser, encode_frame, MSG_ACK, MSG_HELLO, MSG_NACK, RESPONSE_TYPES,
+)
+
+
+_serial_cfg = (config or {}).get("serial", {}) or {}
+DEFAULT_PORT = "COM3" if os.name == "nt" else "/dev/ttyACM0"
+DEFAULT_BAUD = 9600
 
 
 class SerialProtocol(asyncio.Protocol):
     def __init__(self):
         self.transport = None
         self.connected = False
-        self.last_detection_time = 0
-        self.buffer = ""
-        self.processing = False   # ✅ AI 분석 중인지 표시
+        self.parser = FrameParser()
+        self.binary = False        # Uno가 바이너리 프레임을 보내면 응답도 프레임으로
+        self.tx_seq = 0
+        self.last_rx_seq = {}      # 메시지 종류별 마지막 seq (ACK 유실로 인한 재전송 중복 제거)
+        # DEPOSIT/ULTRA를 받은 순서대로 처리 (입고 코드 확인이 끝난 뒤 다음 감지가 세션을 가져감)
+        self.locker_lock = asyncio.Lock()
 
     def connection_made(self, transport):
         """시리얼 연결 성립 시"""
@@ -29,15 +40,15 @@ class SerialProtocol(asyncio.Protocol):
         asyncio.create_task(asyncio.to_thread(init_camera))
 
     def data_received(self, data):
-        """데이터 수신 시"""
+        """데이터 수신 시 (텍스트 줄 / 바이너리 프레임 모두 처리)"""
         try:
-            text = data.decode(errors="ignore")
-            self.buffer += text
-            while "\n" in self.buffer:
-                line, self.buffer = self.buffer.split("\n", 1)
-                message = line.strip()
-                if not message:
-                    continue
+            for event in self.parser.feed(data):
+                if isinstance(event, Frame):
+                    message = self.handle_frame(event)
+                    if message is None:
+                        continue
+                else:
+                    message = event
                 print(f"📡 수신: {message}")
                 write_log(f"[RX] {message}")
                 asyncio.create_task(self.handle_data(message))
@@ -45,6 +56,30 @@ class SerialProtocol(asyncio.Protocol):
             write_log(f"[ERROR] 수신 처리 오류: {e}")
             print(f"⚠️ 수신 처리 오류: {e}")
 
+    def handle_frame(self, frame):
+        """바이너리 프레임 ACK 후 텍스트 메시지로 변환. 처리할 필요 없으면 None"""
+        self.binary = True
+        if frame.type in (MSG_ACK, MSG_NACK):
+            return None
+        self.transport.write(encode_frame(MSG_ACK, bytes((frame.seq,)), frame.seq))
+        if frame.type == MSG_HELLO:
+            # Uno 재부팅 → seq가 처음부터 다시 시작하므로 이전 seq 기록으로 새 프레임을 버리지 않도록 초기화
+            self.last_rx_seq.clear()
+            return frame.to_text()
+        if self.last_rx_seq.get(frame.type) == frame.seq:
+            write_log(f"[RX] 중복 프레임 무시 (type=0x{frame.type:02x}, seq={frame.seq})")
+            return None
+        self.last_rx_seq[frame.type] = frame.seq
+        return frame.to_text()
+
+    def reply(self, name):
+        """검증 결과 응답 — 상대가 쓰는 프로토콜(텍스트/바이너리)에 맞춰 전송"""
+        if self.binary:
+            self.tx_seq = (self.tx_seq + 1) & 0xFF
+            self.transport.write(encode_frame(RESPONSE_TYPES[name], b"", self.tx_seq))
+        else:
+            self.transport.write(f"{name}\n".encode())
+
     async def handle_data(self, message):
         """메시지 분석 및 분기 처리"""
         try:
@@ -57,76 +92,33 @@ class SerialProtocol(asyncio.Protocol):
                 if detected != "1":
                     return
 
-                now = time.time()
-
-                # 3초 이내 또는 처리 중이면 무시
-                if now - self.last_detection_time <= 3 or self.processing:
-                    write_log("[WARN] 감지 무시됨 (중복 감지 또는 처리 중)")
-                    return
+                # 처리 중이어도 버리지 않고 작업 큐에 등록 (촬영/분석은 파이프라인 워커가 수행)
+                async with self.locker_lock:
+                    capture_pipeline.submit(session_store.take_armed())
 
-                # 감지 시간 등록 + 처리 시작
-                self.last_detection_time = now
-                self.processing = True
-                write_log("[INFO] 물체 감지됨 → 촬영 및 분석 시작")
-
-                try:
-                    # --------------------------------------
-                    # 🚨 Listing 테이블에서 최신 레코드 가져오기
-                    #     *(async context → ORM 호출은 thread로)*
-                    # --------------------------------------
-                    from listings.models import Listing
-
-                    listing = await asyncio.to_thread(
-                        lambda: Listing.objects.order_by("-id").first()
-                    )
-
-                    # --------------------------------------
-                    # 🚫 이미 이미지가 존재하면 촬영 및 분석 스킵
-                    # --------------------------------------
-                    if listing and listing.capture_image:
-                        write_log("[INFO] Listing에 이미 사진 존재 → 촬영/분석 스킵")
-                        print("⚠ Listing.capture_image 이미 존재 → 촬영하지 않음")
-                        return
-
-                    # 카메라 초기화
-                    await asyncio.to_thread(init_camera)
-
-                    # 촬영
-                    image_path = await asyncio.to_thread(capture_image)
-                    if not image_path:
-                        write_log("[ERROR] 촬영 실패(image_path 없음)")
-                        return
-
-                    # --------------------------------------
-                    # 📌 촬영된 이미지 저장: listing.capture_image
-                    # --------------------------------------
-                    if listing:
-                        def save_image():
-                            listing.capture_image = image_path
-                            listing.save()
-
-                        await asyncio.to_thread(save_image)
-
-                    # AI 분석
-                    await asyncio.to_thread(analyze_image, image_path)
-
-                    write_log("[INFO] 촬영 → 분석 완료")
-
-                except Exception as e:
-                    write_log(f"[ERROR] 촬영/분석 과정 예외: {e}")
-
-                finally:
-                    self.processing = False
-                    return
+            # -------------------------------
+            # DEPOSIT 처리 (판매자 입고 코드 → 촬영 세션 연결)
+            # -------------------------------
+            elif message.startswith("DEPOSIT:"):
+                parts = message.split(":", maxsplit=2)
+                if len(parts) >= 3:
+                    _, listing_id, code = parts
+                    async with self.locker_lock:
+                        await self.arm_session(listing_id, code)
+                else:
+                    write_log(f"[WARN] 잘못된 DEPOSIT 데이터: {message}")
 
             # -------------------------------
             # CHECK 처리
             # -------------------------------
+            elif message == "HELLO":
+                write_log("[INFO] Uno 바이너리 프로토콜 v1 연결")
+
             elif message.startswith("CHECK:"):
                 parts = message.split(":", maxsplit=2)
                 if len(parts) >= 3:
                     _, listing_id, code = parts
-                    await asyncio.to_thread(self.check_order, listing_id, code)
+                    await self.check_order(listing_id, code)
                 else:
                     write_log(f"[WARN] 잘못된 CHECK 데이터: {message}")
 
@@ -136,28 +128,33 @@ class SerialProtocol(asyncio.Protocol):
         except Exception as e:
             write_log(f"[ERROR] handle_data 예외: {e}")
 
-        finally:
-            if self.processing:
-                self.processing = False
-
-
 
+    async def arm_session(self, listing_id, code):
+        """입고 코드가 맞으면 세션을 보관함에 연결하고 문을 열도록 MATCH 응답"""
+        try:
+            result = await asyncio.to_thread(session_store.arm, listing_id, code)
+            self.reply(result)
+            write_log(f"[{'OK' if result == 'MATCH' else 'FAIL'}] {listing_id} 입고 코드 {result}")
+        except Exception as e:
+            self.reply("ERROR")
+            write_log(f"[ERROR] 입고 세션 조회 실패: {e}")
 
-    def check_order(self, listing_id, code):
-        """DB 주문 코드 검증"""
+    async def check_order(self, listing_id, code):
+        """확인코드 검증 — 메모리 인덱스에서 일치하면 바로 응답, 미스/불일치는 그 상품만 DB로 재확인"""
         try:
-            order = Order.objects.get(listing_id=listing_id)
-            if str(order.confirmation_code).strip() == code:
-                self.transport.write(b"MATCH\n")
+            if code_index.match(listing_id, code):
+                result = "MATCH"
+            else:
+                result = await asyncio.to_thread(code_index.check, listing_id, code)
+            self.reply(result)
+            if result == "MATCH":
                 write_log(f"[OK] {listing_id} 코드 일치")
+            elif result == "NO_LISTING":
+                write_log(f"[WARN] {listing_id} 주문 없음")
             else:
-                self.transport.write(b"NO_MATCH\n")
                 write_log(f"[FAIL] {listing_id} 코드 불일치")
-        except Order.DoesNotExist:
-            self.transport.write(b"NO_LISTING\n")
-            write_log(f"[WARN] {listing_id} 주문 없음")
         except Exception as e:
-            self.transport.write(b"ERROR\n")
+            self.reply("ERROR")
             write_log(f"[ERROR] DB 조회 실패: {e}")
 
     def connection_lost(self, exc):
@@ -174,8 +171,10 @@ async def reconnect_serial():
 
 async def start_serial():
     loop = asyncio.get_running_loop()
-    port = os.getenv("UNO_PORT", "/dev/ttyACM0")
-    baudrate = int(os.getenv("UNO_BAUD", "9600"))
+    # 환경변수(start.sh/.bat의 .env) > config.yml serial 섹션 > OS별 기본값
+    port = os.getenv("UNO_PORT") or _serial_cfg.get("port") or DEFAULT_PORT
+    # 기본 9600 — uno/main/lock_module.h SERIAL_BAUD와 같아야 함 (자동 협상 없음)
+    baudrate = int(os.getenv("UNO_BAUD") or _serial_cfg.get("baud", DEFAULT_BAUD))
 
     try:
         await serial_asyncio.create_serial_connection(loop, SerialProtocol, port, baudrate=baudrate)
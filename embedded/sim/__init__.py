@@ -0,0 +1,9 @@
+"""
+하드웨어 없이 보관함 파이프라인을 돌려 보기 위한 시뮬레이터.
+
+- virtual_serial: pty 쌍으로 만든 가상 Uno (ULTRA/CHECK 스크립트 재생, 응답 수집)
+- environment:   임시 DB/미디어, 시뮬레이션 카메라, Vision 스텁 서버 구성
+
+벤치마크 실행은 embedded/bench_pipeline.py 참고.
+"""
+from sim.virtual_serial import ScriptEvent, VirtualUno, bursty_script, load_script, with_deposits  # noqa: F401
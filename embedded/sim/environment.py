@@ -0,0 +1,93 @@
+"""
+시뮬레이션 실행 환경.
+
+임시 폴더에 Django DB/미디어를 만들고, Vision 스텁 서버를 띄우고, 카메라를 SimulatedCamera로 바꾼다.
+vision_client는 import 시점에 OPENAI_BASE_URL을 읽으므로 start_vision_stub()은
+raspberry_pi 등 런타임 모듈을 import하기 전에 호출해야 한다.
+"""
+import os
+
+import config_loader  # noqa: F401  (프로젝트 루트를 sys.path에 등록)
+
+
+def start_vision_stub(port=8765, latency=0.5, jitter=0.0, fail_rate=0.0):
+    """로컬 Vision 스텁 서버 시작 + vision_client가 이를 사용하도록 OPENAI_BASE_URL 설정"""
+    import vision_stub
+
+    server, state = vision_stub.serve("127.0.0.1", port, latency=latency, jitter=jitter, fail_rate=fail_rate)
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    return server, state
+
+
+def setup_django(workdir):
+    """workdir/db.sqlite3, workdir/media 를 쓰는 Django 초기화 + migrate (sim/settings.py)"""
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    if settings.configured:
+        raise RuntimeError("setup_django()는 Django 설정을 쓰는 모듈(raspberry_pi 등)보다 먼저 호출해야 함")
+    # 설정을 django.setup() 전에 정해야 프로젝트 루트 DB가 열리지 않음
+    os.environ["SIM_WORKDIR"] = os.path.abspath(workdir)
+    os.environ["DJANGO_SETTINGS_MODULE"] = "sim.settings"
+    django.setup()
+    os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+    call_command("migrate", verbosity=0)
+
+
+def use_simulated_camera(workdir, frames_dir=None):
+    """카메라 백엔드를 SimulatedCamera로 교체 (frames_dir가 있으면 그 이미지를 순환)"""
+    from embedded import camera_module
+
+    camera_module.BACKEND = "simulated"
+    camera_module.SIM_DIR = frames_dir
+    camera_module.PROJECT_ROOT = workdir   # 촬영 파일은 workdir/media 로
+
+
+def _placeholder_png():
+    from io import BytesIO
+
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", (64, 64), (180, 180, 180)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def seed(sessions, orders=0, locker_id=None):
+    """
+    촬영 대기 세션 sessions건과 확인코드가 있는 RELEASED 주문 orders건 생성.
+    (CHECK용 "<listing_id>:<확인코드>" 목록, DEPOSIT용 "<listing_id>:<입고 코드>" 목록) 반환.
+    """
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+    from listings.models import CaptureSession, Listing
+    from orders.models import Order
+
+    User = get_user_model()
+    seller, _ = User.objects.get_or_create(username="sim-seller")
+    buyer, _ = User.objects.get_or_create(username="sim-buyer")
+    locker_id = locker_id or settings.LOCKER_ID
+
+    # 썸네일 생성이 실패하지 않도록 대표 이미지 파일도 실제로 만들어 둠
+    image = "listing/sim.png"
+    if not default_storage.exists(image):
+        default_storage.save(image, ContentFile(_placeholder_png()))
+
+    listings = Listing.objects.bulk_create([
+        Listing(seller=seller, title=f"sim item {n}", description="simulator", price=10000, image=image)
+        for n in range(max(sessions, orders))
+    ])
+    captures = CaptureSession.objects.bulk_create([
+        CaptureSession(locker_id=locker_id, listing=listing) for listing in listings[:sessions]
+    ])
+    created = Order.objects.bulk_create([
+        Order(listing=listing, buyer=buyer, amount=listing.price,
+              escrow_state=Order.EscrowState.RELEASED, confirmation_code=f"{n % 10000:04d}")
+        for n, listing in enumerate(listings[:orders])
+    ])
+    checks = [f"{order.listing_id}:{order.confirmation_code}" for order in created]
+    deposits = [f"{session.listing_id}:{session.deposit_code}" for session in captures]
+    return checks, deposits
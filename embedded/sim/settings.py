@@ -0,0 +1,22 @@
+"""
+시뮬레이터용 Django 설정 (environment.setup_django가 DJANGO_SETTINGS_MODULE로 지정).
+
+core.settings를 그대로 쓰되 DB와 미디어만 SIM_WORKDIR 아래로 둔다.
+django.setup() 전에 정해지므로 프로젝트 루트의 db.sqlite3는 열리지 않는다.
+"""
+import os
+
+from core.settings import *  # noqa: F401,F403
+from core.settings import SQLITE_PRODUCTION
+
+SIM_WORKDIR = os.environ['SIM_WORKDIR']
+
+# DB_ENGINE=postgres 여도 시뮬레이션은 임시 SQLite (라즈베리파이 운영 프로필과 같은 설정)
+DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(SIM_WORKDIR, 'db.sqlite3')}}
+if os.environ.get('SQLITE_PROFILE', 'production') == 'production':
+    DATABASES['default'].update(SQLITE_PRODUCTION)
+
+MEDIA_ROOT = os.path.join(SIM_WORKDIR, 'media')
+
+# 보관함(Pi) 프로세스와 같게 썸네일은 만들지 않음 (raspberry_pi.py)
+THUMBNAILS_IN_PROCESS = False
@@ -0,0 +1,158 @@
+"""
+pty 쌍으로 만든 가상 Uno.
+
+slave 경로(/dev/pts/N)를 UNO_PORT로 넘기면 serial_handler가 실제 보드처럼 연결하고,
+VirtualUno는 master 쪽에서 스크립트의 ULTRA/CHECK 메시지를 정해진 시각에 쓰고
+Pi의 응답(MATCH/NO_MATCH/…, 바이너리 모드면 ACK 포함)을 읽어 센다.
+ULTRA는 입고 코드(DEPOSIT)로 연결된 세션이 있어야 촬영되므로 with_deposits()로 앞에 DEPOSIT을 넣는다.
+
+스크립트 파일 형식 (한 줄에 하나, '#' 주석):
+    <이전 이벤트 후 대기 초> <메시지>
+    0.0 ULTRA:1
+    0.2 CHECK:12:1234
+    0.0 DEPOSIT:12:0042
+"""
+import os
+import threading
+import time
+import tty
+from collections import Counter
+from dataclasses import dataclass
+
+from framing import (
+    FrameParser, Frame, encode_frame, MSG_ACK, MSG_CHECK, MSG_DEPOSIT, MSG_HELLO, MSG_ULTRA, RESPONSE_TYPES,
+)
+
+_RESPONSE_NAMES = {code: name for name, code in RESPONSE_TYPES.items()}
+
+
+@dataclass
+class ScriptEvent:
+    delay: float
+    message: str
+
+
+def load_script(path):
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            delay, message = line.split(None, 1)
+            events.append(ScriptEvent(float(delay), message.strip()))
+    return events
+
+
+def bursty_script(bursts=5, burst_size=4, spacing=0.1, gap=3.0, checks=None):
+    """
+    burst_size개의 ULTRA:1을 spacing초 간격으로 몰아 보내고 gap초 쉬는 것을 bursts번 반복.
+    checks: 각 버스트 뒤에 보낼 CHECK 메시지 목록 ("<listing_id>:<code>")
+    """
+    events = []
+    for index in range(bursts):
+        for n in range(burst_size):
+            events.append(ScriptEvent(gap if index and n == 0 else (0.0 if n == 0 else spacing), "ULTRA:1"))
+        for check in checks or ():
+            events.append(ScriptEvent(spacing, f"CHECK:{check}"))
+    return events
+
+
+def with_deposits(events, deposits):
+    """
+    ULTRA:1마다 바로 앞에 판매자 입고 코드(DEPOSIT:<listing_id>:<code>)를 넣음.
+    스크립트에 DEPOSIT이 이미 있으면 그대로 사용
+    """
+    if any(event.message.startswith("DEPOSIT:") for event in events):
+        return events
+    codes = iter(deposits)
+    result = []
+    for event in events:
+        code = next(codes, None) if event.message == "ULTRA:1" else None
+        if code is None:
+            result.append(event)
+            continue
+        result.append(ScriptEvent(event.delay, f"DEPOSIT:{code}"))
+        result.append(ScriptEvent(0.0, event.message))
+    return result
+
+
+def _to_frame(message, seq):
+    if message == "HELLO":
+        return encode_frame(MSG_HELLO, b"", seq)
+    if message.startswith("ULTRA:"):
+        return encode_frame(MSG_ULTRA, bytes((int(message.split(":", 1)[1]),)), seq)
+    if message.startswith("CHECK:"):
+        return encode_frame(MSG_CHECK, message.split(":", 1)[1].encode("ascii"), seq)
+    if message.startswith("DEPOSIT:"):
+        return encode_frame(MSG_DEPOSIT, message.split(":", 1)[1].encode("ascii"), seq)
+    return message.encode() + b"\n"
+
+
+class VirtualUno:
+    """가상 Uno. start() 후 port를 UNO_PORT로 사용하고, play()로 스크립트 재생"""
+
+    def __init__(self, binary=False):
+        self.binary = binary
+        self.master, slave = os.openpty()
+        # 줄 단위 처리/echo 없이 바이트 그대로 전달
+        tty.setraw(slave)
+        self.port = os.ttyname(slave)
+        self._slave = slave      # Pi가 열 때까지 pty가 닫히지 않도록 유지
+        self.sent = Counter()
+        self.sent_at = []        # (monotonic, message)
+        self.responses = Counter()
+        self.acks = 0
+        self._seq = 0
+        self._stop = threading.Event()
+        self._reader = None
+
+    def start(self):
+        self._reader = threading.Thread(target=self._read_loop, name="virtual-uno", daemon=True)
+        self._reader.start()
+        return self.port
+
+    def _read_loop(self):
+        parser = FrameParser()
+        while not self._stop.is_set():
+            try:
+                data = os.read(self.master, 1024)
+            except OSError:
+                return
+            if not data:
+                return
+            for event in parser.feed(data):
+                if isinstance(event, Frame):
+                    if event.type == MSG_ACK:
+                        self.acks += 1
+                    else:
+                        self.responses[_RESPONSE_NAMES.get(event.type, f"0x{event.type:02x}")] += 1
+                else:
+                    self.responses[event] += 1
+
+    def send(self, message):
+        if self.binary:
+            self._seq = (self._seq + 1) & 0xFF
+            data = _to_frame(message, self._seq)
+        else:
+            data = message.encode() + b"\n"
+        os.write(self.master, data)
+        self.sent[message.split(":", 1)[0]] += 1
+        self.sent_at.append((time.monotonic(), message))
+
+    def play(self, events):
+        """스크립트를 재생 (블로킹 — 별도 스레드나 asyncio.to_thread에서 호출)"""
+        if self.binary:
+            self.send("HELLO")
+        for event in events:
+            if event.delay > 0:
+                time.sleep(event.delay)
+            self.send(event.message)
+
+    def close(self):
+        self._stop.set()
+        for fd in (self.master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
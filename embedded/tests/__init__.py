@@ -0,0 +1,17 @@
+import atexit
+import shutil
+import tempfile
+
+_workdir = None
+
+
+def setup_django():
+    """Django 모델을 쓰는 테스트 모듈용: 임시 폴더의 DB로 한 번만 초기화 (sim/settings.py)"""
+    global _workdir
+    if _workdir is None:
+        from sim import environment
+
+        _workdir = tempfile.mkdtemp(prefix="embedded-test-")
+        atexit.register(shutil.rmtree, _workdir, ignore_errors=True)
+        environment.setup_django(_workdir)
+    return _workdir
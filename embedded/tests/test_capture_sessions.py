@@ -0,0 +1,86 @@
+"""
+python -m unittest discover -s embedded -t embedded
+"""
+import unittest
+
+from tests import setup_django
+
+
+def setUpModule():
+    setup_django()
+
+
+class SessionStoreTests(unittest.TestCase):
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from listings.models import CaptureSession, Listing
+
+        self.CaptureSession = CaptureSession
+        seller, _ = get_user_model().objects.get_or_create(username="session-test-seller")
+        self.listing = Listing.objects.create(
+            seller=seller, title="입고 테스트", description="-", price=1000, image="listing/test.jpg"
+        )
+        self.addCleanup(self.listing.delete)
+        self.session = CaptureSession.objects.create(locker_id="locker-test", listing=self.listing)
+        self.store = self.make_store()
+
+    def make_store(self):
+        from capture_sessions import SessionStore
+
+        store = SessionStore(locker_id="locker-test")
+        store.load()
+        return store
+
+    def test_capture_binds_only_to_deposited_listing(self):
+        other = self.CaptureSession.objects.create(locker_id="locker-test", listing=self.listing)
+        self.assertIsNone(self.store.take_armed())
+
+        self.assertEqual(self.store.arm(self.listing.pk, "x" + other.deposit_code[1:]), "NO_MATCH")
+        self.assertEqual(self.store.arm(self.listing.pk + 10000, other.deposit_code), "NO_LISTING")
+        self.assertEqual(self.store.arm(self.listing.pk, other.deposit_code), "MATCH")
+        self.assertEqual(self.store.take_armed().pk, other.pk)
+        # 감지 한 번만 세션을 가져감
+        self.assertIsNone(self.store.take_armed())
+
+    def test_session_cancelled_on_web_is_not_armed(self):
+        self.CaptureSession.objects.filter(pk=self.session.pk).update(status=self.CaptureSession.Status.CANCELLED)
+        self.assertEqual(self.store.arm(self.listing.pk, self.session.deposit_code), "NO_LISTING")
+        self.assertIsNone(self.store.take_armed())
+
+    def test_expired_arm_is_dropped(self):
+        self.store.arm_seconds = 0
+        self.assertEqual(self.store.arm(self.listing.pk, self.session.deposit_code), "MATCH")
+        self.assertIsNone(self.store.take_armed())
+        # 대기 상태로 돌아가 다시 입력하면 연결됨
+        self.store.arm_seconds = 60
+        self.assertEqual(self.store.arm(self.listing.pk, self.session.deposit_code), "MATCH")
+        self.assertEqual(self.store.take_armed().pk, self.session.pk)
+
+    def test_complete_skips_cancelled_session(self):
+        from listings.models import Listing
+
+        self.assertEqual(self.store.arm(self.listing.pk, self.session.deposit_code), "MATCH")
+        session = self.store.take_armed()
+        self.CaptureSession.objects.filter(pk=session.pk).update(status=self.CaptureSession.Status.CANCELLED)
+
+        self.assertFalse(self.store.complete(session, "captured/photo.jpg", {"used_price": [1000]}))
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.status, self.CaptureSession.Status.CANCELLED)
+        self.assertFalse(Listing.objects.get(pk=self.listing.pk).capture_image)
+
+    def test_complete_marks_session_captured(self):
+        from listings.models import Listing
+
+        self.assertEqual(self.store.arm(self.listing.pk, self.session.deposit_code), "MATCH")
+        session = self.store.take_armed()
+        self.assertTrue(self.store.complete(session, "captured/photo.jpg", {"used_price": [3000, 2000]}))
+        self.assertFalse(self.store.complete(session, "captured/photo2.jpg", {}))
+
+        listing = Listing.objects.get(pk=self.listing.pk)
+        self.assertEqual((listing.capture_image.name, listing.used_low_price), ("captured/photo.jpg", 2000))
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.status, self.CaptureSession.Status.CAPTURED)
+
+
+if __name__ == "__main__":
+    unittest.main()
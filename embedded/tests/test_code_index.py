@@ -0,0 +1,94 @@
+"""
+python -m unittest discover -s embedded -t embedded
+"""
+import unittest
+
+from tests import setup_django
+
+
+def setUpModule():
+    setup_django()
+
+
+class ConfirmationCodeIndexTests(unittest.TestCase):
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from listings.models import Listing
+        from orders.models import Order
+
+        self.Order = Order
+        User = get_user_model()
+        seller, _ = User.objects.get_or_create(username="code-test-seller")
+        self.buyer, _ = User.objects.get_or_create(username="code-test-buyer")
+        self.listing = Listing.objects.create(
+            seller=seller, title="코드 테스트", description="-", price=1000, image="listing/test.jpg"
+        )
+        self.order = Order.objects.create(listing=self.listing, buyer=self.buyer, amount=1000)
+        self.addCleanup(self.listing.delete)
+        self.addCleanup(Order.objects.filter(listing=self.listing).delete)
+        self.index = self.make_index()
+
+    def make_index(self):
+        from code_index import ConfirmationCodeIndex
+
+        index = ConfirmationCodeIndex()
+        index.warm()
+        return index
+
+    def release(self, order, code):
+        order.escrow_state = self.Order.EscrowState.RELEASED
+        order.confirmation_code = code
+        order.save()
+
+    def test_hit_answers_from_memory(self):
+        self.release(self.order, "1234")
+        index = self.make_index()
+        self.assertIs(index.match(self.listing.pk, "1234"), True)
+        self.assertIs(index.match(self.listing.pk, "9999"), False)
+
+    def test_miss_falls_back_to_db(self):
+        self.assertIsNone(self.index.match(self.listing.pk + 10000, "1234"))
+        self.assertEqual(self.index.check(self.listing.pk + 10000, "1234"), "NO_LISTING")
+        self.assertEqual(self.index.check(self.listing.pk, "1234"), "NO_MATCH")
+
+    def test_stale_entry_is_rechecked_after_release(self):
+        # 지급완료 전에 조회되어 빈 항목이 캐시된 상태
+        self.assertEqual(self.index.check(self.listing.pk, "1234"), "NO_MATCH")
+        self.release(self.order, "1234")
+        self.assertIs(self.index.match(self.listing.pk, "1234"), False)
+        self.assertEqual(self.index.check(self.listing.pk, "1234"), "MATCH")
+        self.assertIs(self.index.match(self.listing.pk, "1234"), True)
+
+    def test_refresh_applies_changes_after_watermark(self):
+        self.index.load_listing(self.listing.pk)
+        self.release(self.order, "4321")
+        self.index.refresh()
+        self.assertIs(self.index.match(self.listing.pk, "4321"), True)
+
+        self.order.escrow_state = self.Order.EscrowState.REFUNDED
+        self.order.save()
+        self.index.refresh()
+        self.assertIs(self.index.match(self.listing.pk, "4321"), False)
+        self.assertEqual(self.index.check(self.listing.pk, "4321"), "NO_MATCH")
+
+    def test_load_listing_does_not_skip_other_changes(self):
+        from listings.models import Listing
+
+        other = Listing.objects.create(
+            seller=self.listing.seller, title="다른 상품", description="-", price=1000, image="listing/test.jpg"
+        )
+        self.addCleanup(other.delete)
+        other_order = self.Order.objects.create(listing=other, buyer=self.buyer, amount=1000)
+        self.addCleanup(other_order.delete)
+        self.index.refresh()
+
+        self.release(other_order, "5555")
+        self.release(self.order, "1234")
+        # 나중에 바뀐 상품만 먼저 DB로 읽어도 refresh는 그 이전 변경분을 반영해야 함
+        self.assertEqual(self.index.check(self.listing.pk, "1234"), "MATCH")
+        self.index.refresh()
+        self.assertIs(self.index.match(other.pk, "5555"), True)
+
+
+if __name__ == "__main__":
+    unittest.main()
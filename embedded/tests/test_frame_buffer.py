@@ -0,0 +1,82 @@
+"""
+python -m unittest discover -s embedded -t embedded
+"""
+import unittest
+
+import cv2
+import numpy as np
+
+from frame_buffer import FrameRing, sharpness
+
+SHAPE = (48, 64, 3)
+
+
+def sharp_frame(seed=0):
+    """고주파(체커보드 + 노이즈)가 많은 프레임"""
+    rng = np.random.default_rng(seed)
+    board = (np.indices(SHAPE[:2]).sum(axis=0) // 4 % 2 * 255).astype(np.uint8)
+    noise = rng.integers(0, 40, SHAPE[:2], dtype=np.uint8)
+    return np.dstack([np.maximum(board, noise)] * 3)
+
+
+def blurred(frame, ksize=15):
+    return cv2.GaussianBlur(frame, (ksize, ksize), 0)
+
+
+class FrameRingTests(unittest.TestCase):
+    def test_sharpness_prefers_focused_frame(self):
+        frame = sharp_frame()
+        self.assertGreater(sharpness(frame), sharpness(blurred(frame)))
+        self.assertEqual(sharpness(np.zeros(SHAPE, np.uint8)), 0.0)
+
+    def test_sharpest_picks_focused_frame_among_blurred(self):
+        ring = FrameRing(4, SHAPE)
+        focused = sharp_frame()
+        for frame in (blurred(focused), focused, blurred(focused, 9), blurred(focused, 21)):
+            ring.push(frame)
+        best, score = ring.sharpest()
+        np.testing.assert_array_equal(best, focused)
+        self.assertEqual(score, sharpness(focused))
+
+    def test_last_limits_candidates_to_recent_frames(self):
+        ring = FrameRing(4, SHAPE)
+        focused = sharp_frame()
+        ring.push(focused)
+        ring.push(blurred(focused, 9))
+        ring.push(blurred(focused, 21))
+        best, _ = ring.sharpest(last=2)
+        np.testing.assert_array_equal(best, blurred(focused, 9))
+
+    def test_max_age_skips_stale_frames(self):
+        ring = FrameRing(4, SHAPE)
+        focused = sharp_frame()
+        ring.push(focused, stamp=0.0)           # 아주 오래된 프레임
+        self.assertEqual(ring.sharpest(max_age=1.0), (None, 0.0))
+        ring.push(blurred(focused))
+        best, _ = ring.sharpest(max_age=1.0)
+        np.testing.assert_array_equal(best, blurred(focused))
+
+    def test_ring_overwrites_oldest_and_returns_copies(self):
+        ring = FrameRing(2, SHAPE)
+        focused = sharp_frame()
+        ring.push(focused)
+        ring.push(blurred(focused, 9))
+        ring.push(blurred(focused, 21))         # focused 슬롯을 덮어씀
+        self.assertEqual((ring.count, ring.pushed), (2, 3))
+        best, _ = ring.sharpest()
+        np.testing.assert_array_equal(best, blurred(focused, 9))
+
+        best[:] = 0
+        latest, _ = ring.latest()
+        np.testing.assert_array_equal(latest, blurred(focused, 21))
+        self.assertGreater(ring.sharpest()[1], 0.0)
+
+    def test_frame_with_other_shape_is_rejected(self):
+        ring = FrameRing(2, SHAPE)
+        self.assertFalse(ring.push(np.zeros((10, 10, 3), np.uint8)))
+        self.assertEqual(ring.sharpest(), (None, 0.0))
+        self.assertEqual(ring.latest(), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+python -m unittest discover -s embedded -t embedded
+"""
+import unittest
+
+from framing import (
+    MAX_PAYLOAD, MSG_CHECK, MSG_ULTRA, SYNC, VERSION, FrameParser, encode_frame,
+)
+
+
+class FrameParserTests(unittest.TestCase):
+    def test_corrupted_length_does_not_stall_following_frames(self):
+        corrupted = bytes((SYNC, VERSION, MSG_ULTRA, 1, 200)) + b"\x01"
+        check = encode_frame(MSG_CHECK, b"12:3456", seq=2)
+        parser = FrameParser()
+
+        events = parser.feed(corrupted + check + b"ULTRA:1\n")
+
+        frames = [e for e in events if not isinstance(e, str)]
+        self.assertEqual([(f.type, f.seq, f.payload) for f in frames], [(MSG_CHECK, 2, b"12:3456")])
+        self.assertIn("ULTRA:1", events)
+        self.assertGreaterEqual(parser.crc_errors, 1)
+
+    def test_max_payload_frame_is_accepted(self):
+        payload = b"x" * MAX_PAYLOAD
+        events = FrameParser().feed(encode_frame(MSG_CHECK, payload, seq=7))
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].payload, payload)
+
+    def test_oversized_payload_is_rejected_by_encoder(self):
+        with self.assertRaises(ValueError):
+            encode_frame(MSG_CHECK, b"x" * (MAX_PAYLOAD + 1))
+
+    def test_split_frame_across_reads(self):
+        frame = encode_frame(MSG_ULTRA, b"\x01", seq=3)
+        parser = FrameParser()
+        self.assertEqual(parser.feed(frame[:4]), [])
+        events = parser.feed(frame[4:])
+        self.assertEqual([(e.type, e.seq) for e in events], [(MSG_ULTRA, 3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+python -m unittest discover -s embedded -t embedded
+"""
+import datetime
+import json
+import os
+import tempfile
+import unittest
+
+from logger import BufferedLogWriter
+
+
+class BufferedLogWriterTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "logs", "pi.jsonl")
+
+    def make_writer(self, **options):
+        options.setdefault("flush_interval", 0.05)
+        writer = BufferedLogWriter(self.path, **options)
+        self.addCleanup(writer.close)
+        return writer
+
+    def read(self, path=None):
+        with open(path or self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_records_are_written_as_json_lines_on_close(self):
+        writer = self.make_writer(level="INFO")
+        writer.log("[DEBUG] 보이지 않음")
+        writer.log("[WARN] 큐 지연", job=3)
+        writer.log("[ERROR] 실패")
+        writer.log("평범한 메시지")
+        writer.close()
+
+        records = self.read()
+        self.assertEqual([r["level"] for r in records], ["WARN", "ERROR", "INFO"])
+        self.assertEqual(records[0]["job"], 3)
+        self.assertEqual(records[2]["msg"], "평범한 메시지")
+
+    def test_full_queue_drops_and_reports_count(self):
+        writer = self.make_writer(queue_size=2)
+        # writer 스레드를 시작하지 않은 상태로 큐만 채움
+        writer._ensure_started = lambda: None
+        for i in range(5):
+            writer.log(f"msg {i}")
+        self.assertEqual(writer.dropped, 3)
+
+        del writer._ensure_started
+        writer.log("after")
+        writer.close()
+        messages = [r["msg"] for r in self.read()]
+        self.assertIn("[LOG] 큐 포화로 3건 유실", messages)
+        self.assertEqual(messages[:2], ["msg 0", "msg 1"])
+
+    def test_rotates_by_size_and_keeps_backup_count(self):
+        writer = self.make_writer(max_bytes=200, backup_count=2, rotate_daily=False)
+        for i in range(4):
+            writer._write([{"msg": "x" * 150, "n": i}])
+        writer.close()
+
+        self.assertEqual([r["n"] for r in self.read()], [3])
+        self.assertEqual([r["n"] for r in self.read(self.path + ".1")], [2])
+        self.assertEqual([r["n"] for r in self.read(self.path + ".2")], [1])
+        self.assertFalse(os.path.exists(self.path + ".3"))
+
+    def test_rotates_when_day_changes(self):
+        writer = self.make_writer(rotate_daily=True)
+        writer._write([{"msg": "어제"}])
+        writer._day = datetime.date.today() - datetime.timedelta(days=1)
+        writer._write([{"msg": "오늘"}])
+        writer.close()
+
+        self.assertEqual([r["msg"] for r in self.read()], ["오늘"])
+        self.assertEqual([r["msg"] for r in self.read(self.path + ".1")], ["어제"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+python -m unittest discover -s embedded -t embedded
+"""
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from tests import setup_django
+
+
+def setUpModule():
+    # pipeline → capture_sessions가 Django 모델을 import하므로 임시 DB로 먼저 초기화
+    setup_django()
+
+
+class FakeSessionStore:
+    def __init__(self, fail_on):
+        self.fail_on = fail_on
+        self.session = SimpleNamespace(id=1, pk=1, listing_id=1)
+        self.released = []
+        self.completed = []
+
+    def release(self, session):
+        self.released.append(session)
+
+    def store_capture(self, image_path):
+        if self.fail_on == "store_capture":
+            raise OSError("disk full")
+        return "captured/photo.jpg"
+
+    def complete(self, session, image_name, result):
+        if self.fail_on == "complete":
+            raise RuntimeError("database is locked")
+        self.completed.append(session)
+        return True
+
+
+class PipelineReleaseTests(unittest.TestCase):
+    def run_job(self, store):
+        import pipeline
+
+        async def scenario():
+            p = pipeline.CapturePipeline(debounce=0)
+            finished = asyncio.Event()
+            p.listeners.append(lambda job, ok, total: finished.set())
+            await p.start()
+            try:
+                p.submit(store.session)
+                await asyncio.wait_for(finished.wait(), 5)
+            finally:
+                await p.stop()
+            return p
+
+        with mock.patch.object(pipeline, "session_store", store), \
+                mock.patch.object(pipeline, "init_camera", lambda: None), \
+                mock.patch.object(pipeline, "capture_image", lambda name, frame: ("/tmp/photo.jpg", None)), \
+                mock.patch.object(pipeline, "analyze_image", mock.AsyncMock(return_value={"used_price": [1000]})):
+            return asyncio.run(scenario())
+
+    def test_session_released_when_upload_fails(self):
+        store = FakeSessionStore(fail_on="store_capture")
+        p = self.run_job(store)
+        self.assertEqual(store.released, [store.session])
+        self.assertEqual(p.failed, 1)
+
+    def test_session_released_when_complete_fails(self):
+        store = FakeSessionStore(fail_on="complete")
+        p = self.run_job(store)
+        self.assertEqual(store.released, [store.session])
+        self.assertEqual(p.failed, 1)
+
+    def test_completed_session_is_not_released(self):
+        store = FakeSessionStore(fail_on=None)
+        p = self.run_job(store)
+        self.assertEqual(store.released, [])
+        self.assertEqual(store.completed, [store.session])
+        self.assertEqual(p.completed, 1)
+
+    def test_detection_without_deposit_is_not_captured(self):
+        store = FakeSessionStore(fail_on=None)
+        store.session = None
+        p = self.run_job(store)
+        self.assertEqual((p.unbound, p.failed, store.completed), (1, 1, []))
+
+
+class PipelineDebounceTests(unittest.TestCase):
+    def test_burst_is_coalesced_without_losing_detections(self):
+        import pipeline
+
+        store = FakeSessionStore(fail_on=None)
+        first = SimpleNamespace(id=1, pk=1, listing_id=1)
+        second = SimpleNamespace(id=2, pk=2, listing_id=2)
+        finished = []
+
+        async def scenario():
+            p = pipeline.CapturePipeline(debounce=3)
+            p.listeners.append(lambda job, ok, total: finished.append(job))
+            await p.start()
+            try:
+                # 입고 → 같은 물건 반복 감지 2회 → 다음 입고 → 반복 감지 1회 (모두 3초 안)
+                results = [p.submit(session) for session in (first, None, None, second, None)]
+                for _ in range(100):
+                    if len(finished) == 2:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                await p.stop()
+            return p, results
+
+        with mock.patch.object(pipeline, "session_store", store), \
+                mock.patch.object(pipeline, "init_camera", lambda: None), \
+                mock.patch.object(pipeline, "capture_image", lambda name, frame: ("/tmp/photo.jpg", None)), \
+                mock.patch.object(pipeline, "analyze_image", mock.AsyncMock(return_value={"used_price": [1000]})):
+            p, results = asyncio.run(scenario())
+
+        self.assertEqual(results, [True] * 5)
+        self.assertEqual(store.completed, [first, second])
+        self.assertEqual(store.released, [])
+        self.assertEqual([job.detections for job in finished], [3, 2])
+        self.assertEqual(sum(job.detections for job in finished), p.received)
+        self.assertEqual((p.submitted, p.debounced, p.dropped), (2, 3, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+"""
+python -m unittest discover -s embedded -t embedded
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import result_cache
+
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(result_cache.set_cache, None)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "data", "ai_cache.sqlite3")
+
+    def test_cache_file_is_created_on_first_use(self):
+        with mock.patch.object(result_cache, "DEFAULT_CACHE_PATH", self.path), \
+                mock.patch.object(result_cache, "_cache", None), \
+                mock.patch.object(result_cache, "_cache_loaded", False):
+            self.assertFalse(os.path.exists(self.path))
+            cache = result_cache.get_cache()
+            self.assertIs(result_cache.get_cache(), cache)
+            self.assertTrue(os.path.exists(self.path))
+
+            cache.put(0b1011, {"name": "키보드"})
+            self.assertEqual(cache.get(0b1010), {"name": "키보드"})
+            cache._db.close()
+
+    def test_disabled_cache_creates_no_file(self):
+        with mock.patch.object(result_cache, "DEFAULT_CACHE_PATH", self.path):
+            result_cache.set_cache(None)
+            self.assertIsNone(result_cache.get_cache())
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+python -m unittest discover -s embedded -t embedded
+"""
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from tests import setup_django
+
+
+def setUpModule():
+    setup_django()
+
+
+class FakeTransport:
+    def __init__(self):
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+
+class DepositOrderingTests(unittest.TestCase):
+    def test_each_detection_takes_the_session_deposited_before_it(self):
+        import serial_handler
+        from capture_sessions import SessionStore
+
+        store = SessionStore(locker_id="locker-test")
+
+        def arm(listing_id, code):
+            # 첫 번째 입고 코드 확인이 더 오래 걸려도 순서가 바뀌지 않아야 함
+            time.sleep(0.05 if listing_id == "1" else 0)
+            store.armed, store.armed_at = f"session-{listing_id}", time.monotonic()
+            return "MATCH"
+
+        submitted = []
+
+        async def scenario():
+            protocol = serial_handler.SerialProtocol()
+            protocol.transport = FakeTransport()
+            protocol.data_received(b"DEPOSIT:1:0000\nULTRA:1\nDEPOSIT:2:0000\nULTRA:1\n")
+            for _ in range(50):
+                if len(submitted) == 2:
+                    break
+                await asyncio.sleep(0.01)
+            return protocol
+
+        with mock.patch.object(serial_handler, "session_store", store), \
+                mock.patch.object(store, "arm", arm), \
+                mock.patch.object(serial_handler.capture_pipeline, "submit", submitted.append):
+            protocol = asyncio.run(scenario())
+
+        self.assertEqual(submitted, ["session-1", "session-2"])
+        self.assertEqual(protocol.transport.written, [b"MATCH\n", b"MATCH\n"])
+
+
+class FrameDedupTests(unittest.TestCase):
+    def test_hello_resets_duplicate_detection(self):
+        import serial_handler
+        from framing import MSG_HELLO, MSG_ULTRA, encode_frame
+
+        protocol = serial_handler.SerialProtocol()
+        protocol.transport = FakeTransport()
+        received = []
+        ultra = encode_frame(MSG_ULTRA, b"\x01", 1)
+
+        async def scenario():
+            with mock.patch.object(protocol, "handle_data", mock.AsyncMock(side_effect=received.append)):
+                protocol.data_received(ultra)
+                protocol.data_received(ultra)      # ACK 유실로 인한 재전송 → 무시
+                # Uno 재부팅: HELLO 후 seq가 다시 1부터
+                protocol.data_received(encode_frame(MSG_HELLO, b"", 1) + ultra)
+                await asyncio.sleep(0)
+
+        asyncio.run(scenario())
+        self.assertEqual(received, ["ULTRA:1", "HELLO", "ULTRA:1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
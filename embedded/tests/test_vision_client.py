@@ -0,0 +1,111 @@
+"""
+python -m unittest discover -s embedded -t embedded
+"""
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import httpx
+from openai import AsyncOpenAI, BadRequestError, InternalServerError, RateLimitError
+
+import vision_client
+
+COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [{
+        "index": 0,
+        "finish_reason": "stop",
+        "message": {"role": "assistant", "content": "{'brand':'Samsung','product':'Galaxy S21','used_price':[15,18]}"},
+    }],
+}
+
+
+class VisionClientRetryTests(unittest.TestCase):
+    def run_analyze(self, statuses, deadline=5.0, backoff=0.01, latency=0.0):
+        """statuses 순서대로 응답하는 가짜 전송 계층으로 analyze() 실행 → (결과 또는 예외, 요청 수)"""
+        requests = []
+
+        async def handler(request):
+            requests.append(request)
+            await asyncio.sleep(latency)
+            status = statuses[min(len(requests), len(statuses)) - 1]
+            if status == 200:
+                return httpx.Response(200, json=COMPLETION)
+            return httpx.Response(status, json={"error": {"message": "fail", "type": "test"}})
+
+        async def scenario():
+            client = AsyncOpenAI(
+                api_key="test", base_url="http://vision.test/v1", max_retries=0,
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            )
+            try:
+                with mock.patch.object(vision_client, "get_client", lambda: client):
+                    return await vision_client.analyze(b"\xff\xd8jpeg")
+            except Exception as e:
+                return e
+            finally:
+                await client.close()
+
+        with mock.patch.object(vision_client, "BACKOFF_BASE", backoff), \
+                mock.patch.object(vision_client, "BACKOFF_MAX", backoff * 5), \
+                mock.patch.object(vision_client, "MAX_RETRIES", 3), \
+                mock.patch.object(vision_client, "DEADLINE", deadline), \
+                mock.patch.object(vision_client, "REQUEST_TIMEOUT", 0.1), \
+                mock.patch.object(vision_client, "write_log", lambda message: None):
+            return asyncio.run(scenario()), len(requests)
+
+    def test_retries_rate_limit_and_server_errors(self):
+        result, calls = self.run_analyze([429, 500, 200])
+        self.assertEqual(result["product"], "Galaxy S21")
+        self.assertEqual(calls, 3)
+
+    def test_gives_up_after_max_retries(self):
+        result, calls = self.run_analyze([503])
+        self.assertIsInstance(result, InternalServerError)
+        self.assertEqual(calls, 4)
+
+    def test_gives_up_at_deadline(self):
+        # 다음 백오프가 데드라인을 넘으면 재시도 횟수가 남아도 중단
+        with mock.patch.object(vision_client.random, "uniform", lambda a, b: 1.0):
+            result, calls = self.run_analyze([429], deadline=1.0, backoff=2.0)
+        self.assertIsInstance(result, RateLimitError)
+        self.assertEqual(calls, 1)
+
+    def test_slow_attempts_stop_at_deadline(self):
+        result, calls = self.run_analyze([200], deadline=0.3, latency=1.0)
+        self.assertIsInstance(result, asyncio.TimeoutError)
+        # 시도당 0.1초 제한 → 데드라인(0.3초) 안에서 몇 번만 시도
+        self.assertTrue(1 <= calls <= 3, calls)
+
+    def test_client_errors_are_not_retried(self):
+        result, calls = self.run_analyze([400, 200])
+        self.assertIsInstance(result, BadRequestError)
+        self.assertEqual(calls, 1)
+
+    def test_request_carries_image(self):
+        seen = []
+
+        def handler(request):
+            seen.append(json.loads(request.content))
+            return httpx.Response(200, json=COMPLETION)
+
+        async def scenario():
+            client = AsyncOpenAI(
+                api_key="test", base_url="http://vision.test/v1", max_retries=0,
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            )
+            with mock.patch.object(vision_client, "get_client", lambda: client):
+                await vision_client.analyze(b"\xff\xd8jpeg")
+            await client.close()
+
+        asyncio.run(scenario())
+        image = seen[0]["messages"][1]["content"][1]["image_url"]["url"]
+        self.assertTrue(image.startswith("data:image/jpeg;base64,"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import asyncio
+import base64
+import json
+import os
+import random
+
+import httpx
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    RateLimitError,
+)
+
+from config_loader import config
+from logger import write_log
+
+_openai_cfg = (config or {}).get("openai", {}) or {}
+
+API_KEY = _openai_cfg.get("api_key") or os.getenv("OPENAI_API_KEY", "")
+MODEL = _openai_cfg.get("model", "gpt-4o-mini")
+# 로컬 스텁 서버(vision_stub.py) 등으로 바꿔 끼울 수 있는 엔드포인트
+BASE_URL = os.getenv("OPENAI_BASE_URL") or _openai_cfg.get("base_url") or None
+
+REQUEST_TIMEOUT = float(_openai_cfg.get("timeout", 20))        # 시도 1회당 제한(초)
+DEADLINE = float(_openai_cfg.get("deadline", 45))              # 재시도 포함 전체 제한(초)
+MAX_RETRIES = int(_openai_cfg.get("max_retries", 3))
+BACKOFF_BASE = float(_openai_cfg.get("backoff_base", 0.5))
+BACKOFF_MAX = float(_openai_cfg.get("backoff_max", 8))
+MAX_CONNECTIONS = int(_openai_cfg.get("max_connections", 4))
+
+RETRYABLE = (APITimeoutError, APIConnectionError, RateLimitError, InternalServerError, asyncio.TimeoutError)
+
+SYSTEM_PROMPT = (
+    "너는 제품 브랜드·모델·중고 시세를 분석하는 전문가이다. "
+    "중고가는 반드시 '당근마켓 기준 중고 거래가'로 판단한다. "
+    "중고가는 문자열이 아니라 정수 배열 형태로 출력해야 한다."
+)
+USER_PROMPT = (
+    "이 사진 속 제품의 브랜드, 모델명, confidence(0~100)를 판별하고 "
+    "당근마켓 기준 중고가를 배열 형태로 제공해줘.\n"
+    "예: {'brand':'Samsung','product':'Galaxy S21','confidence':90,'used_price':[15,18]}\n"
+    "반드시 JSON 딕셔너리 형식만 출력해."
+)
+
+_client = None
+_client_loop = None
+
+
+def get_client():
+    """
+    이벤트 루프당 하나의 AsyncOpenAI 클라이언트(=HTTP 커넥션 풀)를 재사용.
+    SDK 자체 재시도는 끄고 아래 analyze()에서 데드라인 안에서만 재시도한다.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=5.0),
+        )
+        _client = AsyncOpenAI(
+            api_key=API_KEY or "stub",
+            base_url=BASE_URL,
+            http_client=http_client,
+            max_retries=0,
+            timeout=REQUEST_TIMEOUT,
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client():
+    global _client, _client_loop
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _client_loop = None
+
+
+def parse_result(result_text):
+    try:
+        return json.loads(result_text.replace("'", '"'))
+    except (ValueError, AttributeError):
+        return {"raw": result_text}
+
+
+async def analyze(jpeg_bytes):
+    """
+    JPEG 바이트를 Vision 모델로 분석 → 결과 dict.
+    시도별 REQUEST_TIMEOUT, 전체 DEADLINE, 지수 백오프(+지터) 재시도 MAX_RETRIES회.
+    """
+    image_base64 = base64.b64encode(jpeg_bytes).decode("utf-8")
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": USER_PROMPT},
+                {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image_base64}"}},
+            ],
+        },
+    ]
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + DEADLINE
+    attempt = 0
+    while True:
+        remaining = deadline - loop.time()
+        try:
+            response = await asyncio.wait_for(
+                get_client().chat.completions.create(model=MODEL, messages=messages),
+                timeout=min(REQUEST_TIMEOUT, max(remaining, 0.01)),
+            )
+            return parse_result(response.choices[0].message.content)
+        except RETRYABLE as e:
+            attempt += 1
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (attempt - 1))) * random.uniform(0.5, 1.0)
+            if attempt > MAX_RETRIES or loop.time() + delay >= deadline:
+                write_log(f"[ERROR] Vision 요청 실패 ({attempt}회 시도): {type(e).__name__}: {e}")
+                raise
+            write_log(f"[WARN] Vision 요청 재시도 {attempt}/{MAX_RETRIES} ({delay:.1f}s 후): {type(e).__name__}")
+            await asyncio.sleep(delay)
@@ -0,0 +1,111 @@
+"""
+OpenAI Chat Completions 호환 로컬 스텁 서버 (오프라인 테스트/벤치마크용).
+
+    python embedded/vision_stub.py --port 8765 --latency 0.8 --jitter 0.2 --fail-rate 0.1
+
+config.yml의 openai.base_url 또는 환경변수 OPENAI_BASE_URL을
+http://127.0.0.1:8765/v1 로 지정하면 vision_client가 이 서버를 사용한다.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_RESULT = {"brand": "Samsung", "product": "Galaxy S21", "confidence": 90, "used_price": [150000, 180000]}
+
+
+class StubState:
+    def __init__(self, latency=0.5, jitter=0.0, fail_rate=0.0, result=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.result = result or DEFAULT_RESULT
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive → 클라이언트 커넥션 풀 재사용 확인 가능
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _reply(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            with state.lock:
+                state.requests += 1
+                n = state.requests
+
+            time.sleep(max(0.0, state.latency + random.uniform(-state.jitter, state.jitter)))
+
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._reply(404, {"error": {"message": "not found"}})
+                return
+            if random.random() < state.fail_rate:
+                self._reply(503, {"error": {"message": "stub overloaded", "type": "server_error"}})
+                return
+
+            self._reply(200, {
+                "id": f"chatcmpl-stub-{n}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "stub",
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": json.dumps(state.result, ensure_ascii=False)},
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+
+    return Handler
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 클라이언트 타임아웃으로 끊긴 연결은 정상 시나리오이므로 무시
+        pass
+
+
+def serve(host="127.0.0.1", port=8765, **kwargs):
+    """스텁 서버를 백그라운드 스레드로 실행하고 (server, state) 반환"""
+    state = StubState(**kwargs)
+    server = StubServer((host, port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    args = parser.parse_args()
+
+    server, _ = serve(args.host, args.port, latency=args.latency, jitter=args.jitter, fail_rate=args.fail_rate)
+    print(f"🧪 Vision stub listening on http://{args.host}:{args.port}/v1")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
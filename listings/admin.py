@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import CaptureSession
+
+
+@admin.register(CaptureSession)
+class CaptureSessionAdmin(admin.ModelAdmin):
+    list_display = ("id", "locker_id", "listing", "order", "status", "created_at", "captured_at")
+    list_filter = ("locker_id", "status")
+    search_fields = ("listing__title",)
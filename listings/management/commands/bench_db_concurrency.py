@@ -0,0 +1,181 @@
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+PROFILES = ('default', 'production')
+
+
+def _setup(profile, path):
+    """자식 프로세스에서 프로필/DB 파일을 지정하고 Django 초기화 (연결은 아직 열지 않음)"""
+    os.environ['SQLITE_PROFILE'] = profile
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    import django
+    from django.conf import settings
+    django.setup()
+    settings.DATABASES['default']['NAME'] = path
+
+
+def _prepare(profile, path, rooms, sessions):
+    _setup(profile, path)
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from chat.models import ChatRoom
+    from listings.models import CaptureSession, Listing
+
+    call_command('migrate', verbosity=0)
+    User = get_user_model()
+    seller = User.objects.create(username='__bench_seller__')
+    buyer = User.objects.create(username='__bench_buyer__')
+    listings = Listing.objects.bulk_create([
+        Listing(seller=seller, title=f'bench {i}', description='bench', price=1000, image='listing/bench.jpg')
+        for i in range(rooms)
+    ])
+    ChatRoom.objects.bulk_create([ChatRoom(listing=l, buyer=buyer, seller=seller) for l in listings])
+    CaptureSession.objects.bulk_create([
+        CaptureSession(locker_id='bench', listing=listings[i % rooms]) for i in range(sessions)
+    ])
+
+
+def _web_worker(profile, path, seconds, seed, results):
+    """웹 워커 역할: 요청 하나 = 피드/채팅 조회 또는 메시지/주문 저장, 요청이 끝나면 연결 정리"""
+    _setup(profile, path)
+    from django.db import close_old_connections, transaction
+    from chat.models import ChatRoom, Message
+    from chat.views import fetch_message_page
+    from listings.models import Listing
+    from orders.models import Order
+
+    rnd = random.Random(seed)
+    room_ids = list(ChatRoom.objects.values_list('id', flat=True))
+    stats = {'read': [], 'write': [], 'errors': 0}
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            room = ChatRoom.objects.get(pk=rnd.choice(room_ids)) if rnd.random() < 0.5 else None
+            if room is None:
+                list(Listing.objects.order_by('-created_at', '-id')[:20])
+                kind = 'read'
+            elif rnd.random() < 0.5:
+                fetch_message_page(room)
+                kind = 'read'
+            elif rnd.random() < 0.9:
+                with transaction.atomic():
+                    message = Message.objects.create(room=room, sender_id=room.buyer_id, content='bench')
+                    room.record_message(message)
+                kind = 'write'
+            else:
+                Order.objects.create(listing_id=room.listing_id, buyer_id=room.buyer_id, amount=1000)
+                kind = 'write'
+            stats[kind].append(time.perf_counter() - start)
+        except Exception as exc:
+            if 'locked' not in str(exc):
+                raise
+            stats['errors'] += 1
+        # request_finished 시그널과 같은 처리 (CONN_MAX_AGE=0 이면 여기서 연결을 닫음).
+        # 한 스레드가 요청을 계속 처리하는 WSGI 워커 모델 — ASGI(Daphne)에서는 요청마다 스레드가 달라
+        # CONN_MAX_AGE를 올려도 이 재사용 효과가 나지 않음 (settings.SQLITE_PRODUCTION 참고)
+        close_old_connections()
+    results.put(stats)
+
+
+def _pi_worker(profile, path, seconds, seed, results):
+    """라즈베리파이 역할: 촬영 세션 완료(상품+세션 UPDATE 한 트랜잭션) + 확인코드 변경분 조회"""
+    _setup(profile, path)
+    from django.db import transaction
+    from django.utils import timezone
+    from listings.models import CaptureSession, Listing
+    from orders.models import Order
+
+    rnd = random.Random(seed)
+    sessions = list(CaptureSession.objects.values_list('id', 'listing_id'))
+    stats = {'read': [], 'write': [], 'errors': 0}
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if rnd.random() < 0.5:
+                list(Order.objects.filter(updated_at__gte=timezone.now() - timedelta(seconds=5))
+                     .values_list('id', 'listing_id', 'escrow_state', 'confirmation_code', 'updated_at'))
+                stats['read'].append(time.perf_counter() - start)
+            else:
+                session_id, listing_id = rnd.choice(sessions)
+                with transaction.atomic():
+                    Listing.objects.filter(pk=listing_id).update(used_low_price=rnd.randint(1, 100) * 1000)
+                    CaptureSession.objects.filter(pk=session_id).update(captured_at=timezone.now())
+                stats['write'].append(time.perf_counter() - start)
+        except Exception as exc:
+            if 'locked' not in str(exc):
+                raise
+            stats['errors'] += 1
+    results.put(stats)
+
+
+class Command(BaseCommand):
+    help = (
+        '웹 워커 + 라즈베리파이 프로세스가 같은 SQLite 파일에 동시에 읽고/쓸 때 처리량 비교 '
+        '(Django 기본 설정 vs settings.SQLITE_PRODUCTION). 임시 DB 파일을 사용함'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--web', type=int, default=4, help='웹 워커 프로세스 수')
+        parser.add_argument('--pi', type=int, default=1, help='라즈베리파이 프로세스 수')
+        parser.add_argument('--seconds', type=float, default=10.0)
+        parser.add_argument('--rooms', type=int, default=200)
+
+    def handle(self, *args, **opts):
+        # 자식 프로세스(spawn)가 manage.py와 같은 경로에서 앱을 import할 수 있도록
+        os.environ['PYTHONPATH'] = os.pathsep.join(filter(None, [os.getcwd(), *sys.path]))
+        ctx = multiprocessing.get_context('spawn')
+        self.stdout.write(f"web={opts['web']} pi={opts['pi']} seconds={opts['seconds']}")
+        self.stdout.write(
+            f"{'profile':<12}{'role':<6}{'reads/s':>10}{'writes/s':>10}{'locked':>8}{'write p50':>11}{'write p99':>11}"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            for profile in PROFILES:
+                path = os.path.join(tmp, f'{profile}.sqlite3')
+                prep = ctx.Process(target=_prepare, args=(profile, path, opts['rooms'], opts['rooms']))
+                prep.start()
+                prep.join()
+                self._run(ctx, profile, path, opts)
+
+    def _run(self, ctx, profile, path, opts):
+        results = {'web': ctx.Queue(), 'pi': ctx.Queue()}
+        procs = [
+            ctx.Process(target=_web_worker, args=(profile, path, opts['seconds'], i, results['web']))
+            for i in range(opts['web'])
+        ] + [
+            ctx.Process(target=_pi_worker, args=(profile, path, opts['seconds'], 1000 + i, results['pi']))
+            for i in range(opts['pi'])
+        ]
+        for proc in procs:
+            proc.start()
+        for role, count in (('web', opts['web']), ('pi', opts['pi'])):
+            merged = {'read': [], 'write': [], 'errors': 0}
+            for _ in range(count):
+                stats = results[role].get()
+                merged['read'] += stats['read']
+                merged['write'] += stats['write']
+                merged['errors'] += stats['errors']
+            self._row(profile, role, merged, opts['seconds'])
+        for proc in procs:
+            proc.join()
+
+    def _row(self, profile, role, stats, seconds):
+        writes = sorted(stats['write'])
+        if writes:
+            p50 = f'{statistics.median(writes) * 1000:.1f}ms'
+            p99 = f'{writes[min(len(writes) - 1, int(len(writes) * 0.99))] * 1000:.1f}ms'
+        else:
+            p50 = p99 = '-'
+        self.stdout.write(
+            f"{profile:<12}{role:<6}{len(stats['read']) / seconds:>10,.0f}{len(writes) / seconds:>10,.0f}"
+            f"{stats['errors']:>8}{p50:>11}{p99:>11}"
+        )
@@ -0,0 +1,86 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from listings.models import Listing
+from listings.search import fts_available, search_listings
+
+BRANDS = ['삼성', '애플', 'LG', '소니', '닌텐도', '다이슨', '샤오미', '로지텍']
+PRODUCTS = ['갤럭시 S21', '아이폰 13', '그램 노트북', '플레이스테이션 5', '스위치 OLED',
+            '에어팟 프로', '청소기 V15', '미밴드 7', '무선 마우스', '기계식 키보드']
+CONDITIONS = ['상태 좋음', '생활기스 있음', '미개봉 새상품', '박스 없음', '배터리 교체함']
+QUERIES = ['갤럭시', '아이폰 13', '청소기', '키보드 미개봉', '플레이스테이션']
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = '상품 검색 지연시간 비교 (기존 title__icontains vs FTS5 또는 pg_trgm). 데이터는 트랜잭션 롤백으로 정리됨'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **opts):
+        try:
+            with transaction.atomic():
+                self._seed(opts['rows'])
+                self._run(opts['repeat'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _seed(self, rows):
+        User = get_user_model()
+        seller, _ = User.objects.get_or_create(username='__bench_seller__')
+        rnd = random.Random(42)
+        batch = []
+        for i in range(rows):
+            brand, product = rnd.choice(BRANDS), rnd.choice(PRODUCTS)
+            batch.append(Listing(
+                seller=seller,
+                title=f'{brand} {product} 판매합니다 #{i}',
+                description=f'{rnd.choice(CONDITIONS)}. {product} 직거래/택배 가능. ' * 3,
+                price=rnd.randint(1, 200) * 1000,
+                image='listing/bench.jpg',
+            ))
+            if len(batch) == 2000:
+                Listing.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Listing.objects.bulk_create(batch)
+        self.stdout.write(f'seeded {rows} listings')
+
+    def _time(self, fn, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples), max(samples)
+
+    def _run(self, repeat):
+        base = Listing.objects.order_by('-created_at')
+        self.stdout.write(f"{'query':<16}{'path':<10}{'hits':>7}{'page p50':>10}{'page max':>10}{'count p50':>11}")
+        for q in QUERIES:
+            index_path = 'fts5' if fts_available() else 'trigram'
+            paths = {
+                'icontains': lambda: base.filter(title__icontains=q),
+                index_path: lambda: search_listings(base, q),
+            }
+            for name, make in paths.items():
+                hits = make().count()
+                # 색인 검색이 0건이면 (예: FTS 트리거 누락) 빈 결과를 측정하게 되므로 측정 전에 중단
+                if name == index_path and not hits:
+                    raise CommandError(f'{name} 검색 결과가 0건입니다 (q={q!r}). 검색 색인을 확인하세요.')
+                page_p50, page_max = self._time(lambda: list(make()[:12]), repeat)
+                count_p50, _ = self._time(lambda: make().count(), repeat)
+                self.stdout.write(
+                    f'{q:<16}{name:<10}{hits:>7}{page_p50:>8.2f}ms{page_max:>8.2f}ms{count_p50:>9.2f}ms'
+                )
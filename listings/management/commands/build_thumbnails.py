@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from listings.models import Listing
+from listings.thumbnails import THUMBNAIL_FIELDS, build_thumbnails, needs_thumbnails
+
+
+class Command(BaseCommand):
+    help = (
+        '썸네일이 없거나 원본이 바뀐 Listing 이미지의 썸네일을 일괄 생성 '
+        '(보관함 촬영 이미지 등 웹 프로세스 밖에서 바뀐 이미지는 이 명령을 주기적으로 실행)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='이미 있는 썸네일도 다시 생성')
+
+    def handle(self, *args, **opts):
+        done = 0
+        for listing in Listing.objects.only('id', 'image', 'capture_image', 'thumbnails').iterator():
+            if opts['force'] or any(needs_thumbnails(listing, field) for field in THUMBNAIL_FIELDS):
+                build_thumbnails(listing.id, force=opts['force'])
+                done += 1
+        self.stdout.write(f'{done} listings processed')
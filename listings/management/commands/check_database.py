@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from core.replica import REPLICA
+from listings.models import Listing
+from listings.search import FTS_TRIGGERS, fts_available, search_listings, trigram_available
+
+TRGM_INDEXES = ('listing_title_trgm_idx', 'listing_description_trgm_idx')
+
+# 조회가 복제본으로 가야 하는 화면 (GET)
+REPLICA_PAGES = [
+    ('listing list', '/listings/?q=갤럭시'),
+    ('listing api', '/api/listings/api/?q=갤럭시'),
+]
+# 방금 쓴 내용이 보여야 해서(read-after-write) 복제본으로 가면 안 되는 화면
+PRIMARY_PAGES = [
+    ('profile', '/accounts/me/'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'DB 설정 점검: 연결/벤더, SQLite면 FTS5 동기화 트리거, PostgreSQL이면 pg_trgm 인덱스와 검색 실행 계획, '
+        '복제본이 있으면 목록/피드 조회는 replica로, 프로필은 default로 가는지 확인 (예: 임시 Postgres 컨테이너 대상)'
+    )
+
+    def handle(self, *args, **opts):
+        failures = []
+        for alias in settings.DATABASES:
+            conn = connections[alias]
+            conn.ensure_connection()
+            self.stdout.write(f'{alias:<8} {conn.vendor} {conn.settings_dict["NAME"]}')
+
+        if fts_available():
+            failures += self._check_fts()
+        if trigram_available():
+            failures += self._check_trigram()
+        if REPLICA in settings.DATABASES:
+            failures += self._check_routing()
+        else:
+            self.stdout.write('replica 없음 — 라우팅 검사 생략')
+
+        if failures:
+            raise CommandError('\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('OK'))
+
+    def _check_fts(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            found = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in FTS_TRIGGERS if name not in found]
+        if missing:
+            # 없으면 새로 등록/수정한 상품이 검색되지 않음
+            return [f'FTS 트리거 없음: {", ".join(missing)} (0008_restore_listing_fts_triggers 참고)']
+        self.stdout.write('FTS5 트리거 OK')
+        return []
+
+    def _check_trigram(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            if cursor.fetchone() is None:
+                return ['pg_trgm 확장이 설치되지 않음 (migrate 필요)']
+            cursor.execute('SELECT indexname FROM pg_indexes WHERE indexname = ANY(%s)', [list(TRGM_INDEXES)])
+            found = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in TRGM_INDEXES if name not in found]
+        if missing:
+            return [f'trigram 인덱스 없음: {", ".join(missing)}']
+
+        queryset = search_listings(Listing.objects.order_by('-created_at'), '갤럭시 S21')
+        plan = queryset.explain()
+        uses_index = any(name in plan for name in TRGM_INDEXES)
+        # 행이 적으면 플래너가 순차 스캔을 고를 수 있으므로 실패로 보지 않고 표시만 함
+        self.stdout.write(f'pg_trgm OK, 검색 실행 계획 trigram 인덱스 사용: {uses_index}')
+        return []
+
+    def _check_routing(self):
+        failures = []
+        User = get_user_model()
+        user = User.objects.create(username='__db_check__')
+        try:
+            client = Client()
+            client.force_login(user)
+            for name, url in REPLICA_PAGES:
+                with CaptureQueriesContext(connections['default']) as primary, \
+                        CaptureQueriesContext(connections[REPLICA]) as replica:
+                    response = client.get(url)
+                listing_reads = [
+                    q for q in primary.captured_queries
+                    if 'listings_listing' in q['sql'] and q['sql'].lstrip().upper().startswith('SELECT')
+                ]
+                self.stdout.write(
+                    f'{name:<14} status={response.status_code} '
+                    f'default={len(primary.captured_queries)} replica={len(replica.captured_queries)}'
+                )
+                if response.status_code != 200:
+                    failures.append(f'{name}: HTTP {response.status_code} ({url})')
+                if not replica.captured_queries or listing_reads:
+                    failures.append(f'{name}: 상품 조회가 replica로 가지 않음')
+            for name, url in PRIMARY_PAGES:
+                with CaptureQueriesContext(connections[REPLICA]) as replica:
+                    response = client.get(url)
+                self.stdout.write(f'{name:<14} status={response.status_code} replica={len(replica.captured_queries)}')
+                if response.status_code != 200:
+                    failures.append(f'{name}: HTTP {response.status_code} ({url})')
+                if replica.captured_queries:
+                    failures.append(f'{name}: 조회가 replica로 감 (방금 쓴 내용이 안 보일 수 있음)')
+        finally:
+            user.delete()
+        return failures
@@ -0,0 +1,72 @@
+from django.db import migrations
+
+FTS_TABLE = 'listings_listing_fts'
+
+CREATE_TABLE_SQL = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description,
+        content='listings_listing', content_rowid='id',
+        tokenize='trigram'
+    )
+"""
+
+# listings_listing 변경을 FTS 테이블에 반영하는 트리거.
+# SQLite에서 listings_listing을 다시 만드는 마이그레이션(AddField/AlterField 등 _remake_table)은
+# 이 트리거를 함께 지우므로, 그런 마이그레이션 뒤에는 restore_fts()를 다시 실행해야 한다 (0008 참고)
+TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS listings_listing_fts_ai AFTER INSERT ON listings_listing BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS listings_listing_fts_ad AFTER DELETE ON listings_listing BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS listings_listing_fts_au AFTER UPDATE OF title, description ON listings_listing BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+CREATE_SQL = [CREATE_TABLE_SQL, *TRIGGER_SQL, REBUILD_SQL]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS listings_listing_fts_ai",
+    "DROP TRIGGER IF EXISTS listings_listing_fts_ad",
+    "DROP TRIGGER IF EXISTS listings_listing_fts_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _run(statements):
+    def apply(apps, schema_editor):
+        # FTS5는 SQLite 전용 — 다른 DB에서는 icontains 검색으로 대체됨
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return apply
+
+
+def restore_fts(apps, schema_editor):
+    """트리거를 다시 만들고 FTS 색인을 listings_listing 기준으로 재구성 (테이블 재생성 이후용)"""
+    _run(CREATE_SQL)(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0002_listing_capture_image_listing_used_low_price'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(CREATE_SQL), _run(DROP_SQL)),
+    ]
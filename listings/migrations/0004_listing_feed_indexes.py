@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0003_listing_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['created_at', 'id'], name='listing_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', 'created_at'], name='listing_status_created_idx'),
+        ),
+    ]
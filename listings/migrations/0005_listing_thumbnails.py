@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0004_listing_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='thumbnails',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
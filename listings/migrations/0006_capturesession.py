@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0005_listing_thumbnails'),
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaptureSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('locker_id', models.CharField(max_length=32)),
+                ('status', models.CharField(choices=[('PENDING', '촬영대기'), ('CAPTURED', '촬영완료'), ('CANCELLED', '취소')], default='PENDING', max_length=16)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('captured_at', models.DateTimeField(blank=True, null=True)),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='capture_sessions', to='listings.listing')),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='capture_sessions', to='orders.order')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['locker_id', 'status', 'created_at'], name='capture_locker_status_idx')],
+            },
+        ),
+    ]
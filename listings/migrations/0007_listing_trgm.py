@@ -0,0 +1,33 @@
+from django.db import migrations
+
+CREATE_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS listing_title_trgm_idx ON listings_listing USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS listing_description_trgm_idx ON listings_listing USING gin (description gin_trgm_ops)",
+]
+
+DROP_SQL = [
+    "DROP INDEX IF EXISTS listing_title_trgm_idx",
+    "DROP INDEX IF EXISTS listing_description_trgm_idx",
+]
+
+
+def _run(statements):
+    def apply(apps, schema_editor):
+        # pg_trgm은 PostgreSQL 전용 — SQLite는 0003의 FTS5 테이블을 사용
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0006_capturesession'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(CREATE_SQL), _run(DROP_SQL)),
+    ]
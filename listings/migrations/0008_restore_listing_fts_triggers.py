@@ -0,0 +1,17 @@
+from importlib import import_module
+
+from django.db import migrations
+
+# 0005(thumbnails AddField)가 SQLite에서 listings_listing을 다시 만들면서 FTS 트리거를 지웠음
+fts = import_module('listings.migrations.0003_listing_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0007_listing_trgm'),
+    ]
+
+    operations = [
+        migrations.RunPython(fts.restore_fts, migrations.RunPython.noop),
+    ]
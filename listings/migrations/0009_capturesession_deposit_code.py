@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+import listings.models
+
+
+def assign_codes(apps, schema_editor):
+    # AddField의 기본값은 기존 행 모두에 같은 값이 들어가므로 세션마다 새로 발급
+    CaptureSession = apps.get_model('listings', 'CaptureSession')
+    for session in CaptureSession.objects.only('id'):
+        CaptureSession.objects.filter(pk=session.pk).update(deposit_code=listings.models.generate_deposit_code())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0008_restore_listing_fts_triggers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='capturesession',
+            name='deposit_code',
+            field=models.CharField(default=listings.models.generate_deposit_code, max_length=4),
+        ),
+        migrations.RunPython(assign_codes, migrations.RunPython.noop),
+    ]
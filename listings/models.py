@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import secrets
 
 from django.db import models
 from django.contrib.auth import get_user_model
@@ -25,4 +26,50 @@ class Listing(models.Model):
     # ⭐ 당근마켓 기준 중고 최저가 (AI used_price 배열의 최저값)
     used_low_price = models.PositiveIntegerField(null=True, blank=True)
 
+    # 축소 이미지 경로 {필드: {"src": 원본 경로, "sizes": {폭: {포맷: 경로}}}} — listings.thumbnails 참고
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # 피드 키셋 페이지네이션 (created_at, id) / 상태별 필터링
+            models.Index(fields=['created_at', 'id'], name='listing_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='listing_status_created_idx'),
+        ]
+
+
+def generate_deposit_code():
+    """판매자가 보관함 키패드에 입력하는 4자리 입고 코드"""
+    return f"{secrets.randbelow(10000):04d}"
+
+
+class CaptureSession(models.Model):
+    """
+    보관함(locker) 촬영 세션 — 어떤 보관함에서 찍힌 사진이 어느 상품/주문의 것인지 명시.
+    판매자가 키패드에 "D → 상품 ID → 입고 코드"를 입력하면 그 세션이 보관함에 연결되고,
+    문이 닫힌 뒤의 감지(ULTRA) 한 번이 이 세션의 촬영이 된다 (embedded/capture_sessions.py).
+    """
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', '촬영대기'
+        CAPTURED = 'CAPTURED', '촬영완료'
+        CANCELLED = 'CANCELLED', '취소'
+
+    locker_id = models.CharField(max_length=32)
+    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name='capture_sessions')
+    order = models.ForeignKey(
+        'orders.Order', on_delete=models.SET_NULL, null=True, blank=True, related_name='capture_sessions'
+    )
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    deposit_code = models.CharField(max_length=4, default=generate_deposit_code)
+    created_at = models.DateTimeField(auto_now_add=True)
+    captured_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # 라즈베리파이 시작 시 "내 보관함의 대기 세션" 한 번에 조회
+            models.Index(fields=['locker_id', 'status', 'created_at'], name='capture_locker_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.locker_id} → Listing({self.listing_id}) [{self.status}]"
@@ -0,0 +1,71 @@
+from django.db.models import Q
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from core.pagination import encode_cursor, decode_cursor
+
+PAGE_SIZE = 12
+
+
+def paginate_feed(queryset, params, page_size=PAGE_SIZE):
+    """
+    상품 피드 페이지 조회 (COUNT 없이 page_size+1개만 읽어 다음 페이지 여부 판단).
+    - 일반 피드: (created_at, id) 키셋 커서 → ?cursor=
+    - 검색 결과(bm25 순위 정렬): 순위에는 키셋을 걸 수 없으므로 ?offset=
+    반환값: (items, 다음 페이지 쿼리 파라미터 dict 또는 None)
+    """
+    if 'search_rank' in queryset.query.extra_select:
+        try:
+            offset = max(int(params.get('offset', 0)), 0)
+        except (TypeError, ValueError):
+            offset = 0
+        items = list(queryset[offset:offset + page_size + 1])
+        if len(items) > page_size:
+            return items[:page_size], {'offset': offset + page_size}
+        return items, None
+
+    queryset = queryset.order_by('-created_at', '-id')
+    cursor = decode_cursor(params.get('cursor'))
+    if cursor is not None:
+        created_at, pk = cursor
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    items = list(queryset[:page_size + 1])
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        return items, {'cursor': encode_cursor(last.created_at, last.id)}
+    return items, None
+
+
+class ListingFeedPagination(BasePagination):
+    """ListingViewSet용 불투명 커서 페이지네이션 (전체 COUNT 쿼리 없음)"""
+    page_size = PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        items, self.next_params = paginate_feed(queryset, request.query_params, self.page_size)
+        return items
+
+    def get_next_link(self):
+        if not self.next_params:
+            return None
+        url = self.request.build_absolute_uri()
+        for key in ('cursor', 'offset'):
+            url = remove_query_param(url, key)
+        for key, value in self.next_params.items():
+            url = replace_query_param(url, key, value)
+        return url
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,91 @@
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'listings_listing_fts'
+# 0003_listing_fts가 만드는 동기화 트리거 (테이블을 다시 만드는 마이그레이션 후에도 있어야 함)
+FTS_TRIGGERS = (f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au')
+
+# trigram 토크나이저는 3글자 미만 토큰을 색인하지 못하므로 그보다 짧은 검색어는 LIKE로 처리
+MIN_NGRAM = 3
+
+# bm25 가중치 (title, description) — 제목 일치를 더 높게 평가
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def fts_available():
+    """현재 DB 연결이 FTS5 검색 테이블을 쓸 수 있는지 여부"""
+    return connection.vendor == 'sqlite'
+
+
+def trigram_available():
+    """PostgreSQL: pg_trgm GIN 인덱스(0007_listing_trgm)로 ILIKE 부분 일치 검색"""
+    return connection.vendor == 'postgresql'
+
+
+def _like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def _search_trigram(queryset, long_terms):
+    """
+    검색어마다 title/description ILIKE (pg_trgm 인덱스 사용).
+    순위는 word_similarity 가중합의 음수 — FTS5 bm25처럼 작을수록 관련도 높음.
+    """
+    where = []
+    params = []
+    for term in long_terms:
+        where.append('(listings_listing.title ILIKE %s OR listings_listing.description ILIKE %s)')
+        params += [_like_pattern(term)] * 2
+    query = ' '.join(long_terms)
+    return queryset.extra(
+        where=where,
+        params=params,
+        select={
+            'search_rank': (
+                f'-(word_similarity(%s, listings_listing.title) * {TITLE_WEIGHT}'
+                f' + word_similarity(%s, listings_listing.description) * {DESCRIPTION_WEIGHT})'
+            ),
+        },
+        select_params=[query, query],
+    )
+
+
+def _build_match(terms):
+    # 각 토큰을 phrase로 감싸 FTS 문법 문자(" * : 등)가 그대로 검색되도록 함
+    return ' AND '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_listings(queryset, q):
+    """
+    제목/설명 전문 검색.
+    SQLite에서는 FTS5(trigram) 가상 테이블과 JOIN 후 bm25 순으로, PostgreSQL에서는
+    pg_trgm 인덱스를 타는 ILIKE 후 word_similarity 순으로 정렬하고,
+    그 외 DB에서는 title/description icontains로 대체한다.
+    결과 queryset에는 search_rank(작을수록 관련도 높음)가 붙는다.
+    """
+    terms = q.split()
+    if not terms:
+        return queryset
+
+    long_terms = [t for t in terms if len(t) >= MIN_NGRAM]
+    short_terms = [t for t in terms if len(t) < MIN_NGRAM]
+
+    if not long_terms or not (fts_available() or trigram_available()):
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+        return queryset
+
+    if trigram_available():
+        queryset = _search_trigram(queryset, long_terms)
+    else:
+        queryset = queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = listings_listing.id', f'{FTS_TABLE} MATCH %s'],
+            params=[_build_match(long_terms)],
+            select={'search_rank': f'bm25({FTS_TABLE}, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT})'},
+        )
+    for term in short_terms:
+        queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+    return queryset.order_by('search_rank', '-created_at')
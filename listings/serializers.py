@@ -1,7 +1,22 @@
 from rest_framework import serializers
 from .models import Listing
+from .thumbnails import THUMBNAIL_FIELDS, THUMBNAIL_WIDTHS, thumbnail_url
 class ListingSerializer(serializers.ModelSerializer):
+    thumbnails = serializers.SerializerMethodField()
     class Meta:
         model = Listing
-        fields = ['id','seller','title','description','price','status','created_at','image']
+        fields = ['id','seller','title','description','price','status','created_at','image','thumbnails']
         read_only_fields = ['seller','created_at']
+    def get_thumbnails(self, obj):
+        """{"image": {"320": {"webp": url, "jpeg": url}, ...}} — 아직 생성 전이면 원본 URL"""
+        request = self.context.get('request')
+        build = request.build_absolute_uri if request else (lambda url: url)
+        result = {}
+        for field in THUMBNAIL_FIELDS:
+            if not getattr(obj, field):
+                continue
+            result[field] = {
+                str(width): {ext: build(thumbnail_url(obj, field, width, ext)) for ext in ('webp', 'jpeg')}
+                for width in THUMBNAIL_WIDTHS
+            }
+        return result
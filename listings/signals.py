@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Listing
+from .thumbnails import THUMBNAIL_FIELDS, needs_thumbnails, schedule_thumbnails
+
+
+@receiver(post_save, sender=Listing)
+def queue_listing_thumbnails(sender, instance, **kwargs):
+    """이미지가 새로 올라오거나 바뀌면 커밋 후 백그라운드에서 썸네일 생성"""
+    if not settings.THUMBNAILS_IN_PROCESS:
+        return
+    if any(needs_thumbnails(instance, field) for field in THUMBNAIL_FIELDS):
+        transaction.on_commit(lambda: schedule_thumbnails(instance.pk))
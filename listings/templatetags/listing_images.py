@@ -0,0 +1,17 @@
+from django import template
+
+from listings.thumbnails import thumbnail_srcset, thumbnail_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def thumb_url(listing, field='image', width=320, ext='jpeg'):
+    """{% thumb_url item 'image' 320 %} → 해당 폭 썸네일 URL (없으면 원본)"""
+    return thumbnail_url(listing, field, width, ext)
+
+
+@register.simple_tag
+def thumb_srcset(listing, field='image', ext='webp'):
+    """{% thumb_srcset item 'image' 'webp' as srcset %} → <source srcset> 값"""
+    return thumbnail_srcset(listing, field, ext)
@@ -0,0 +1,193 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.http import QueryDict
+from django.utils import timezone
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from core.pagination import decode_cursor, encode_cursor
+
+from .models import CaptureSession, Listing
+from .pagination import ListingFeedPagination, paginate_feed
+from .search import FTS_TRIGGERS, fts_available, search_listings
+from .thumbnails import build_thumbnails, schedule_thumbnails, thumbnail_srcset, thumbnail_url
+
+
+class ListingSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = get_user_model().objects.create(username='seller')
+
+    def create_listing(self, title, description='설명'):
+        return Listing.objects.create(
+            seller=self.seller, title=title, description=description, price=1000, image='listing/test.jpg'
+        )
+
+    def test_fts_triggers_survive_migrations(self):
+        if not fts_available():
+            self.skipTest('FTS5는 SQLite 전용')
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            triggers = {row[0] for row in cursor.fetchall()}
+        self.assertTrue(set(FTS_TRIGGERS) <= triggers, triggers)
+
+    def test_listing_created_after_migrations_is_searchable(self):
+        listing = self.create_listing('갤럭시 S21 판매합니다')
+        found = search_listings(Listing.objects.all(), '갤럭시')
+        self.assertEqual([l.pk for l in found], [listing.pk])
+
+    def test_query_param_finds_new_and_edited_listings(self):
+        listing = self.create_listing('아이폰 13 미니')
+        for url in ('/listings/', '/api/listings/api/'):
+            response = self.client.get(url, {'q': '아이폰'})
+            self.assertContains(response, '아이폰 13 미니')
+
+        listing.title = '플레이스테이션 5 디스크'
+        listing.save()
+        response = self.client.get('/api/listings/api/', {'q': '플레이스테이션'})
+        self.assertEqual([item['id'] for item in response.json()['results']], [listing.pk])
+        response = self.client.get('/api/listings/api/', {'q': '아이폰'})
+        self.assertEqual(response.json()['results'], [])
+
+
+class ListingPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = get_user_model().objects.create(username='seller')
+        cls.listings = [
+            Listing.objects.create(
+                seller=cls.seller, title=f'상품 {i}', description='-', price=1000, image='listing/test.jpg'
+            )
+            for i in range(5)
+        ]
+
+    def walk(self, queryset, page_size):
+        """paginate_feed로 마지막 페이지까지 따라가며 (페이지별 id 목록) 반환"""
+        pages, params = [], QueryDict()
+        while True:
+            items, next_params = paginate_feed(queryset, params, page_size)
+            pages.append([item.pk for item in items])
+            if next_params is None:
+                return pages
+            params = QueryDict(mutable=True)
+            params.update(next_params)
+
+    def test_cursor_round_trip(self):
+        now = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(now, 42)), (now, 42))
+        for bad in ('', None, 'not-base64!', encode_cursor(now, 1)[:-3]):
+            self.assertIsNone(decode_cursor(bad))
+
+    def test_ties_on_created_at_are_neither_skipped_nor_repeated(self):
+        Listing.objects.update(created_at=timezone.now())
+        pages = self.walk(Listing.objects.all(), page_size=2)
+        expected = sorted((listing.pk for listing in self.listings), reverse=True)
+        self.assertEqual([pk for page in pages for pk in page], expected)
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+
+    def test_last_page_has_no_next(self):
+        self.assertEqual(len(self.walk(Listing.objects.all(), page_size=5)), 1)
+
+        url, seen = '/api/listings/api/', []
+        with mock.patch.object(ListingFeedPagination, 'page_size', 2):
+            while url:
+                body = self.client.get(url).json()
+                self.assertEqual(set(body), {'next', 'results'})
+                seen.append([item['id'] for item in body['results']])
+                url = body['next']
+        self.assertEqual([len(page) for page in seen], [2, 2, 1])
+        self.assertEqual(sorted(pk for page in seen for pk in page), sorted(listing.pk for listing in self.listings))
+
+
+class ListingThumbnailTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = get_user_model().objects.create(username='seller')
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root, THUMBNAILS_IN_PROCESS=False))
+
+    def listing_with_image(self, width):
+        buffer = io.BytesIO()
+        Image.new('RGB', (width, width // 2)).save(buffer, 'PNG')
+        name = default_storage.save('listing/item.png', ContentFile(buffer.getvalue()))
+        return Listing.objects.create(seller=self.seller, title='썸네일', description='-', price=1000, image=name)
+
+    def test_srcset_lists_only_generated_widths(self):
+        small = self.listing_with_image(200)
+        large = self.listing_with_image(800)
+        for listing in (small, large):
+            build_thumbnails(listing.pk)
+            listing.refresh_from_db()
+
+        self.assertEqual(list(small.thumbnails['image']['sizes']), ['200'])
+        self.assertRegex(thumbnail_srcset(small, 'image'), r'^\S+_w200\.webp 200w$')
+        self.assertEqual(list(large.thumbnails['image']['sizes']), ['320', '640'])
+        self.assertRegex(thumbnail_srcset(large, 'image'), r'^\S+ 320w, \S+ 640w$')
+        # 만들지 않은 폭은 원본으로 대체
+        self.assertEqual(thumbnail_url(small, 'image', 640), small.image.url)
+
+    def test_disabled_process_does_not_schedule(self):
+        with mock.patch('listings.thumbnails._executor') as executor:
+            listing = self.listing_with_image(200)
+            schedule_thumbnails(listing.pk)
+        executor.submit.assert_not_called()
+
+    def test_check_database_reports_missing_fts_trigger(self):
+        if not fts_available():
+            self.skipTest('FTS5는 SQLite 전용')
+        call_command('check_database', stdout=io.StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TRIGGER {FTS_TRIGGERS[0]}')
+        with self.assertRaisesMessage(CommandError, FTS_TRIGGERS[0]):
+            call_command('check_database', stdout=io.StringIO())
+
+
+class ListingCaptureSessionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = get_user_model().objects.create(username='seller')
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root, LOCKER_ID='locker-test'))
+        self.client.force_login(self.seller)
+
+    def image(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (8, 8)).save(buffer, 'PNG')
+        return SimpleUploadedFile('item.png', buffer.getvalue(), content_type='image/png')
+
+    def test_api_create_opens_capture_session(self):
+        response = self.client.post('/api/listings/api/', {
+            'title': '닌텐도 스위치', 'description': '-', 'price': 200000, 'image': self.image(),
+        })
+        self.assertEqual(response.status_code, 201, response.content)
+        session = CaptureSession.objects.get(listing_id=response.json()['id'])
+        self.assertEqual(session.locker_id, 'locker-test')
+        self.assertEqual(session.status, CaptureSession.Status.PENDING)
+
+    def test_deposit_code_shown_only_to_seller(self):
+        listing = Listing.objects.create(
+            seller=self.seller, title='입고 코드', description='-', price=1000, image='listing/test.jpg'
+        )
+        session = CaptureSession.objects.create(locker_id='locker-test', listing=listing)
+        response = self.client.get(f'/listings/{listing.pk}/')
+        self.assertContains(response, session.deposit_code)
+
+        self.client.force_login(get_user_model().objects.create(username='visitor'))
+        response = self.client.get(f'/listings/{listing.pk}/')
+        self.assertNotContains(response, 'deposit-code')
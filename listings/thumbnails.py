@@ -0,0 +1,129 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# 목록/프로필 카드용 고정 폭 (px)
+THUMBNAIL_WIDTHS = (320, 640)
+THUMBNAIL_FIELDS = ('image', 'capture_image')
+
+# (확장자, Pillow 포맷, 저장 옵션)
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# 업로드 요청 스레드를 막지 않도록 별도 워커 1개에서 순차 처리
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='thumbnails')
+
+
+def thumbnail_name(source_name, width, ext):
+    """listing/foo.jpg → listing/thumbs/foo_w320.webp"""
+    directory, filename = os.path.split(source_name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'thumbs', f'{stem}_w{width}.{ext}').replace(os.sep, '/')
+
+
+def needs_thumbnails(listing, field):
+    name = getattr(listing, field).name
+    if not name:
+        return False
+    return (listing.thumbnails or {}).get(field, {}).get('src') != name
+
+
+def render_thumbnails(source_name):
+    """
+    원본 이미지를 폭별/포맷별로 축소 저장하고 {실제 폭: {포맷: 저장 경로}} 반환.
+    원본보다 큰 폭은 만들지 않으므로 작은 원본은 원본 폭 하나만 생김 (srcset의 w 값이 실제 크기와 같도록)
+    """
+    with default_storage.open(source_name, 'rb') as f:
+        image = ImageOps.exif_transpose(Image.open(f))
+        image = image.convert('RGB')
+
+    sizes = {}
+    # 원본보다 크게 늘리지 않음
+    for width in sorted({min(width, image.width) for width in THUMBNAIL_WIDTHS}):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        sizes[str(width)] = {}
+        for ext, (fmt, options) in FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, fmt, **options)
+            name = thumbnail_name(source_name, width, ext)
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            sizes[str(width)][ext] = default_storage.save(name, ContentFile(buffer.getvalue()))
+    return sizes
+
+
+def build_thumbnails(listing_id, fields=THUMBNAIL_FIELDS, force=False):
+    """Listing 이미지 필드의 썸네일을 생성하고 thumbnails JSON을 갱신 (동기 실행, force면 있어도 다시 생성)"""
+    from .models import Listing
+
+    listing = Listing.objects.filter(pk=listing_id).first()
+    if listing is None:
+        return
+    thumbnails = dict(listing.thumbnails or {})
+    changed = False
+    for field in fields:
+        if not getattr(listing, field).name or not (force or needs_thumbnails(listing, field)):
+            continue
+        source_name = getattr(listing, field).name
+        try:
+            thumbnails[field] = {'src': source_name, 'sizes': render_thumbnails(source_name)}
+            changed = True
+        except Exception as e:
+            logger.warning(f"[thumbnails] Listing({listing_id}).{field} 썸네일 생성 실패: {e}")
+    if changed:
+        Listing.objects.filter(pk=listing_id).update(thumbnails=thumbnails)
+
+
+def _run_in_background(listing_id):
+    try:
+        build_thumbnails(listing_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_thumbnails(listing_id):
+    """
+    백그라운드 워커에 썸네일 생성 작업 등록. settings.THUMBNAILS_IN_PROCESS가 꺼진 프로세스
+    (보관함 Pi 등)에서는 아무것도 하지 않음 — 웹 프로세스 또는 manage.py build_thumbnails가 생성
+    """
+    if not settings.THUMBNAILS_IN_PROCESS:
+        return
+    _executor.submit(_run_in_background, listing_id)
+
+
+def thumbnail_url(listing, field, width, ext='jpeg'):
+    """생성된 썸네일 URL. 아직 없거나 원본이 바뀌었으면 원본 URL로 대체"""
+    file = getattr(listing, field)
+    if not file:
+        return ''
+    entry = (listing.thumbnails or {}).get(field, {})
+    if entry.get('src') == file.name:
+        name = entry.get('sizes', {}).get(str(width), {}).get(ext)
+        if name:
+            return default_storage.url(name)
+    return file.url
+
+
+def thumbnail_srcset(listing, field, ext='webp'):
+    """<source srcset> 문자열 ("url 320w, url 640w" — 실제로 생성된 폭만). 썸네일이 없으면 빈 문자열"""
+    file = getattr(listing, field)
+    entry = (listing.thumbnails or {}).get(field, {})
+    if not file or entry.get('src') != file.name:
+        return ''
+    parts = []
+    for width, formats in sorted(entry.get('sizes', {}).items(), key=lambda kv: int(kv[0])):
+        if ext in formats:
+            parts.append(f'{default_storage.url(formats[ext])} {width}w')
+    return ', '.join(parts)
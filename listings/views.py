@@ -1,22 +1,53 @@
+from django.conf import settings
 from django.views.generic import ListView, CreateView, DetailView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from rest_framework import viewsets, permissions
 
-from .models import Listing
+from core.replica import ReplicaReadMixin
+
+from .models import Listing, CaptureSession
 from .forms import ListingForm
 from .serializers import ListingSerializer
+from .search import search_listings
+from .pagination import ListingFeedPagination, paginate_feed
+from .thumbnails import THUMBNAIL_FIELDS, needs_thumbnails, schedule_thumbnails
+
+def open_capture_session(listing):
+    """등록한 상품을 이 서버 보관함(LOCKER_ID)의 촬영 대기열에 연결"""
+    return CaptureSession.objects.create(locker_id=settings.LOCKER_ID, listing=listing)
+
+def filter_feed(qs, params):
+    """HTML 목록과 API가 공유하는 ?status= / ?q= 필터"""
+    status = params.get('status')
+    if status in Listing.Status.values:
+        qs = qs.filter(status=status)
+    q = params.get('q')
+    if q:
+        qs = search_listings(qs, q)
+    return qs
 
-class ListingListView(ListView):
+class ListingListView(ReplicaReadMixin, ListView):
     model = Listing
-    paginate_by = 12
     template_name = 'listings/listings_list.html'
     def get_queryset(self):
-        qs = super().get_queryset().order_by('-created_at')
-        q = self.request.GET.get('q')
-        if q:
-            qs = qs.filter(title__icontains=q)
-        return qs
+        return filter_feed(super().get_queryset().order_by('-created_at'), self.request.GET)
+    def get_context_data(self, **kwargs):
+        items, next_params = paginate_feed(self.object_list, self.request.GET)
+        context = super().get_context_data(object_list=items, **kwargs)
+        next_query = None
+        if next_params:
+            query = self.request.GET.copy()
+            for key in ('cursor', 'offset'):
+                query.pop(key, None)
+            query.update(next_params)
+            next_query = query.urlencode()
+        context.update({
+            'next_query': next_query,
+            'status_choices': Listing.Status.choices,
+            'current_status': self.request.GET.get('status', ''),
+        })
+        return context
 
 class ListingCreateView(LoginRequiredMixin, CreateView):
     model = Listing
@@ -25,15 +56,37 @@ class ListingCreateView(LoginRequiredMixin, CreateView):
     success_url = reverse_lazy('listing_list')
     def form_valid(self, form):
         form.instance.seller = self.request.user
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        open_capture_session(self.object)
+        return response
 
 class ListingDetailView(DetailView):
     model = Listing
     template_name = 'listings/listing_detail.html'
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # 보관함(Pi)에서 촬영 이미지가 바뀐 경우 등 썸네일이 없으면 웹 프로세스에서 생성 예약 (그동안은 원본 표시)
+        if any(needs_thumbnails(self.object, field) for field in THUMBNAIL_FIELDS):
+            schedule_thumbnails(self.object.pk)
+        # 판매자에게만 보관함 입고 코드 표시 (키패드 D → 상품 ID → 입고 코드)
+        if self.request.user.id == self.object.seller_id:
+            context['deposit_session'] = (
+                self.object.capture_sessions
+                .filter(locker_id=settings.LOCKER_ID, status=CaptureSession.Status.PENDING)
+                .order_by('-created_at').first()
+            )
+        return context
 
-class ListingViewSet(viewsets.ModelViewSet):
+class ListingViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Listing.objects.all().order_by('-created_at')
     serializer_class = ListingSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = ListingFeedPagination
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == 'list':
+            qs = filter_feed(qs, self.request.query_params)
+        return qs
     def perform_create(self, serializer):
-        serializer.save(seller=self.request.user)
+        listing = serializer.save(seller=self.request.user)
+        open_capture_session(listing)
@@ -0,0 +1,69 @@
+"""
+에스크로 상태 전이 (HELD → RELEASED / REFUNDED).
+
+상태 변경은 모두 이 모듈을 거친다. 전이는 "현재 상태가 예상한 값일 때만" 바꾸는
+조건부 UPDATE 한 번으로 처리하므로, 동시에 두 번 확정 요청이 와도 한 번만 성공하고
+확인코드도 RELEASED로 바뀌는 그 UPDATE에서 정확히 한 번 발급된다.
+조회(GET) 경로는 주문을 읽기만 한다.
+"""
+import secrets
+
+from django.utils import timezone
+
+from .models import Order
+
+State = Order.EscrowState
+
+# 현재 상태 → 갈 수 있는 상태
+TRANSITIONS = {
+    State.HELD: {State.RELEASED, State.REFUNDED},
+    State.RELEASED: set(),
+    State.REFUNDED: set(),
+}
+
+
+class InvalidTransition(Exception):
+    """허용되지 않은 전이이거나, 그 사이 다른 요청이 먼저 상태를 바꾼 경우"""
+
+    def __init__(self, order, target):
+        self.order = order
+        self.current = order.escrow_state
+        self.target = target
+        super().__init__(f'Order({order.pk}) {self.current} → {target} 전이 불가')
+
+
+def can_transition(current, target):
+    return target in TRANSITIONS.get(current, ())
+
+
+def generate_code():
+    """보관함 키패드에 입력하는 4자리 확인코드"""
+    return f"{secrets.randbelow(10000):04d}"
+
+
+def transition(order, target, **fields):
+    """
+    order를 target 상태로 전이 (fields는 같은 UPDATE에서 함께 저장).
+    DB의 상태가 order.escrow_state와 다르면 최신 상태로 갱신한 뒤 InvalidTransition.
+    """
+    if not can_transition(order.escrow_state, target):
+        raise InvalidTransition(order, target)
+    # update()는 auto_now를 적용하지 않으므로 updated_at을 직접 지정 (보관함 인덱스가 변경분 조회에 사용)
+    values = {'escrow_state': target, 'updated_at': timezone.now(), **fields}
+    updated = Order.objects.filter(pk=order.pk, escrow_state=order.escrow_state).update(**values)
+    if not updated:
+        order.refresh_from_db(fields=['escrow_state', 'confirmation_code', 'updated_at'])
+        raise InvalidTransition(order, target)
+    for name, value in values.items():
+        setattr(order, name, value)
+    return order
+
+
+def release(order):
+    """구매확정: HELD → RELEASED, 확인코드 발급"""
+    return transition(order, State.RELEASED, confirmation_code=order.confirmation_code or generate_code())
+
+
+def refund(order):
+    """환불: HELD → REFUNDED"""
+    return transition(order, State.REFUNDED)
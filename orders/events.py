@@ -0,0 +1,32 @@
+from django.db import transaction
+
+from chat.events import broadcast_to_room
+from chat.models import ChatRoom
+
+
+def order_state_payload(order):
+    """채팅방 화면(applyOrderState)이 쓰는 필드만 담은 주문 상태"""
+    return {
+        'id': order.id,
+        'listing': order.listing_id,
+        'buyer': order.buyer_id,
+        'escrow_state': order.escrow_state,
+        'confirmation_code': order.confirmation_code or '',
+    }
+
+
+def publish_order_state(order):
+    """
+    주문 생성/상태 변경을 해당 구매자-물품 채팅방 그룹으로 전송 (order.state 이벤트).
+    커밋 이후에 보내므로 클라이언트가 받은 상태는 항상 DB에 반영된 상태다.
+    """
+    payload = order_state_payload(order)
+
+    def send():
+        room_ids = ChatRoom.objects.filter(
+            listing_id=order.listing_id, buyer_id=order.buyer_id
+        ).values_list('id', flat=True)
+        for room_id in room_ids:
+            broadcast_to_room(room_id, {'type': 'order.state', 'order': payload})
+
+    transaction.on_commit(send)
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0006_capturesession'),
+        ('orders', '0002_order_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['listing', 'buyer', 'created_at'], name='order_listing_buyer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['buyer', 'created_at'], name='order_buyer_created_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+import secrets
+
+from django.db import migrations
+from django.db.models import Q
+from django.utils import timezone
+
+
+def backfill_codes(apps, schema_editor):
+    """
+    확인코드 없이 RELEASED 된 기존 주문에 코드를 한 번 발급.
+    (이전에는 채팅방 GET에서 뒤늦게 채웠지만, 이제 코드는 구매확정 전이에서만 발급된다)
+    """
+    Order = apps.get_model('orders', 'Order')
+    missing = Order.objects.filter(escrow_state='RELEASED').filter(
+        Q(confirmation_code__isnull=True) | Q(confirmation_code='')
+    )
+    now = timezone.now()
+    for pk in missing.values_list('pk', flat=True):
+        Order.objects.filter(pk=pk).update(
+            confirmation_code=f"{secrets.randbelow(10000):04d}", updated_at=now
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_order_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_codes, migrations.RunPython.noop),
+    ]
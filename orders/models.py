@@ -14,3 +14,12 @@ class Order(models.Model):
     escrow_state = models.CharField(max_length=16, choices=EscrowState.choices, default=EscrowState.HELD)
     confirmation_code = models.CharField(max_length=4, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # 상태 변경 시각 — 보관함(Pi)의 확인코드 인덱스가 이 값 기준으로 변경분만 가져감
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # 채팅방의 "이 상품 + 이 구매자의 최신 주문" 조회 / 구매자별 주문 목록
+            models.Index(fields=['listing', 'buyer', 'created_at'], name='order_listing_buyer_idx'),
+            models.Index(fields=['buyer', 'created_at'], name='order_buyer_created_idx'),
+        ]
@@ -0,0 +1,179 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from chat.models import ChatRoom
+from listings.models import CaptureSession, Listing
+
+from .events import publish_order_state
+from .models import Order
+
+# 요청별 허용 쿼리 수 (세션 + 사용자 조회 2건 포함). 주문 수와 무관해야 함 (N+1 방지)
+LIST_QUERIES = 3
+LATEST_QUERIES = 3
+CONFIRM_QUERIES = 4
+
+
+class OrderQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.seller = User.objects.create(username='seller')
+        cls.buyer = User.objects.create(username='buyer')
+        cls.listing = Listing.objects.create(
+            seller=cls.seller, title='query check', description='-', price=1000, image='listing/qc.jpg'
+        )
+
+    def seed_orders(self, count):
+        Order.objects.bulk_create([Order(listing=self.listing, buyer=self.buyer, amount=1000) for _ in range(count)])
+        return Order.objects.filter(listing=self.listing).order_by('-created_at', '-id').first()
+
+    def get_as(self, user, url, queries):
+        self.client.force_login(user)
+        with self.assertNumQueries(queries):
+            response = self.client.get(
+                url, {'listing': self.listing.id, 'buyer': self.buyer.id}, HTTP_ACCEPT='application/json'
+            )
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_list_query_count_is_constant(self):
+        for count in (1, 20):
+            with self.subTest(orders=count):
+                self.seed_orders(count)
+                for user in (self.buyer, self.seller):
+                    self.get_as(user, '/api/orders/', LIST_QUERIES)
+
+    def test_latest_query_count_is_constant(self):
+        for count in (1, 20):
+            with self.subTest(orders=count):
+                latest = self.seed_orders(count)
+                for user in (self.buyer, self.seller):
+                    response = self.get_as(user, '/api/orders/latest/', LATEST_QUERIES)
+                    self.assertEqual(response.json()['id'], latest.id)
+
+    def test_confirm_query_count(self):
+        for count in (1, 20):
+            with self.subTest(orders=count):
+                latest = self.seed_orders(count)
+                self.client.force_login(self.seller)
+                with self.assertNumQueries(CONFIRM_QUERIES):
+                    response = self.client.post(f'/api/orders/{latest.id}/confirm/', HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['escrow_state'], Order.EscrowState.RELEASED)
+
+
+class ChatRoomOrderReadOnlyTests(TestCase):
+    def test_room_get_does_not_write_orders(self):
+        """확인코드는 confirm에서만 발급 — 코드 없이 RELEASED 된 주문이 있어도 채팅방 GET은 주문을 쓰지 않음"""
+        User = get_user_model()
+        seller = User.objects.create(username='seller')
+        buyer = User.objects.create(username='buyer')
+        listing = Listing.objects.create(
+            seller=seller, title='read only', description='-', price=1000, image='listing/ro.jpg'
+        )
+        Order.objects.create(listing=listing, buyer=buyer, amount=1000, escrow_state=Order.EscrowState.RELEASED)
+        room = ChatRoom.objects.create(listing=listing, buyer=buyer, seller=seller)
+
+        self.client.force_login(buyer)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/chat/{room.id}/')
+        self.assertEqual(response.status_code, 200)
+        order_table = Order._meta.db_table
+        writes = [
+            q['sql'] for q in ctx.captured_queries
+            if order_table in q['sql'] and not q['sql'].lstrip().upper().startswith('SELECT')
+        ]
+        self.assertEqual(writes, [])
+
+
+class OrderCaptureSessionTests(TestCase):
+    def test_order_is_linked_to_capture_session(self):
+        User = get_user_model()
+        seller = User.objects.create(username='seller')
+        buyer = User.objects.create(username='buyer')
+        listing = Listing.objects.create(
+            seller=seller, title='입고 상품', description='-', price=1000, image='listing/qc.jpg'
+        )
+        session = CaptureSession.objects.create(locker_id='locker-1', listing=listing)
+        cancelled = CaptureSession.objects.create(
+            locker_id='locker-1', listing=listing, status=CaptureSession.Status.CANCELLED
+        )
+
+        self.client.force_login(buyer)
+        response = self.client.post('/api/orders/', {'listing': listing.pk, 'amount': 1000})
+        self.assertEqual(response.status_code, 201, response.content)
+
+        session.refresh_from_db()
+        cancelled.refresh_from_db()
+        self.assertEqual(session.order_id, response.json()['id'])
+        self.assertIsNone(cancelled.order_id)
+
+
+class OrderStateEventTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.seller = User.objects.create(username='seller')
+        cls.buyer = User.objects.create(username='buyer')
+        cls.other_buyer = User.objects.create(username='other')
+        cls.listing = Listing.objects.create(
+            seller=cls.seller, title='이벤트 상품', description='-', price=1000, image='listing/qc.jpg'
+        )
+        cls.room = ChatRoom.objects.create(listing=cls.listing, buyer=cls.buyer, seller=cls.seller)
+        # 같은 상품의 다른 구매자 채팅방에는 보내지 않아야 함
+        ChatRoom.objects.create(listing=cls.listing, buyer=cls.other_buyer, seller=cls.seller)
+
+    def setUp(self):
+        patcher = mock.patch('orders.events.broadcast_to_room')
+        self.broadcast = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sent_orders(self):
+        return [
+            (call.args[0], call.args[1]['type'], call.args[1]['order']['escrow_state'])
+            for call in self.broadcast.call_args_list
+        ]
+
+    def test_create_and_confirm_publish_state_after_commit(self):
+        self.client.force_login(self.buyer)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/orders/', {'listing': self.listing.pk, 'amount': 1000})
+        self.assertEqual(response.status_code, 201, response.content)
+        order_id = response.json()['id']
+
+        self.client.force_login(self.seller)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/orders/{order_id}/confirm/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.assertEqual(self.sent_orders(), [
+            (self.room.pk, 'order.state', Order.EscrowState.HELD),
+            (self.room.pk, 'order.state', Order.EscrowState.RELEASED),
+        ])
+        released = self.broadcast.call_args.args[1]['order']
+        self.assertEqual(released['id'], order_id)
+        self.assertEqual(released['confirmation_code'], Order.objects.get(pk=order_id).confirmation_code)
+
+    def test_nothing_is_sent_before_commit(self):
+        order = Order.objects.create(listing=self.listing, buyer=self.buyer, amount=1000)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            publish_order_state(order)
+        self.broadcast.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+
+    def test_rolled_back_change_is_not_published(self):
+        order = Order.objects.create(listing=self.listing, buyer=self.buyer, amount=1000)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    publish_order_state(order)
+                    raise RuntimeError('rollback')
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.broadcast.assert_not_called()
+
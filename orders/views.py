@@ -1,10 +1,12 @@
-import secrets
-
 from django.db.models import Q
 from rest_framework import viewsets, permissions, status, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from listings.models import CaptureSession
+
+from . import escrow
+from .events import publish_order_state
 from .models import Order
 from .serializers import OrderSerializer
 
@@ -14,7 +16,8 @@ class OrderViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Order.objects.all().order_by('-created_at')
+        # confirm()의 판매자 확인(order.listing.seller_id)이 추가 쿼리 없이 되도록 listing을 함께 조회
+        queryset = Order.objects.select_related('listing').order_by('-created_at', '-id')
         user = self.request.user
         if user.is_authenticated:
             queryset = queryset.filter(Q(buyer=user) | Q(listing__seller=user))
@@ -36,20 +39,40 @@ class OrderViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         listing = serializer.validated_data.get('listing')
-        if listing.seller == self.request.user:
+        if listing.seller_id == self.request.user.id:
             raise serializers.ValidationError({'detail': '본인 물품은 구매할 수 없습니다.'})
-        serializer.save(buyer=self.request.user)
+        order = serializer.save(buyer=self.request.user)
+        # 이 상품의 보관함 촬영 세션에 주문 연결 (입고 전/후 모두)
+        CaptureSession.objects.filter(listing=listing, order__isnull=True).exclude(
+            status=CaptureSession.Status.CANCELLED
+        ).update(order=order)
+        publish_order_state(order)
+
+    @action(detail=False, methods=['get'])
+    def latest(self, request):
+        """?listing=&buyer= 의 가장 최근 주문 한 건 (채팅방 주문 상태 조회용)"""
+        listing_id = request.query_params.get('listing')
+        buyer_id = request.query_params.get('buyer')
+        if not (listing_id and buyer_id):
+            return Response({'detail': 'listing, buyer 파라미터가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        order = self.get_queryset().first()
+        if order is None:
+            return Response({'detail': '주문이 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self.get_serializer(order).data)
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def confirm(self, request, pk=None):
         order = self.get_object()
-        if request.user != order.listing.seller:
+        if request.user.id != order.listing.seller_id:
             return Response({'detail': '판매자만 구매확정할 수 있습니다.'}, status=status.HTTP_403_FORBIDDEN)
-        if order.escrow_state == Order.EscrowState.RELEASED:
-            return Response({'detail': '이미 구매확정이 완료되었습니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        order.escrow_state = Order.EscrowState.RELEASED
-        if not order.confirmation_code:
-            order.confirmation_code = f"{secrets.randbelow(10000):04d}"
-        order.save(update_fields=['escrow_state', 'confirmation_code'])
+        try:
+            escrow.release(order)
+        except escrow.InvalidTransition as exc:
+            if exc.current == Order.EscrowState.RELEASED:
+                detail = '이미 구매확정이 완료되었습니다.'
+            else:
+                detail = '구매확정할 수 없는 주문입니다.'
+            return Response({'detail': detail}, status=status.HTTP_400_BAD_REQUEST)
+        publish_order_state(order)
         return Response(self.get_serializer(order).data, status=status.HTTP_200_OK)
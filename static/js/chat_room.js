@@ -13,18 +13,41 @@
   const socketScheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
   const socketUrl = `${socketScheme}://${window.location.host}/ws/chat/${roomId}/`;
   const chatSocket = new WebSocket(socketUrl);
+  // 주문 영역이 있는 화면에서만 아래 주문 로직이 채워 넣음
+  let handleOrderState = null;
 
   chatSocket.addEventListener('open', scrollToBottom);
   chatSocket.addEventListener('message', (event) => {
     try {
       const data = JSON.parse(event.data);
+      if (data.type === 'order.state') {
+        // 구매 요청/구매확정 시 서버가 채팅방 그룹으로 보내는 주문 상태 (폴링 대신)
+        if (handleOrderState && data.order) handleOrderState(data.order);
+        return;
+      }
+      if (data.type === 'chat.read') {
+        if (Number(data.reader_id) !== userId) markOwnMessagesRead(Number(data.up_to));
+        return;
+      }
+      if (data.type === 'chat.saved') {
+        // write-behind: 먼저 key로 표시된 메시지에 DB id를 붙이고 상대 메시지는 읽음 처리
+        applySavedIds(data.messages || []);
+        return;
+      }
+      if (data.type === 'chat.failed') {
+        markFailed(data.keys || []);
+        return;
+      }
       if (data.type !== 'chat.message') return;
       appendMessage({
+        id: data.id,
+        key: data.key,
         message: data.message,
         sender: data.sender,
         senderId: Number(data.sender_id),
         timestamp: data.timestamp,
       });
+      if (Number(data.sender_id) !== userId && data.id) sendSeen(Number(data.id));
     } catch (error) {
       console.error('Failed to parse websocket payload', error);
     }
@@ -51,10 +74,18 @@
     }
   });
 
-  function appendMessage({ message, sender, senderId, timestamp }) {
+  function appendMessage(data) {
+    messagesEl.appendChild(buildMessageRow(data));
+    scrollToBottom();
+  }
+
+  function buildMessageRow({ id, key, message, senderId, timestamp, isRead }) {
     const isSelf = senderId === userId;
     const row = document.createElement('div');
     row.className = `message-row ${isSelf ? 'me' : 'other'}`;
+    if (id) row.dataset.messageId = String(id);
+    if (key) row.dataset.messageKey = key;
+    if (isSelf && isRead) row.classList.add('is-read');
 
     const bubble = document.createElement('div');
     bubble.className = `message ${isSelf ? 'me' : 'other'}`;
@@ -70,14 +101,102 @@
     bubble.appendChild(textEl);
     bubble.appendChild(timeEl);
     row.appendChild(bubble);
-    messagesEl.appendChild(row);
-    scrollToBottom();
+    return row;
+  }
+
+  function findByKey(key) {
+    return messagesEl.querySelector(`.message-row[data-message-key="${CSS.escape(key)}"]`);
+  }
+
+  function applySavedIds(saved) {
+    let upTo = 0;
+    saved.forEach(({ key, id }) => {
+      const row = findByKey(key);
+      if (!row) return;
+      row.dataset.messageId = String(id);
+      if (row.classList.contains('other')) upTo = Math.max(upTo, Number(id));
+    });
+    if (upTo) sendSeen(upTo);
+  }
+
+  function markFailed(keys) {
+    keys.forEach((key) => {
+      const row = findByKey(key);
+      if (row) row.classList.add('is-failed');
+    });
   }
 
   function scrollToBottom() {
     messagesEl.scrollTop = messagesEl.scrollHeight;
   }
 
+  // ------------------------------------------------------------------
+  // 읽음 처리: 상대 메시지를 받으면 "seen" 프레임 전송 (서버에서 디바운스 후 bulk UPDATE)
+  // ------------------------------------------------------------------
+  function sendSeen(upTo) {
+    if (document.hidden || chatSocket.readyState !== WebSocket.OPEN) return;
+    chatSocket.send(JSON.stringify({ type: 'seen', up_to: upTo }));
+  }
+
+  function markOwnMessagesRead(upTo) {
+    messagesEl.querySelectorAll('.message-row.me:not(.is-read)').forEach((row) => {
+      if (Number(row.dataset.messageId || '0') <= upTo) row.classList.add('is-read');
+    });
+  }
+
+  function latestOtherMessageId() {
+    const rows = messagesEl.querySelectorAll('.message-row.other[data-message-id]');
+    return rows.length ? Number(rows[rows.length - 1].dataset.messageId) : 0;
+  }
+
+  document.addEventListener('visibilitychange', () => {
+    const upTo = latestOtherMessageId();
+    if (!document.hidden && upTo) sendSeen(upTo);
+  });
+
+  // ------------------------------------------------------------------
+  // 이전 메시지 커서 페이징 (스크롤이 맨 위에 닿으면 한 페이지씩 로드)
+  // ------------------------------------------------------------------
+  const historyUrl = messagesEl.dataset.historyUrl || '';
+  let nextCursor = messagesEl.dataset.nextCursor || '';
+  let loadingHistory = false;
+
+  async function loadOlderMessages() {
+    if (!historyUrl || !nextCursor || loadingHistory) return;
+    loadingHistory = true;
+    try {
+      const params = new URLSearchParams({ before: nextCursor });
+      const resp = await fetch(`${historyUrl}?${params.toString()}`, {
+        headers: { Accept: 'application/json' },
+      });
+      if (!resp.ok) return;
+      const data = await resp.json();
+      const prevHeight = messagesEl.scrollHeight;
+      const fragment = document.createDocumentFragment();
+      (data.messages || []).forEach((item) => {
+        fragment.appendChild(buildMessageRow({
+          id: item.id,
+          message: item.message,
+          senderId: Number(item.sender_id),
+          timestamp: item.timestamp,
+          isRead: item.is_read,
+        }));
+      });
+      messagesEl.insertBefore(fragment, messagesEl.firstChild);
+      // 새로 붙인 만큼 스크롤 위치 보정 → 보고 있던 메시지가 그대로 유지됨
+      messagesEl.scrollTop += messagesEl.scrollHeight - prevHeight;
+      nextCursor = data.next_cursor || '';
+    } catch (error) {
+      console.error('Failed to load older messages', error);
+    } finally {
+      loadingHistory = false;
+    }
+  }
+
+  messagesEl.addEventListener('scroll', () => {
+    if (messagesEl.scrollTop < 40) loadOlderMessages();
+  });
+
   // ------------------------------------------------------------------
   // 주문/확정 로직 (기존 REST 기반 흐름 유지)
   // ------------------------------------------------------------------
@@ -99,8 +218,6 @@
   let orderConfirmed = actionsEl.dataset.orderConfirmed === 'true';
   let confirmationCode = actionsEl.dataset.initialCode || '';
   let buyerNotifiedForCode = orderConfirmed && !!confirmationCode;
-  let sellerPollTimer = null;
-  let buyerPollTimer = null;
 
   const codeTexts = purchaseCodeEl
     ? {
@@ -191,81 +308,23 @@
 
     const becameConfirmed = !prevConfirmed && orderConfirmed;
     updateCodeDisplay(becameConfirmed && isBuyer);
-
-    if (orderConfirmed && sellerPollTimer) {
-      clearTimeout(sellerPollTimer);
-      sellerPollTimer = null;
-    }
-    if (orderConfirmed && buyerPollTimer) {
-      clearTimeout(buyerPollTimer);
-      buyerPollTimer = null;
-    }
-
-    scheduleSellerPoll();
-    scheduleBuyerPoll();
   }
 
   async function fetchLatestOrder() {
     if (!listingId || !buyerId) return null;
     try {
       const params = new URLSearchParams({ listing: listingId, buyer: buyerId });
-      const resp = await fetch(`/api/orders/?${params.toString()}`, {
+      const resp = await fetch(`/api/orders/latest/?${params.toString()}`, {
         headers: { Accept: 'application/json' },
       });
       if (!resp.ok) return null;
-      const data = await resp.json();
-      const results = Array.isArray(data) ? data : Array.isArray(data.results) ? data.results : [];
-      if (!results.length) return null;
-      results.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
-      return results[0];
+      return await resp.json();
     } catch (error) {
       console.error('Failed to fetch order info', error);
       return null;
     }
   }
 
-  function scheduleSellerPoll() {
-    if (!isSeller || !confirmBtn) return;
-    if (!hasOrder || orderConfirmed) {
-      if (sellerPollTimer) {
-        clearTimeout(sellerPollTimer);
-        sellerPollTimer = null;
-      }
-      return;
-    }
-    if (sellerPollTimer) return;
-    sellerPollTimer = setTimeout(async () => {
-      sellerPollTimer = null;
-      const latest = await fetchLatestOrder();
-      if (latest) {
-        applyOrderState(latest);
-      } else {
-        scheduleSellerPoll();
-      }
-    }, 5000);
-  }
-
-  function scheduleBuyerPoll() {
-    if (!isBuyer || !purchaseBtn) return;
-    if (!hasOrder || orderConfirmed) {
-      if (buyerPollTimer) {
-        clearTimeout(buyerPollTimer);
-        buyerPollTimer = null;
-      }
-      return;
-    }
-    if (buyerPollTimer) return;
-    buyerPollTimer = setTimeout(async () => {
-      buyerPollTimer = null;
-      const latest = await fetchLatestOrder();
-      if (latest) {
-        applyOrderState(latest);
-      } else {
-        scheduleBuyerPoll();
-      }
-    }, 5000);
-  }
-
   if (purchaseBtn) {
     purchaseBtn.addEventListener('click', async () => {
       if (purchaseBtn.disabled) return;
@@ -401,5 +460,6 @@
     : null;
   applyOrderState(initialOrder);
   updateCodeDisplay(false);
+  handleOrderState = applyOrderState;
   scrollToBottom();
 })();
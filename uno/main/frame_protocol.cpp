@@ -0,0 +1,192 @@
+#include "lock_module.h"
+
+// ------------------------------------------------------
+// 🔹 Uno ↔ Pi 바이너리 프레임 (embedded/framing.py 와 동일 형식)
+//   SYNC(0xA5) | VER | TYPE | SEQ | LEN | PAYLOAD | CRC16(BE)
+//   CRC-16/CCITT-FALSE, VER~PAYLOAD 범위
+// ------------------------------------------------------
+#define FRAME_SYNC 0xA5
+#define FRAME_VERSION 1
+#define FRAME_MAX_PAYLOAD 32
+#define ACK_TIMEOUT_MS 200
+#define MAX_RETRIES 3
+
+static uint8_t txSeq = 0;
+
+// ACK 대기 중인 프레임 (재전송용). 메시지 종류별 슬롯 하나씩이라
+// ULTRA 대기 중에 CHECK를 보내도 ULTRA 프레임이 덮어써지지 않는다.
+// 같은 종류를 다시 보내면 이전 것은 새 프레임으로 대체된다 (최신 상태만 의미 있음)
+struct PendingFrame {
+  uint8_t type;
+  uint8_t frame[FRAME_MAX_PAYLOAD + 7];
+  uint8_t len;          // 0이면 빈 슬롯
+  uint8_t seq;
+  uint8_t retries;
+  unsigned long sentAt;
+};
+
+static PendingFrame pending[] = {
+  { MSG_HELLO, {}, 0, 0, 0, 0 },
+  { MSG_ULTRA, {}, 0, 0, 0, 0 },
+  { MSG_CHECK, {}, 0, 0, 0, 0 },
+  { MSG_DEPOSIT, {}, 0, 0, 0, 0 },
+};
+#define PENDING_SLOTS (sizeof(pending) / sizeof(pending[0]))
+
+static PendingFrame *pendingSlot(uint8_t type) {
+  for (uint8_t i = 0; i < PENDING_SLOTS; i++) {
+    if (pending[i].type == type) return &pending[i];
+  }
+  return NULL;
+}
+
+// 수신 상태 머신
+static uint8_t rxBuf[FRAME_MAX_PAYLOAD + 7];
+static uint8_t rxPos = 0;
+static uint8_t rxNeed = 0;
+
+static uint16_t crc16(const uint8_t *data, uint8_t len) {
+  uint16_t crc = 0xFFFF;
+  for (uint8_t i = 0; i < len; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+    for (uint8_t b = 0; b < 8; b++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : (crc << 1);
+    }
+  }
+  return crc;
+}
+
+static uint8_t buildFrame(uint8_t *out, uint8_t type, uint8_t seq, const uint8_t *payload, uint8_t len) {
+  out[0] = FRAME_SYNC;
+  out[1] = FRAME_VERSION;
+  out[2] = type;
+  out[3] = seq;
+  out[4] = len;
+  for (uint8_t i = 0; i < len; i++) out[5 + i] = payload[i];
+  uint16_t crc = crc16(out + 1, 4 + len);
+  out[5 + len] = crc >> 8;
+  out[6 + len] = crc & 0xFF;
+  return 7 + len;
+}
+
+// ACK가 필요한 프레임 전송 (응답 없으면 protoTick에서 재전송)
+static void sendReliable(uint8_t type, const uint8_t *payload, uint8_t len) {
+  PendingFrame *slot = pendingSlot(type);
+  if (slot == NULL) return;
+  txSeq++;
+  slot->len = buildFrame(slot->frame, type, txSeq, payload, len);
+  slot->seq = txSeq;
+  slot->retries = 0;
+  slot->sentAt = millis();
+  Serial.write(slot->frame, slot->len);
+}
+
+static void sendAck(uint8_t seq) {
+  uint8_t frame[8];
+  uint8_t payload[1] = { seq };
+  uint8_t n = buildFrame(frame, MSG_ACK, seq, payload, 1);
+  Serial.write(frame, n);
+}
+
+void protoInit() {
+  Serial.begin(SERIAL_BAUD);
+#if USE_BINARY_PROTOCOL
+  sendReliable(MSG_HELLO, NULL, 0);
+#endif
+}
+
+void sendUltra() {
+#if USE_BINARY_PROTOCOL
+  uint8_t payload[1] = { 1 };
+  sendReliable(MSG_ULTRA, payload, 1);
+#else
+  Serial.println("ULTRA:1");
+#endif
+}
+
+static void sendCode(uint8_t type, const char *name, const String &id, const String &code) {
+#if USE_BINARY_PROTOCOL
+  String body = id + ":" + code;
+  uint8_t len = body.length() > FRAME_MAX_PAYLOAD ? FRAME_MAX_PAYLOAD : body.length();
+  sendReliable(type, (const uint8_t *)body.c_str(), len);
+#else
+  Serial.println(String(name) + ":" + id + ":" + code);
+#endif
+}
+
+// 구매자 수령: 확인코드
+void sendCheck(const String &id, const String &code) {
+  sendCode(MSG_CHECK, "CHECK", id, code);
+}
+
+// 판매자 입고: 입고 코드 (맞으면 MATCH → 문 열림, 다음 ULTRA가 이 상품의 촬영)
+void sendDeposit(const String &id, const String &code) {
+  sendCode(MSG_DEPOSIT, "DEPOSIT", id, code);
+}
+
+// ------------------------------------------------------
+// 🔹 수신 처리: MATCH/NO_MATCH 등 응답 코드 반환 (없으면 0)
+// ------------------------------------------------------
+uint8_t protoPoll() {
+#if USE_BINARY_PROTOCOL
+  // ACK 없으면 재전송 (슬롯별로)
+  for (uint8_t i = 0; i < PENDING_SLOTS; i++) {
+    PendingFrame &p = pending[i];
+    if (!p.len || millis() - p.sentAt <= ACK_TIMEOUT_MS) continue;
+    if (p.retries < MAX_RETRIES) {
+      p.retries++;
+      p.sentAt = millis();
+      Serial.write(p.frame, p.len);
+    } else {
+      p.len = 0;
+    }
+  }
+
+  while (Serial.available()) {
+    uint8_t b = Serial.read();
+    if (rxPos == 0) {
+      if (b != FRAME_SYNC) continue;   // 텍스트/쓰레기 바이트 무시
+      rxBuf[rxPos++] = b;
+      rxNeed = 5;
+      continue;
+    }
+    rxBuf[rxPos++] = b;
+    if (rxPos == 5) {
+      if (rxBuf[1] != FRAME_VERSION || rxBuf[4] > FRAME_MAX_PAYLOAD) {
+        rxPos = 0;
+        continue;
+      }
+      rxNeed = 7 + rxBuf[4];
+    }
+    if (rxPos < rxNeed) continue;
+
+    uint8_t len = rxBuf[4];
+    uint16_t crc = ((uint16_t)rxBuf[5 + len] << 8) | rxBuf[6 + len];
+    rxPos = 0;
+    if (crc16(rxBuf + 1, 4 + len) != crc) continue;
+
+    uint8_t type = rxBuf[2];
+    uint8_t seq = rxBuf[3];
+    if (type == MSG_ACK) {
+      if (len == 1) {
+        for (uint8_t i = 0; i < PENDING_SLOTS; i++) {
+          if (pending[i].len && pending[i].seq == rxBuf[5]) pending[i].len = 0;
+        }
+      }
+      continue;
+    }
+    sendAck(seq);
+    return type;
+  }
+  return 0;
+#else
+  if (!Serial.available()) return 0;
+  String res = Serial.readStringUntil('\n');
+  res.trim();
+  if (res == "MATCH") return MSG_MATCH;
+  if (res == "NO_MATCH") return MSG_NO_MATCH;
+  if (res == "NO_LISTING") return MSG_NO_LISTING;
+  if (res == "ERROR") return MSG_ERROR;
+  return 0;
+#endif
+}
@@ -15,6 +15,7 @@ Keypad keypad = Keypad(makeKeymap(keys), rowPins, colPins, ROWS, COLS);
 String inputId = "";
 String inputCode = "";
 bool enteringId = true;
+bool depositMode = false;   // D 키: 판매자 입고 (확인코드 대신 입고 코드 전송)
 const int CODE_LEN = 4;
 
 // ---------------------------------------------------
@@ -23,7 +24,7 @@ const int CODE_LEN = 4;
 static void showEnterIdPrompt() {
   lcd.clear();
   lcd.setCursor(0, 0);
-  lcd.print("Enter ID:");
+  lcd.print(depositMode ? "Deposit ID:" : "Enter ID:");
   lcd.setCursor(0, 1);
 }
 
@@ -47,6 +48,16 @@ static void resetInputState() {
   inputId = "";
   inputCode = "";
   enteringId = true;
+  depositMode = false;
+  showEnterIdPrompt();
+}
+
+// ---------------------------------------------------
+// D 키 → 입고 모드 (상품 ID + 입고 코드)
+// ---------------------------------------------------
+static void handleDepositKey() {
+  resetInputState();
+  depositMode = true;
   showEnterIdPrompt();
 }
 
@@ -71,8 +82,11 @@ static void handleHashKey() {
     }
   } else {
     if (inputCode.length() == CODE_LEN && inputId.length() > 0) {
-      String message = "CHECK:" + inputId + ":" + inputCode;
-      Serial.println(message);
+      if (depositMode) {
+        sendDeposit(inputId, inputCode);
+      } else {
+        sendCheck(inputId, inputCode);
+      }
       delay(10);
 
       lcd.clear();
@@ -142,7 +156,12 @@ void handleKeypad() {
   char key = keypad.getKey();
   if (!key) return;
 
-  if (key == 'A' || key == 'B' || key == 'C' || key == 'D') {
+  if (key == 'D') {
+    handleDepositKey();
+    return;
+  }
+
+  if (key == 'A' || key == 'B' || key == 'C') {
     handleAKey();
     return;
   }
@@ -34,4 +34,28 @@ void ultrasonicInit();
 float getUltrasonicDistance();   // ⭐ main → 모듈로 이동한 함수
 void handleUltrasonic();
 
+// ------------------------------------------------------
+// 🔹 시리얼 프로토콜 (frame_protocol.cpp)
+//   USE_BINARY_PROTOCOL 0 이면 기존 텍스트(ULTRA:/CHECK:) 방식
+// ------------------------------------------------------
+#define USE_BINARY_PROTOCOL 1
+#define SERIAL_BAUD 9600   // Pi 쪽 UNO_BAUD 기본값과 같아야 함 (바꾸면 .env의 UNO_BAUD도 함께)
+
+#define MSG_HELLO      0x01
+#define MSG_ULTRA      0x02
+#define MSG_CHECK      0x03
+#define MSG_DEPOSIT    0x04
+#define MSG_MATCH      0x10
+#define MSG_NO_MATCH   0x11
+#define MSG_NO_LISTING 0x12
+#define MSG_ERROR      0x13
+#define MSG_ACK        0x7E
+#define MSG_NACK       0x7F
+
+void protoInit();
+void sendUltra();
+void sendCheck(const String &id, const String &code);
+void sendDeposit(const String &id, const String &code);
+uint8_t protoPoll();
+
 #endif
@@ -4,19 +4,14 @@ bool doorLocked = false;
 bool doorOpen = false;
 bool ultraSentAfterClose = false;
 
-String serialBuffer = "";
-
 // ------------------------------------------------------
 // 🔹 MATCH / NO_MATCH 처리
 // ------------------------------------------------------
 void handleSerialResponse() {
-  if (!Serial.available()) return;
-
-  String res = Serial.readStringUntil('\n');
-  res.trim();
-  if (res.length() == 0) return;
+  uint8_t res = protoPoll();
+  if (res == 0) return;
 
-  if (res == "MATCH") {
+  if (res == MSG_MATCH) {
     if (!doorOpen) {
       doorOpen = true;
       openDoor();
@@ -24,7 +19,7 @@ void handleSerialResponse() {
       showPrompt();
     }
   }
-  else if (res == "NO_MATCH") {
+  else if (res == MSG_NO_MATCH || res == MSG_NO_LISTING || res == MSG_ERROR) {
     showMessage("ACCESS DENIED", 1000);
     showPrompt();
   }
@@ -34,7 +29,7 @@ void handleSerialResponse() {
 // setup
 // ------------------------------------------------------
 void setup() {
-  Serial.begin(9600);
+  protoInit();
 
   lcdInit();
   keypadInit();
@@ -76,7 +71,7 @@ void loop() {
     float d = getUltrasonicDistance();   // ⭐ 모듈에서 가져옴
 
     if (d > 5 && d < 26) {
-      Serial.println("ULTRA:1");
+      sendUltra();
       ultraSentAfterClose = true;  // 1회만 전송
     }
   }
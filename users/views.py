@@ -4,9 +4,8 @@ from django.contrib.auth import login, logout
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from listings.models import Listing
-from chat.models import ChatRoom, Message
+from chat.models import ChatRoom
 from django.db import models
-from django.db.models import Prefetch
 
 def signup_view(request):
     if request.user.is_authenticated:
@@ -45,22 +44,19 @@ def logout_view(request):
 
 @login_required
 def profile_view(request):
+    # 복제본으로 보내지 않음 — 방금 등록한 상품/보낸 메시지가 바로 보여야 함 (read-after-write)
     my_items = Listing.objects.filter(seller=request.user).order_by('-id')
-    message_prefetch = Prefetch(
-        'messages',
-        queryset=Message.objects.select_related('sender').order_by('-timestamp'),
-        to_attr='ordered_messages'
-    )
-
+    # 마지막 메시지/안읽음 수는 ChatRoom에 비정규화되어 있으므로 JOIN 한 번으로 끝남
     my_chats = ChatRoom.objects.filter(
         models.Q(buyer=request.user) | models.Q(seller=request.user)
-    ).select_related('listing', 'buyer', 'seller').prefetch_related(message_prefetch)
+    ).select_related(
+        'listing', 'buyer', 'seller', 'last_message__sender'
+    ).order_by('-updated_at')
 
-    # ✅ 각 채팅방에 other_user_name 속성 추가
+    # ✅ 각 채팅방에 other_user_name / unread_count 속성 추가
     for chat in my_chats:
         chat.other_user_name = chat.seller.username if chat.buyer == request.user else chat.buyer.username
-        ordered_messages = getattr(chat, 'ordered_messages', [])
-        chat.last_message = ordered_messages[0] if ordered_messages else None
+        chat.unread_count = chat.unread_count_for(request.user)
 
     return render(request, "registration/profile.html", {
         "my_items": my_items,